@@ -0,0 +1,44 @@
+"""Add channel subscriptions
+
+Revision ID: a3c5e7b9d1f4
+Revises: f1b3d5e7a9c2
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c5e7b9d1f4'
+down_revision = 'f1b3d5e7a9c2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'channel_subscriptions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('channel_url', sa.String(), nullable=False),
+        sa.Column('channel_title', sa.String(), nullable=True),
+        sa.Column('engine', sa.String(), nullable=True),
+        sa.Column('check_interval', sa.Integer(), nullable=False),
+        sa.Column('seen_video_ids', sa.Text(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('next_check_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('last_checked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_channel_subscriptions_id'), 'channel_subscriptions', ['id'], unique=False)
+    op.create_index(op.f('ix_channel_subscriptions_next_check_at'), 'channel_subscriptions', ['next_check_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_channel_subscriptions_next_check_at'), table_name='channel_subscriptions')
+    op.drop_index(op.f('ix_channel_subscriptions_id'), table_name='channel_subscriptions')
+    op.drop_table('channel_subscriptions')
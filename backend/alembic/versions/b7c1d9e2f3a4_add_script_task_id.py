@@ -0,0 +1,26 @@
+"""Add task_id to scripts
+
+Revision ID: b7c1d9e2f3a4
+Revises: a4f5b2c3d4e5
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7c1d9e2f3a4'
+down_revision = 'a4f5b2c3d4e5'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('scripts', sa.Column('task_id', sa.String(), nullable=True))
+    op.create_index(op.f('ix_scripts_task_id'), 'scripts', ['task_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_scripts_task_id'), table_name='scripts')
+    op.drop_column('scripts', 'task_id')
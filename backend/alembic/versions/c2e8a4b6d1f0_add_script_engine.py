@@ -0,0 +1,24 @@
+"""Add transcription engine to scripts
+
+Revision ID: c2e8a4b6d1f0
+Revises: b7c1d9e2f3a4
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2e8a4b6d1f0'
+down_revision = 'b7c1d9e2f3a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('scripts', sa.Column('engine', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('scripts', 'engine')
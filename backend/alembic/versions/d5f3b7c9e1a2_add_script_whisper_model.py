@@ -0,0 +1,24 @@
+"""Add routed Whisper model to scripts
+
+Revision ID: d5f3b7c9e1a2
+Revises: c2e8a4b6d1f0
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5f3b7c9e1a2'
+down_revision = 'c2e8a4b6d1f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('scripts', sa.Column('whisper_model', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('scripts', 'whisper_model')
@@ -0,0 +1,24 @@
+"""Add packed word timings to scripts
+
+Revision ID: e8a2c4d6f0b1
+Revises: d5f3b7c9e1a2
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8a2c4d6f0b1'
+down_revision = 'd5f3b7c9e1a2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('scripts', sa.Column('word_timings', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('scripts', 'word_timings')
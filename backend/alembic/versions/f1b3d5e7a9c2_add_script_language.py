@@ -0,0 +1,24 @@
+"""Add detected language to scripts
+
+Revision ID: f1b3d5e7a9c2
+Revises: e8a2c4d6f0b1
+Create Date: 2026-10-17 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1b3d5e7a9c2'
+down_revision = 'e8a2c4d6f0b1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('scripts', sa.Column('language', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('scripts', 'language')
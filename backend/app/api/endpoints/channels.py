@@ -0,0 +1,114 @@
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+from typing import List
+import json
+
+from ...config import settings
+from ...database import get_db
+from ...models import ChannelSubscription, User
+from ...schemas import (
+    ChannelSubscription as ChannelSubscriptionSchema,
+    ChannelSubscriptionCreate
+)
+from ...dependencies import get_current_active_user
+from ...core.channel_sync import channel_uploads_url, next_check_time
+
+router = APIRouter()
+
+@router.post("/", response_model=ChannelSubscriptionSchema)
+def create_subscription(
+    subscription_data: ChannelSubscriptionCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Subscribe to a channel so its new uploads are transcribed automatically"""
+
+    channel_url = channel_uploads_url(str(subscription_data.channel_url))
+    if not channel_url:
+        raise HTTPException(status_code=400, detail="Not a YouTube channel URL")
+
+    existing = db.query(ChannelSubscription).filter(
+        ChannelSubscription.user_id == current_user.id,
+        ChannelSubscription.channel_url == channel_url
+    ).first()
+    if existing:
+        raise HTTPException(status_code=400, detail="Already subscribed to this channel")
+
+    check_interval = max(
+        subscription_data.check_interval or settings.CHANNEL_CHECK_INTERVAL,
+        settings.CHANNEL_MIN_CHECK_INTERVAL
+    )
+    subscription = ChannelSubscription(
+        user_id=current_user.id,
+        channel_url=channel_url,
+        engine=subscription_data.engine.value if subscription_data.engine else None,
+        check_interval=check_interval,
+        # An empty cursor backfills the channel; none makes the first sync a baseline
+        seen_video_ids=json.dumps([]) if subscription_data.backfill else None,
+        is_active=True,
+        next_check_at=next_check_time(check_interval, initial=True)
+    )
+    db.add(subscription)
+    db.commit()
+    db.refresh(subscription)
+
+    # Take the starting cursor now rather than at the first scheduled sync
+    from ...workers.tasks import sync_channel
+    sync_channel.delay(subscription.id)
+
+    return subscription
+
+@router.get("/", response_model=List[ChannelSubscriptionSchema])
+def get_subscriptions(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get the user's channel subscriptions"""
+    return db.query(ChannelSubscription).filter(
+        ChannelSubscription.user_id == current_user.id
+    ).order_by(ChannelSubscription.created_at.desc()).all()
+
+@router.post("/{subscription_id}/sync")
+def sync_subscription(
+    subscription_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Check a channel for new uploads now"""
+
+    subscription = db.query(ChannelSubscription).filter(
+        ChannelSubscription.id == subscription_id,
+        ChannelSubscription.user_id == current_user.id
+    ).first()
+
+    if not subscription:
+        raise HTTPException(status_code=404, detail="Subscription not found")
+
+    from ...workers.tasks import sync_channel
+    task = sync_channel.delay(subscription.id)
+
+    return {
+        "message": "Channel sync queued",
+        "task_id": task.id
+    }
+
+@router.delete("/{subscription_id}")
+def delete_subscription(
+    subscription_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Unsubscribe from a channel; scripts already created are kept"""
+
+    subscription = db.query(ChannelSubscription).filter(
+        ChannelSubscription.id == subscription_id,
+        ChannelSubscription.user_id == current_user.id
+    ).first()
+
+    if not subscription:
+        raise HTTPException(status_code=404, detail="Subscription not found")
+
+    db.delete(subscription)
+    db.commit()
+
+    return {"message": "Subscription deleted successfully"}
@@ -5,6 +5,7 @@ from sqlalchemy import or_
 from typing import List, Optional
 import os
 import json
+import time
 import pandas as pd
 from datetime import datetime
 import io
@@ -18,10 +19,14 @@ from ...schemas import (
     DashboardData,
     ScriptListResponse,
     ExportRequest,
-    ScriptStatus
+    ScriptStatus,
+    ScriptWordTimings
 )
 from ...dependencies import get_current_active_user
 from ...core.formatter import ScriptFormatter
+from ...core.transcript_stream import TranscriptStream
+from ...core.queue_stats import QueueStats
+from ...core.word_timings import WordTimings
 
 router = APIRouter()
 
@@ -374,7 +379,13 @@ def get_script(
     if not script:
         raise HTTPException(status_code=404, detail="Script not found")
     
-    return script
+    result = ScriptWithContent.model_validate(script)
+    
+    # Include the text decoded so far while the transcription is running
+    if script.status == 'processing' and script.task_id:
+        result.partial_transcript = TranscriptStream(script.task_id).partial_text() or None
+    
+    return result
 
 @router.get("/{script_id}/download")
 def download_script(
@@ -469,21 +480,89 @@ def regenerate_script(
     if not script:
         raise HTTPException(status_code=404, detail="Script not found or cannot be regenerated")
     
+    # Uploaded files aren't kept once processing ends
+    if script.video_url.startswith("upload://"):
+        raise HTTPException(status_code=400, detail="Uploaded files can't be regenerated. Please upload the file again.")
+    
     # Reset script status
     script.status = "pending"
     script.error_message = None
     db.commit()
     
+    QueueStats().add_job(script.id, script.video_duration)
+    
     # Re-queue for processing
     from ...workers.tasks import process_youtube_video
-    task = process_youtube_video.delay(
+    from ...core.priority_tiers import pipeline_queue
+    task = process_youtube_video.apply_async(kwargs={
+        'script_id': script.id,
+        'video_url': script.video_url,
+        'user_id': current_user.id,
+        'engine': script.engine,
+        'is_pro': bool(current_user.is_pro),
+        'enqueued_at': time.time()
+    }, queue=pipeline_queue('io', current_user.is_pro))
+    script.task_id = task.id
+    db.commit()
+    
+    return {
+        "message": "Script queued for regeneration",
+        "task_id": task.id
+    }
+
+@router.get("/{script_id}/words", response_model=ScriptWordTimings)
+def get_word_timings(
+    script_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get word-level timestamps of a script"""
+    
+    script = db.query(Script).filter(
+        Script.id == script_id,
+        Script.user_id == current_user.id
+    ).first()
+    
+    if not script:
+        raise HTTPException(status_code=404, detail="Script not found")
+    
+    if not script.word_timings:
+        raise HTTPException(
+            status_code=404,
+            detail="Word timestamps not computed. POST to this endpoint to compute them."
+        )
+    
+    return ScriptWordTimings(
         script_id=script.id,
-        video_url=script.video_url,
-        user_id=current_user.id
+        words=WordTimings.from_bytes(script.word_timings).to_list()
     )
+
+@router.post("/{script_id}/words")
+def compute_word_timings(
+    script_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Compute word-level timestamps for a completed script; its text is re-transcribed along with them"""
+    
+    script = db.query(Script).filter(
+        Script.id == script_id,
+        Script.user_id == current_user.id,
+        Script.status == "completed"
+    ).first()
+    
+    if not script:
+        raise HTTPException(status_code=404, detail="Script not found or not completed")
+    
+    # Uploaded files aren't kept after transcription, so there's no audio to align
+    if script.video_url.startswith("upload://"):
+        raise HTTPException(status_code=400, detail="Word timings can't be computed for uploaded files. Please upload the file again with word timestamps.")
+    
+    from ...workers.tasks import align_script_words
+    task = align_script_words.delay(script_id=script.id)
     
     return {
-        "message": "Script queued for regeneration",
+        "message": "Word alignment queued",
         "task_id": task.id
     }
 
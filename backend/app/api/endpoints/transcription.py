@@ -1,20 +1,118 @@
+import asyncio
 import json
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Query, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime, date
 
+from ...config import settings
 from ...database import get_db
 from ...models import Script, User, UserUsage
-from ...schemas import ScriptCreate, ProcessingStatus
+from ...schemas import (
+    ScriptCreate, ProcessingStatus, BulkStatusRequest, BatchCreate, BatchItem, BatchStatus, TranscriptionEngine
+)
 from ...dependencies import get_optional_current_user
-from ...workers.tasks import process_youtube_video
+from ...workers.tasks import process_youtube_video, process_uploaded_file, enqueue_batch
 from ...core.youtube_downloader import YouTubeDownloader
-from ...core.redis_client import get_redis_client
+from ...core.transcript_stream import TranscriptStream
+from ...core.queue_stats import QueueStats
+from ...core.transcript_cache import TranscriptCache
+from ...core.download_limiter import DownloadLimiter
+from ...core.batch_tracker import BatchTracker
+from ...core.upload_receiver import StreamingUpload, UploadTooLarge, UploadError
+from ...core.priority_tiers import QueueWaitStats, pipeline_queue, stage_queues
+from ...core.task_events import TERMINAL_STATUSES, get_task_event_hub, status_payload
+from ...core.task_status import TaskStatusStore
+from ...core.admission import AdmissionController, DEFER, REJECT
+from ...core.eta_estimator import EtaEstimator, RealTimeFactors
+
+MULTIPART_OVERHEAD = 64 * 1024  # room for boundaries and form fields around the file
 
 router = APIRouter()
 
+# Batch URL validation gets its own threads, so a batch never takes over the
+# shared thread pool; a timed-out lookup keeps its thread until it returns
+_validation_executor = ThreadPoolExecutor(
+    max_workers=settings.SUBMIT_BATCH_VALIDATION_CONCURRENCY,
+    thread_name_prefix='url-validation'
+)
+
+def _check_daily_limit(db: Session, user: User, count: int = 1):
+    """Reset the user's daily count if needed and enforce the free tier limit for ``count`` more videos"""
+    usage = db.query(UserUsage).filter(UserUsage.user_id == user.id).first()
+    
+    # Reset daily count if needed
+    if usage.last_reset_date.date() < date.today():
+        usage.videos_processed_today = 0
+        usage.last_reset_date = datetime.utcnow()
+        db.commit()
+    
+    # Check limits
+    if not user.is_pro and usage.videos_processed_today + count > settings.FREE_DAILY_VIDEO_LIMIT:
+        raise HTTPException(
+            status_code=429,
+            detail="Daily limit reached. Upgrade to Pro for unlimited videos."
+        )
+
+def _admit(user: Optional[User], audio_seconds: float = 0) -> bool:
+    """Admission control for new jobs; returns whether they go to the deferred queue"""
+    decision = AdmissionController().decide(audio_seconds, is_pro=bool(user and user.is_pro))
+    if decision['action'] == REJECT:
+        raise HTTPException(
+            status_code=503,
+            detail="We're processing a very large backlog right now. Please try again later.",
+            headers={'Retry-After': str(decision['retry_after'])}
+        )
+    return decision['action'] == DEFER
+
+def _submit_script(db: Session, user: Optional[User], script_data: ScriptCreate, video_info: dict,
+                   deferred: bool = False) -> str:
+    """Create the script record, count usage and enqueue the pipeline; returns the task ID"""
+    db_script = Script(
+        user_id=user.id if user else None,
+        video_url=str(script_data.video_url),
+        video_title=video_info.get('title'),
+        engine=script_data.engine.value if script_data.engine else settings.TRANSCRIPTION_ENGINE,
+        status='pending'
+    )
+    db.add(db_script)
+    db.commit()
+    db.refresh(db_script)
+    
+    # Count the job's audio towards the backlog used for model routing
+    QueueStats().add_job(db_script.id, video_info.get('duration'))
+    
+    # Update user usage if logged in
+    if user:
+        usage = db.query(UserUsage).filter(UserUsage.user_id == user.id).first()
+        usage.videos_processed_today += 1
+        usage.total_videos_processed += 1
+        db.commit()
+    
+    # Start async processing
+    is_pro = bool(user and user.is_pro)
+    task = process_youtube_video.apply_async(kwargs={
+        'script_id': db_script.id,
+        'video_url': str(script_data.video_url),
+        'user_id': user.id if user else None,
+        'engine': db_script.engine,
+        'word_timestamps': script_data.word_timestamps,
+        'is_pro': is_pro,
+        'deferred': deferred,
+        'enqueued_at': time.time()
+    }, queue=pipeline_queue('io', is_pro, deferred))
+    db_script.task_id = task.id
+    db.commit()
+    
+    return task.id
+
 @router.post("/", response_model=ProcessingStatus)
 async def create_transcription(
     script_data: ScriptCreate,
@@ -22,135 +120,580 @@ async def create_transcription(
     db: Session = Depends(get_db),
     current_user: Optional[User] = Depends(get_optional_current_user)
 ):
-    """Start transcription process for a YouTube video"""
+    """Start transcription process for a YouTube video.
+
+    Database, Redis, broker and yt-dlp calls all block, so they run in the
+    thread pool and the event loop stays free for other requests.
+    """
     
     # Check user limits if logged in
     if current_user:
-        usage = db.query(UserUsage).filter(UserUsage.user_id == current_user.id).first()
-        
-        # Reset daily count if needed
-        if usage.last_reset_date.date() < date.today():
-            usage.videos_processed_today = 0
-            usage.last_reset_date = datetime.utcnow()
-            db.commit()
-        
-        # Check limits
-        if not current_user.is_pro and usage.videos_processed_today >= 500000:
-            raise HTTPException(
-                status_code=429,
-                detail="Daily limit reached. Upgrade to Pro for unlimited videos."
-            )
+        await run_in_threadpool(_check_daily_limit, db, current_user)
     
-    # Validate YouTube URL
+    # Validate YouTube URL; a slow lookup keeps running in its thread and
+    # still fills the video info cache for the next attempt
     downloader = YouTubeDownloader()
     try:
-        video_info = downloader.extract_video_info(str(script_data.video_url))
+        video_info = await asyncio.wait_for(
+            run_in_threadpool(downloader.extract_video_info, str(script_data.video_url)),
+            timeout=settings.VIDEO_INFO_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=504,
+            detail="Timed out validating the YouTube URL. Please try again."
+        )
     except Exception as e:
         raise HTTPException(
             status_code=400,
             detail=f"Invalid YouTube URL or video not accessible: {str(e)}"
         )
     
-    # Create script record
-    db_script = Script(
-        user_id=current_user.id if current_user else None,
-        video_url=str(script_data.video_url),
-        video_title=video_info.get('title'),
-        status='pending'
+    deferred = await run_in_threadpool(_admit, current_user, video_info.get('duration'))
+    task_id = await run_in_threadpool(_submit_script, db, current_user, script_data, video_info, deferred)
+    
+    # The model is picked by the worker; estimate with the default one
+    eta = await run_in_threadpool(
+        EtaEstimator().estimate,
+        'queued',
+        video_info.get('duration'),
+        script_data.engine.value if script_data.engine else settings.TRANSCRIPTION_ENGINE,
+        settings.WHISPER_MODEL,
+        is_pro=bool(current_user and current_user.is_pro),
+        deferred=deferred
     )
-    db.add(db_script)
+    
+    return ProcessingStatus(
+        task_id=task_id,
+        status="processing",
+        progress=0,
+        message="Queued behind a large backlog; processing will start later" if deferred else "Video processing started",
+        deferred=deferred,
+        eta_seconds=eta['eta_seconds'],
+        queue_position=eta['queue_position']
+    )
+
+def _submit_batch(db: Session, user: Optional[User], batch_data: BatchCreate, videos: list,
+                  deferred: bool = False) -> list:
+    """Insert the batch's scripts in one transaction and enqueue them with one broker message.
+
+    ``videos`` holds ``(video_url, video_info)`` pairs that passed validation.
+    """
+    engine = batch_data.engine.value if batch_data.engine else settings.TRANSCRIPTION_ENGINE
+    db_scripts = [
+        Script(
+            user_id=user.id if user else None,
+            video_url=video_url,
+            video_title=video_info.get('title'),
+            engine=engine,
+            status='pending',
+            task_id=str(uuid.uuid4())
+        )
+        for video_url, video_info in videos
+    ]
+    db.add_all(db_scripts)
+    db.flush()
+    
+    # Read IDs before the commit expires the rows
+    items = [
+        {'video_url': db_script.video_url, 'script_id': db_script.id, 'task_id': db_script.task_id}
+        for db_script in db_scripts
+    ]
+    
+    if user:
+        usage = db.query(UserUsage).filter(UserUsage.user_id == user.id).first()
+        usage.videos_processed_today += len(items)
+        usage.total_videos_processed += len(items)
     db.commit()
-    db.refresh(db_script)
     
-    # Update user usage if logged in
+    QueueStats().add_jobs({
+        item['script_id']: video_info.get('duration')
+        for item, (_, video_info) in zip(items, videos)
+    })
+    
+    enqueue_batch.delay([
+        {
+            'task_id': item['task_id'],
+            'kwargs': {
+                'script_id': item['script_id'],
+                'video_url': item['video_url'],
+                'user_id': user.id if user else None,
+                'engine': engine,
+                'word_timestamps': batch_data.word_timestamps,
+                'is_pro': bool(user and user.is_pro),
+                'deferred': deferred
+            }
+        }
+        for item in items
+    ])
+    return items
+
+def _batch_status(batch_id: str, items: list, db: Session) -> BatchStatus:
+    """Combine the stored task results of a batch, falling back to the script rows"""
+    results = BatchTracker().task_results([item.get('task_id') for item in items])
+    
+    # Task results expire after an hour; older jobs are read from the database
+    missing = [item['script_id'] for item, result in zip(items, results) if item.get('script_id') and not result]
+    scripts = {}
+    if missing:
+        scripts = {
+            script.id: script
+            for script in db.query(Script).filter(Script.id.in_(missing)).all()
+        }
+    
+    batch_items = []
+    for item, result in zip(items, results):
+        if not item.get('script_id'):
+            status, progress, error = 'rejected', 0, item.get('error')
+        elif result:
+            state = result.get('state')
+            status = 'completed' if state == 'SUCCESS' else 'failed' if state == 'FAILURE' else 'processing'
+            progress, error = result.get('progress', 0), result.get('error')
+        else:
+            script = scripts.get(item['script_id'])
+            status = script.status if script else 'failed'
+            progress = 100 if status == 'completed' else 0
+            error = script.error_message if script else 'Script not found'
+        batch_items.append(BatchItem(
+            video_url=item['video_url'],
+            script_id=item.get('script_id'),
+            task_id=item.get('task_id'),
+            status=status,
+            progress=progress,
+            error=error
+        ))
+    
+    submitted = [item for item in batch_items if item.status != 'rejected']
+    completed = sum(1 for item in submitted if item.status == 'completed')
+    failed = sum(1 for item in submitted if item.status == 'failed')
+    finished = sum(
+        100 if item.status in ('completed', 'failed') else item.progress
+        for item in submitted
+    )
+    return BatchStatus(
+        batch_id=batch_id,
+        total=len(submitted),
+        completed=completed,
+        failed=failed,
+        processing=len(submitted) - completed - failed,
+        progress=int(finished / len(submitted)) if submitted else 100,
+        items=batch_items
+    )
+
+@router.post("/batch", response_model=BatchStatus)
+async def create_batch_transcription(
+    batch_data: BatchCreate,
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_current_user)
+):
+    """Start transcription of many videos, or of every video in a playlist"""
+    
+    downloader = YouTubeDownloader()
+    video_urls = [str(url) for url in batch_data.video_urls]
+    if batch_data.playlist_url:
+        try:
+            video_urls += await asyncio.wait_for(
+                run_in_threadpool(downloader.extract_playlist_urls, str(batch_data.playlist_url)),
+                timeout=settings.VIDEO_INFO_TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail="Timed out expanding the playlist. Please try again.")
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    
+    video_urls = list(dict.fromkeys(video_urls))
+    if not video_urls:
+        raise HTTPException(status_code=400, detail="No videos to transcribe")
+    if len(video_urls) > settings.SUBMIT_BATCH_MAX_VIDEOS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"A batch can contain at most {settings.SUBMIT_BATCH_MAX_VIDEOS} videos"
+        )
+    
     if current_user:
-        usage.videos_processed_today += 1
-        usage.total_videos_processed += 1
+        await run_in_threadpool(_check_daily_limit, db, current_user, len(video_urls))
+    
+    # Validate every URL in parallel on the validation threads. The timeout
+    # starts when a thread picks the URL up, not while it waits for one
+    loop = asyncio.get_running_loop()
+    
+    async def validate(video_url):
+        started = asyncio.Event()
+        
+        def extract():
+            loop.call_soon_threadsafe(started.set)
+            return downloader.extract_video_info(video_url)
+        
+        lookup = loop.run_in_executor(_validation_executor, extract)
+        await started.wait()
+        return await asyncio.wait_for(lookup, timeout=settings.VIDEO_INFO_TIMEOUT)
+    
+    results = await asyncio.gather(*(validate(url) for url in video_urls), return_exceptions=True)
+    
+    videos = [(url, result) for url, result in zip(video_urls, results) if not isinstance(result, BaseException)]
+    rejected = [
+        {
+            'video_url': url,
+            'error': 'Timed out validating the URL' if isinstance(result, asyncio.TimeoutError) else str(result)
+        }
+        for url, result in zip(video_urls, results)
+        if isinstance(result, BaseException)
+    ]
+    
+    items = []
+    if videos:
+        deferred = await run_in_threadpool(
+            _admit, current_user, sum(video_info.get('duration') or 0 for _, video_info in videos)
+        )
+        items = await run_in_threadpool(_submit_batch, db, current_user, batch_data, videos, deferred)
+    items += rejected
+    batch_id = await run_in_threadpool(BatchTracker().create, items)
+    
+    return await run_in_threadpool(_batch_status, batch_id, items, db)
+
+@router.get("/batch/{batch_id}", response_model=BatchStatus)
+def get_batch_status(batch_id: str, db: Session = Depends(get_db)):
+    """Aggregate progress of a batch submission"""
+    items = BatchTracker().get(batch_id)
+    if items is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+    return _batch_status(batch_id, items, db)
+
+def _submit_upload(db: Session, user: Optional[User], upload: dict, engine: str, word_timestamps: bool,
+                   deferred: bool = False) -> str:
+    """Create the script record for an uploaded file and enqueue it; returns the task ID.
+
+    The stored file is removed if the job can't be enqueued, since no task
+    would ever clean it up.
+    """
+    try:
+        db_script = Script(
+            user_id=user.id if user else None,
+            video_url=f"upload://{upload['sha256']}/{upload['filename']}",
+            video_title=upload['filename'],
+            engine=engine,
+            status='pending'
+        )
+        db.add(db_script)
         db.commit()
+        db.refresh(db_script)
+        
+        if user:
+            usage = db.query(UserUsage).filter(UserUsage.user_id == user.id).first()
+            usage.videos_processed_today += 1
+            usage.total_videos_processed += 1
+            db.commit()
+        
+        is_pro = bool(user and user.is_pro)
+        task = process_uploaded_file.apply_async(kwargs={
+            'script_id': db_script.id,
+            'file_path': upload['path'],
+            'filename': upload['filename'],
+            'sha256': upload['sha256'],
+            'user_id': user.id if user else None,
+            'engine': engine,
+            'word_timestamps': word_timestamps,
+            'is_pro': is_pro,
+            'deferred': deferred,
+            'enqueued_at': time.time()
+        }, queue=pipeline_queue('io', is_pro, deferred))
+    except Exception:
+        if os.path.exists(upload['path']):
+            os.remove(upload['path'])
+        raise
     
-    # Start async processing
-    task = process_youtube_video.delay(
-        script_id=db_script.id,
-        video_url=str(script_data.video_url),
-        user_id=current_user.id if current_user else None
-    )
+    db_script.task_id = task.id
+    db.commit()
+    
+    return task.id
+
+@router.post("/upload", response_model=ProcessingStatus)
+async def upload_transcription(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: Optional[User] = Depends(get_optional_current_user)
+):
+    """Transcribe an uploaded audio or video file.
+
+    Send multipart/form-data with a ``file`` part and optional ``engine`` and
+    ``word_timestamps`` fields. The body is streamed to disk as it arrives
+    instead of going through FastAPI's form parsing, so memory use stays flat
+    and MAX_FILE_SIZE is enforced mid-upload.
+    """
+    
+    # Reject oversized uploads up front when the client says how big they are
+    content_length = request.headers.get('content-length')
+    if content_length and content_length.isdigit() and int(content_length) > settings.MAX_FILE_SIZE + MULTIPART_OVERHEAD:
+        raise HTTPException(status_code=413, detail=f"File exceeds the limit of {settings.MAX_FILE_SIZE // (1024 * 1024)}MB")
+    
+    if current_user:
+        await run_in_threadpool(_check_daily_limit, db, current_user)
+    
+    # The duration is only known once the file is probed, so admission goes
+    # by the current backlog before any of the body is read
+    deferred = await run_in_threadpool(_admit, current_user)
+    
+    try:
+        upload = StreamingUpload(request.headers.get('content-type'))
+        stored = await upload.receive(request.stream())
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except UploadError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        engine = TranscriptionEngine(upload.fields.get('engine') or settings.TRANSCRIPTION_ENGINE).value
+    except ValueError:
+        os.remove(stored['path'])
+        raise HTTPException(status_code=400, detail=f"Unknown engine: {upload.fields.get('engine')}")
+    word_timestamps = upload.fields.get('word_timestamps', '').lower() in ('1', 'true', 'yes', 'on')
+    
+    task_id = await run_in_threadpool(_submit_upload, db, current_user, stored, engine, word_timestamps, deferred)
     
     return ProcessingStatus(
-        task_id=task.id,
+        task_id=task_id,
         status="processing",
         progress=0,
-        message="Video processing started"
+        message="File uploaded; queued behind a large backlog" if deferred else "File uploaded, processing started",
+        deferred=deferred
     )
 
+def _script_status(task_id: str, script: Script) -> dict:
+    """Status of a task whose stored status has expired, from its script row"""
+    return {
+        'task_id': task_id,
+        'status': script.status,
+        'progress': 100 if script.status == 'completed' else 0,
+        'message': script.error_message if script.status == 'failed' and script.error_message else
+                   'Script generated successfully' if script.status == 'completed' else
+                   'Task is waiting to be processed' if script.status == 'pending' else 'Processing...',
+        'script_id': script.id
+    }
+
 @router.get("/status/{task_id}", response_model=ProcessingStatus)
 def get_transcription_status(task_id: str, db: Session = Depends(get_db)):
     """Get the status of a transcription task"""
     
-    redis_client = get_redis_client()
+    # First, try the task's status hash
+    task_result = TaskStatusStore().get(task_id)
     
-    # First, try to get result from Redis
-    task_result_str = redis_client.get(f"task_result:{task_id}")
-    
-    if task_result_str:
-        # We have a result in Redis
-        task_result = json.loads(task_result_str)
-        print(f"Task {task_id} result from Redis: {task_result}")
+    if task_result:
+        # Include the text decoded so far while the transcription is running
+        partial_transcript = None
+        if task_result.get('state') == 'PROGRESS':
+            partial_transcript = TranscriptStream(task_id).partial_text() or None
         
         return ProcessingStatus(
-            task_id=task_id,
-            status='completed' if task_result.get('state') == 'SUCCESS' else 
-                    'failed' if task_result.get('state') == 'FAILURE' else 'processing',
-            progress=task_result.get('progress', 0),
-            message=task_result.get('status', 'Processing...'),
-            script_id=task_result.get('script_id')
+            **status_payload(task_id, task_result),
+            partial_transcript=partial_transcript
         )
     
-    # Fallback to checking task data
-    task_data_str = redis_client.get(f"task:{task_id}")
-    if task_data_str:
-        task_data = json.loads(task_data_str)
-        script_id = task_data.get('script_id')
-    else:
-        script_id = None
+    # Statuses expire after an hour; older tasks are read from their script row
+    script = db.query(Script).filter(Script.task_id == task_id).first()
+    if script:
+        return ProcessingStatus(**_script_status(task_id, script))
     
     # Check Celery task state
     task = process_youtube_video.AsyncResult(task_id)
     
-    print(f"Task {task_id} Celery state: {task.state}, script_id: {script_id}")
-    
     if task.state == 'PENDING':
         response = {
             'task_id': task_id,
             'status': 'pending',
             'progress': 0,
-            'message': 'Task is waiting to be processed',
-            'script_id': script_id
-        }
-    elif task.state == 'PROGRESS':
-        meta = task.info or {}
-        response = {
-            'task_id': task_id,
-            'status': 'processing',
-            'progress': meta.get('current', 0),
-            'message': meta.get('status', 'Processing...'),
-            'script_id': script_id
+            'message': 'Task is waiting to be processed'
         }
     elif task.state == 'SUCCESS':
-        # Even on success, prefer our Redis data
         response = {
             'task_id': task_id,
             'status': 'completed',
             'progress': 100,
-            'message': 'Script generated successfully',
-            'script_id': script_id
+            'message': 'Script generated successfully'
         }
     else:  # FAILURE
         response = {
             'task_id': task_id,
             'status': 'failed',
             'progress': 0,
-            'message': str(task.info) if task.info else 'Task failed',
-            'script_id': script_id
+            'message': str(task.info) if task.info else 'Task failed'
         }
     
-    return ProcessingStatus(**response)
\ No newline at end of file
+    return ProcessingStatus(**response)
+
+@router.post("/status/bulk", response_model=List[ProcessingStatus])
+def get_bulk_transcription_status(status_request: BulkStatusRequest, db: Session = Depends(get_db)):
+    """Get the status of many tasks at once, in request order.
+
+    Stored statuses are read in one pipelined round trip and any expired
+    ones from their script rows in one query. Unknown task IDs are
+    reported as pending.
+    """
+    task_ids = list(dict.fromkeys(status_request.task_ids))
+    if len(task_ids) > settings.STATUS_BULK_MAX_TASKS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.STATUS_BULK_MAX_TASKS} tasks per request"
+        )
+    
+    results = TaskStatusStore().get_many(task_ids)
+    
+    missing = [task_id for task_id, result in zip(task_ids, results) if not result]
+    scripts = {}
+    if missing:
+        scripts = {
+            script.task_id: script
+            for script in db.query(Script).filter(Script.task_id.in_(missing)).all()
+        }
+    
+    statuses = []
+    for task_id, result in zip(task_ids, results):
+        if result:
+            statuses.append(ProcessingStatus(**status_payload(task_id, result)))
+        elif task_id in scripts:
+            statuses.append(ProcessingStatus(**_script_status(task_id, scripts[task_id])))
+        else:
+            statuses.append(ProcessingStatus(
+                task_id=task_id,
+                status='pending',
+                progress=0,
+                message='Task is waiting to be processed'
+            ))
+    return statuses
+
+def _task_ids(task_ids: List[str]) -> List[str]:
+    """Deduplicate the task IDs of a subscription and enforce the per-connection limit"""
+    task_ids = list(dict.fromkeys(task_id for task_id in task_ids if task_id))
+    if len(task_ids) > settings.TASK_EVENTS_MAX_TASKS:
+        raise ValueError(f"At most {settings.TASK_EVENTS_MAX_TASKS} tasks per connection")
+    return task_ids
+
+@router.get("/events")
+async def stream_task_events(request: Request, task_ids: List[str] = Query(...)):
+    """Server-Sent Events stream of status updates for one or more tasks.
+
+    Sends the current status of each task, then every update as a
+    ``status`` event with the same fields as ``/status/{task_id}`` (without
+    the partial transcript). The stream ends with an ``end`` event once all
+    tasks have completed or failed.
+    """
+    try:
+        task_ids = _task_ids(task_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    hub = get_task_event_hub()
+    
+    async def events():
+        queue = asyncio.Queue(maxsize=settings.TASK_EVENTS_QUEUE_SIZE)
+        await hub.subscribe(queue, task_ids)
+        try:
+            pending = set(task_ids)
+            while pending:
+                try:
+                    payload = await asyncio.wait_for(queue.get(), timeout=settings.TASK_EVENTS_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+                    continue
+                
+                yield f"event: status\ndata: {json.dumps(payload)}\n\n"
+                if payload['status'] in TERMINAL_STATUSES:
+                    pending.discard(payload['task_id'])
+            yield "event: end\ndata: {}\n\n"
+        finally:
+            await hub.unsubscribe(queue, task_ids)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+def _socket_message(text: str) -> dict:
+    """Parse a WebSocket control message; raises ValueError for malformed ones"""
+    try:
+        message = json.loads(text)
+    except json.JSONDecodeError:
+        raise ValueError("Messages must be valid JSON")
+    if not isinstance(message, dict):
+        raise ValueError("Messages must be JSON objects")
+    for field in ('subscribe', 'unsubscribe'):
+        task_ids = message.get(field)
+        if task_ids is not None and (
+            not isinstance(task_ids, list) or not all(isinstance(task_id, str) for task_id in task_ids)
+        ):
+            raise ValueError(f"'{field}' must be a list of task IDs")
+    return message
+
+@router.websocket("/ws")
+async def task_events_socket(websocket: WebSocket):
+    """WebSocket feed of task status updates.
+
+    Send ``{"subscribe": [task_id, ...]}`` or ``{"unsubscribe": [...]}`` at
+    any time; status updates arrive as JSON objects shaped like
+    ``/status/{task_id}`` responses.
+    """
+    await websocket.accept()
+    hub = get_task_event_hub()
+    queue = asyncio.Queue(maxsize=settings.TASK_EVENTS_QUEUE_SIZE)
+    subscribed = set()
+    
+    async def send_updates():
+        while True:
+            await websocket.send_json(await queue.get())
+    
+    sender = asyncio.create_task(send_updates())
+    try:
+        while True:
+            text = await websocket.receive_text()
+            try:
+                message = _socket_message(text)
+                if message.get('subscribe'):
+                    task_ids = _task_ids(list(subscribed) + list(message['subscribe']))
+                    new = [task_id for task_id in task_ids if task_id not in subscribed]
+                    await hub.subscribe(queue, new)
+                    subscribed.update(new)
+                if message.get('unsubscribe'):
+                    task_ids = [task_id for task_id in message['unsubscribe'] if task_id in subscribed]
+                    await hub.unsubscribe(queue, task_ids)
+                    subscribed.difference_update(task_ids)
+            except ValueError as e:
+                await websocket.send_json({'error': str(e)})
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        await hub.unsubscribe(queue, list(subscribed))
+
+@router.get("/cache/stats")
+def get_transcript_cache_stats():
+    """Hit/miss counters and size of the shared transcript cache"""
+    return TranscriptCache().stats()
+
+@router.get("/downloads/stats")
+def get_download_stats():
+    """Current download throughput, slot usage and wait times across the cluster"""
+    return DownloadLimiter().stats()
+
+@router.get("/admission/stats")
+def get_admission_stats():
+    """Backlog, estimated drain time, thresholds and admit/defer/reject counts by tier"""
+    return AdmissionController().stats()
+
+@router.get("/eta/stats")
+def get_eta_stats():
+    """Measured real-time factors behind the ETA estimates, by stage, engine and model"""
+    return RealTimeFactors().stats()
+
+@router.get("/queues/stats")
+def get_queue_stats():
+    """Broker queue depths and queue-wait percentiles (seconds) by stage and tier"""
+    queue_stats = QueueStats()
+    return {
+        'depth': {
+            queue: queue_stats.queue_depth([queue])
+            for queue in stage_queues('io') + stage_queues('cpu')
+        },
+        'wait': QueueWaitStats().snapshot()
+    }
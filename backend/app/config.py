@@ -38,12 +38,148 @@ class Settings(BaseSettings):
     TEMP_AUDIO_PATH: str = "./temp_audio"
     GENERATED_SCRIPTS_PATH: str = "./generated_scripts"
     
+    # Transcription engine
+    TRANSCRIPTION_ENGINE: str = "openai-whisper"  # openai-whisper, faster-whisper
+    FASTER_WHISPER_COMPUTE_TYPE: str = "int8"
+    FASTER_WHISPER_CPU_THREADS: int = 0  # 0 uses every core available to the worker process
+    FASTER_WHISPER_BEAM_SIZE: int = 5
+    
+    # Download - stream audio straight into 16 kHz float32 PCM instead of a WAV file
+    AUDIO_STREAMING_MODE: bool = True
+    
     # Whisper Model
     WHISPER_MODEL: str = "base"  # tiny, base, small, medium, large
+    WHISPER_PRELOAD_MODELS: list = ["base"]  # loaded when each worker process starts
+    WHISPER_POOL_MEMORY_MB: int = 4096  # memory budget for resident models per worker process
+    WHISPER_MODEL_IDLE_TIMEOUT: int = 1800  # unload models unused for this many seconds
+    
+    # Language detection - detected once per video and cached
+    VIDEO_LANGUAGE_CACHE_TTL: int = 30 * 24 * 3600
+    ENGLISH_ONLY_MODELS: bool = True  # use tiny.en/base.en/... for English audio
+    
+    # Video metadata cache shared by the API and the workers
+    VIDEO_INFO_CACHE_TTL: int = 6 * 3600
+    VIDEO_INFO_NEGATIVE_TTL: int = 600  # invalid, private or removed videos
+    VIDEO_INFO_TIMEOUT: int = 15  # seconds the submit endpoint waits for validation
+    
+    # Shared transcript cache keyed by video ID and decode settings
+    TRANSCRIPT_CACHE_ENABLED: bool = True
+    TRANSCRIPT_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    TRANSCRIPT_CACHE_TTL: int = 30 * 24 * 3600
+    
+    # Model routing - pick the model per job from the backlog, fastest first
+    AUTO_MODEL_SELECTION: bool = True
+    MODEL_ROUTING_LADDER: list = ["tiny", "base", "small"]
+    BACKLOG_HIGH_AUDIO_SECONDS: int = 4 * 3600  # queued audio that forces the fastest model
+    BACKLOG_HIGH_QUEUE_DEPTH: int = 50  # queued messages that force the fastest model
+    BACKLOG_LOW_FRACTION: float = 0.25  # below this share of the limits use the best model
+    ROUTING_LONG_VIDEO_SECONDS: int = 1800  # longer videos step one model down
+    
+    # Chunked transcription - long videos are split at silence and fanned out
+    # to all workers; chunks are written under TEMP_AUDIO_PATH, which must be
+    # shared storage when workers run on several nodes
+    CHUNKED_TRANSCRIPTION_ENABLED: bool = True
+    CHUNKED_MIN_DURATION: int = 600  # only chunk videos longer than this (seconds)
+    CHUNK_WINDOW_SECONDS: int = 300
+    CHUNK_OVERLAP_SECONDS: int = 4
+    CHUNK_SILENCE_SEARCH_SECONDS: int = 20  # look this far back from a cut for silence
+    
+    # Batched decoding - a short video's 30-second windows go through the
+    # encoder/decoder together. The prefork CPU workers run one job per
+    # process, so a batch holds one job's windows
+    BATCH_DECODING_ENABLED: bool = True
+    BATCH_MAX_VIDEO_DURATION: int = 180  # only batch videos up to this length (seconds)
+    BATCH_WINDOW_SECONDS: int = 30
+    BATCH_MAX_SIZE: int = 16  # windows per encoder/decoder pass
+    BATCH_MAX_WAIT_MS: int = 200  # flush a partial batch after this long; no wait when one job is decoding
+    
+    # Voice activity detection - only speech regions are sent to the model
+    VAD_ENABLED: bool = True
+    VAD_AGGRESSIVENESS: int = 3  # 0-3, higher rejects more non-speech (music, noise)
+    VAD_MIN_SPEECH_SECONDS: float = 0.25  # ignore shorter speech blips
+    VAD_MIN_SILENCE_SECONDS: float = 1.0  # shorter pauses stay inside a speech region
+    VAD_SPEECH_PAD_SECONDS: float = 0.3
+    
+    # Transcript streaming - non-chunked jobs are decoded in windows of this
+    # length so partial transcripts and progress are published as they go
+    STREAM_WINDOW_SECONDS: int = 120
+    
+    # Download limiter - caps concurrent downloads and total download
+    # bandwidth across all workers (shared through Redis)
+    DOWNLOAD_MAX_CONCURRENT: int = 4
+    DOWNLOAD_MAX_BYTES_PER_SEC: int = 8 * 1024 * 1024  # 0 disables the bandwidth cap
+    DOWNLOAD_SLOT_LEASE_SECONDS: int = 60  # a crashed worker's slot is freed after this
+    DOWNLOAD_WAIT_TIMEOUT: int = 1800  # give up waiting for a slot after this (seconds)
+    
+    # Audio cache - downloaded audio stays on TEMP_AUDIO_PATH so retries and
+    # re-runs skip the download; least recently used files go first
+    AUDIO_CACHE_MAX_BYTES: int = 10 * 1024 * 1024 * 1024  # 10GB
+    AUDIO_CACHE_REF_TTL: int = 6 * 3600  # a job's hold on a file expires after this
+    AUDIO_CACHE_PART_MAX_AGE: int = 900  # partial files untouched this long are orphans
+    
+    # Batch submission - many videos or a whole playlist in one request
+    SUBMIT_BATCH_MAX_VIDEOS: int = 500
+    SUBMIT_BATCH_VALIDATION_CONCURRENCY: int = 16  # URLs validated at once
+    SUBMIT_BATCH_TTL: int = 7 * 24 * 3600  # how long batch progress stays queryable
+    
+    # Channel subscriptions - a beat task enqueues new uploads of subscribed channels
+    CHANNEL_SYNC_TICK_SECONDS: int = 60  # how often beat looks for channels due a sync
+    CHANNEL_SYNC_MAX_DUE: int = 50  # channels claimed per tick
+    CHANNEL_CHECK_INTERVAL: int = 3600  # default seconds between syncs of one channel
+    CHANNEL_MIN_CHECK_INTERVAL: int = 600
+    CHANNEL_SYNC_PAGE_SIZE: int = 30  # uploads listed per request while looking for seen videos
+    CHANNEL_SEEN_IDS_KEPT: int = 200  # newest seen video IDs stored as the sync cursor
+    
+    # Pipeline stages - downloads and formatting run on the I/O queue and
+    # transcription on the CPU queue; stages hand audio and transcripts to each
+    # other under TEMP_AUDIO_PATH
+    PIPELINE_IO_QUEUE: str = "io"
+    PIPELINE_CPU_QUEUE: str = "cpu"
+    
+    # Priority tiers - Pro jobs go to their own copy of each queue. Shared
+    # workers take Pro work first and free work when none is waiting; reserved
+    # workers take Pro work only (see priority_tiers.stage_queues)
+    PIPELINE_IO_PRO_QUEUE: str = "io.pro"
+    PIPELINE_CPU_PRO_QUEUE: str = "cpu.pro"
+    QUEUE_WAIT_SAMPLES: int = 1000  # recent waits kept per stage and tier for percentiles
+    
+    # Retries and checkpoints - tasks are acknowledged once they finish, so a
+    # lost worker's stage is redelivered and resumes from its checkpoints
+    PIPELINE_MAX_RETRIES: int = 5  # for transient errors (network, DB, Redis)
+    PIPELINE_RETRY_BACKOFF: int = 10  # seconds before the first retry, doubled each time
+    PIPELINE_RETRY_BACKOFF_MAX: int = 600
+    PIPELINE_CHECKPOINT_TTL: int = 7 * 24 * 3600
+    TASK_VISIBILITY_TIMEOUT: int = 4 * 3600  # must exceed the longest stage or it runs twice
+    
+    # Admission control - how long the workers need to clear the queued audio
+    # decides whether new jobs run normally, wait in the deferred queue or are
+    # turned away with Retry-After
+    ADMISSION_CAPACITY: float = 20.0  # audio-seconds transcribed per second across all CPU workers
+    ADMISSION_DEFER_DRAIN_SECONDS: int = 1800
+    ADMISSION_REJECT_DRAIN_SECONDS: int = 4 * 3600
+    ADMISSION_PRO_REJECT_DRAIN_SECONDS: int = 12 * 3600
+    ADMISSION_MIN_RETRY_AFTER: int = 60
+    ADMISSION_MAX_RETRY_AFTER: int = 3600
+    PIPELINE_CPU_DEFERRED_QUEUE: str = "cpu.deferred"  # served only when no other CPU work waits
+    
+    # ETA estimates - real-time factors (wall-clock seconds per media-second)
+    # measured by the workers, averaged with this weight per new sample
+    ETA_EWMA_ALPHA: float = 0.1
+    ETA_DEFAULT_DOWNLOAD_RTF: float = 0.05  # until a download has been measured
+    ETA_DEFAULT_DECODE_RTF: float = 0.5  # until a decode with the model has been measured
+    ETA_CPU_SLOTS: int = 3  # transcription processes across all CPU workers
+    ETA_FINALIZE_SECONDS: int = 5
+    
+    # Task events - status updates pushed over SSE/WebSocket via Redis pub/sub
+    TASK_EVENTS_MAX_TASKS: int = 200  # tasks one connection can follow
+    TASK_EVENTS_HEARTBEAT: int = 15  # seconds between keepalives on an idle stream
+    TASK_EVENTS_QUEUE_SIZE: int = 100  # updates buffered per connection before dropping old ones
+    STATUS_BULK_MAX_TASKS: int = 500  # task IDs per bulk status request
     
     # Limits
     MAX_VIDEO_DURATION: int = 3600  # 1 hour in seconds
     MAX_FILE_SIZE: int = 500 * 1024 * 1024  # 500MB
+    FREE_DAILY_VIDEO_LIMIT: int = 500000  # videos per day for non-Pro users
     
     # CORS
     BACKEND_CORS_ORIGINS: list = ["http://localhost:3000"]
@@ -0,0 +1,78 @@
+import math
+from typing import Dict
+from ..config import settings
+from .queue_stats import QueueStats
+
+DECISIONS_KEY = "admission:decisions"  # "<tier>:<action>" -> count
+
+ADMIT = 'admit'
+DEFER = 'defer'
+REJECT = 'reject'
+
+
+class AdmissionController:
+    """Decides whether new jobs are admitted while the backlog is large.
+
+    The backlog is the audio-seconds queued or in flight (see ``QueueStats``)
+    divided by the cluster's transcription capacity, i.e. roughly how long
+    the workers need to clear it. Past ``ADMISSION_DEFER_DRAIN_SECONDS``
+    free jobs are still accepted but deferred: they transcribe only when no
+    regular work is waiting. Past ``ADMISSION_REJECT_DRAIN_SECONDS`` free
+    jobs are turned away with a ``Retry-After``. Pro jobs are only turned
+    away past ``ADMISSION_PRO_REJECT_DRAIN_SECONDS``.
+    """
+
+    def __init__(self, queue_stats: QueueStats = None):
+        self.queue_stats = queue_stats or QueueStats()
+        self.redis = self.queue_stats.redis
+        self.capacity = settings.ADMISSION_CAPACITY
+
+    def drain_seconds(self, audio_seconds: float = 0) -> float:
+        return (self.queue_stats.queued_audio_seconds() + float(audio_seconds or 0)) / self.capacity
+
+    def decide(self, audio_seconds: float = 0, is_pro: bool = False, can_reject: bool = True) -> Dict:
+        """Decision for jobs totalling ``audio_seconds``, counted in the admission metrics.
+
+        Returns ``action`` (admit, defer or reject), the estimated
+        ``drain_seconds`` including the new jobs and, for rejections,
+        ``retry_after`` in seconds. Submissions that can't be turned away
+        (scheduled channel syncs) pass ``can_reject=False`` and are deferred
+        instead.
+        """
+        drain = self.drain_seconds(audio_seconds)
+
+        if is_pro:
+            reject_after, defer_after = settings.ADMISSION_PRO_REJECT_DRAIN_SECONDS, None
+        else:
+            reject_after, defer_after = settings.ADMISSION_REJECT_DRAIN_SECONDS, settings.ADMISSION_DEFER_DRAIN_SECONDS
+
+        decision = {'action': ADMIT, 'drain_seconds': round(drain, 1), 'retry_after': None}
+        if drain > reject_after and can_reject:
+            decision.update(action=REJECT, retry_after=self._retry_after(drain, reject_after))
+        elif drain > reject_after or (defer_after is not None and drain > defer_after):
+            decision['action'] = DEFER
+
+        self.redis.hincrby(DECISIONS_KEY, f"{'pro' if is_pro else 'free'}:{decision['action']}", 1)
+        return decision
+
+    def _retry_after(self, drain: float, threshold: float) -> int:
+        """Seconds until the backlog should be back under the threshold"""
+        return min(max(math.ceil(drain - threshold), settings.ADMISSION_MIN_RETRY_AFTER), settings.ADMISSION_MAX_RETRY_AFTER)
+
+    def stats(self) -> Dict:
+        decisions = {tier: {ADMIT: 0, DEFER: 0, REJECT: 0} for tier in ('pro', 'free')}
+        for field, count in self.redis.hgetall(DECISIONS_KEY).items():
+            tier, action = field.split(':', 1)
+            decisions.setdefault(tier, {})[action] = int(count)
+
+        return {
+            **self.queue_stats.snapshot(),
+            'capacity_audio_seconds_per_second': self.capacity,
+            'drain_seconds': round(self.drain_seconds(), 1),
+            'thresholds': {
+                'defer_drain_seconds': settings.ADMISSION_DEFER_DRAIN_SECONDS,
+                'reject_drain_seconds': settings.ADMISSION_REJECT_DRAIN_SECONDS,
+                'pro_reject_drain_seconds': settings.ADMISSION_PRO_REJECT_DRAIN_SECONDS,
+            },
+            'decisions': decisions,
+        }
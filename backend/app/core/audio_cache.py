@@ -0,0 +1,94 @@
+import os
+import time
+from typing import List, Optional
+from ..config import settings
+from .redis_client import get_redis_client
+
+# Formats the cache manages: streamed PCM and downloaded WAV
+CACHED_FORMATS = ('f32', 'wav')
+
+
+class AudioCache:
+    """Downloaded audio kept on TEMP_AUDIO_PATH for retries and re-runs.
+
+    Files are named ``<video_id>.<format>`` and the total size is kept under
+    ``AUDIO_CACHE_MAX_BYTES`` by evicting the least recently used files. Jobs
+    hold a reference on a file while they use it; referenced files are never
+    evicted. References expire, so a crashed worker can't pin a file forever.
+    """
+
+    def __init__(self):
+        self.redis = get_redis_client()
+        self.root = settings.TEMP_AUDIO_PATH
+        self.max_bytes = settings.AUDIO_CACHE_MAX_BYTES
+
+    def path(self, video_id: str, fmt: str) -> str:
+        return os.path.join(self.root, f"{video_id}.{fmt}")
+
+    def _refs_key(self, path: str) -> str:
+        return f"audio_cache:refs:{os.path.basename(path)}"
+
+    def acquire(self, path: str, holder: str):
+        """Pin a file (present or about to be downloaded) for a job"""
+        key = self._refs_key(path)
+        pipe = self.redis.pipeline()
+        pipe.hset(key, holder, time.time() + settings.AUDIO_CACHE_REF_TTL)
+        pipe.expire(key, settings.AUDIO_CACHE_REF_TTL)
+        pipe.execute()
+
+    def release(self, path: str, holder: str):
+        """Drop a job's reference; the file stays cached until evicted"""
+        if path:
+            self.redis.hdel(self._refs_key(path), holder)
+
+    def in_use(self, path: str) -> bool:
+        now = time.time()
+        return any(float(expiry) > now for expiry in self.redis.hvals(self._refs_key(path)))
+
+    def lookup(self, path: str) -> Optional[str]:
+        """Return the path if the file is cached, marking it recently used"""
+        if not os.path.exists(path):
+            return None
+        os.utime(path)
+        return path
+
+    def evict(self):
+        """Delete least recently used, unreferenced files until under the quota"""
+        files = self._cached_files()
+        total = sum(size for _, size, _ in files)
+        for path, size, _ in sorted(files, key=lambda entry: entry[2]):
+            if total <= self.max_bytes:
+                break
+            if self.in_use(path):
+                continue
+            try:
+                os.remove(path)
+                total -= size
+                print(f"Evicted cached audio: {path}")
+            except FileNotFoundError:
+                total -= size
+
+    def cleanup_orphans(self):
+        """Remove partial files left behind by downloads that never finished.
+
+        Only files untouched for ``AUDIO_CACHE_PART_MAX_AGE`` are removed, so
+        downloads still running on other workers sharing the directory survive.
+        """
+        cutoff = time.time() - settings.AUDIO_CACHE_PART_MAX_AGE
+        for directory in (self.root, os.path.join(self.root, 'stages'), os.path.join(self.root, 'uploads')):
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                path = os.path.join(directory, name)
+                if name.endswith('.part') and os.path.isfile(path) and os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    print(f"Removed orphaned partial file: {path}")
+
+    def _cached_files(self) -> List[tuple]:
+        """``(path, size, last_used)`` for every cached audio file"""
+        files = []
+        for entry in os.scandir(self.root):
+            if entry.is_file() and entry.name.rsplit('.', 1)[-1] in CACHED_FORMATS:
+                stat = entry.stat()
+                files.append((entry.path, stat.st_size, stat.st_mtime))
+        return files
@@ -0,0 +1,126 @@
+import os
+import subprocess
+from typing import Callable, Dict, List
+import numpy as np
+from ..config import settings
+
+SAMPLE_RATE = 16000
+
+
+class AudioProcessor:
+    def __init__(self):
+        self.sample_rate = SAMPLE_RATE
+        self.frame_seconds = 0.05  # energy frame used when looking for silence
+
+    def load_pcm(self, audio_path: str) -> np.ndarray:
+        """Decode any audio file to 16 kHz mono float32 samples"""
+        # Streamed downloads are already raw 16 kHz mono float32
+        if audio_path.endswith('.f32'):
+            return np.fromfile(audio_path, dtype='<f4')
+
+        cmd = [
+            'ffmpeg', '-nostdin', '-threads', '0',
+            '-i', audio_path,
+            '-f', 's16le', '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(self.sample_rate),
+            '-'
+        ]
+        try:
+            out = subprocess.run(cmd, capture_output=True, check=True).stdout
+        except subprocess.CalledProcessError as e:
+            raise Exception(f"Failed to decode audio: {e.stderr.decode(errors='ignore')}")
+
+        return np.frombuffer(out, np.int16).flatten().astype(np.float32) / 32768.0
+
+    def probe_duration(self, audio_path: str) -> float:
+        """Duration of an audio or video file in seconds"""
+        cmd = [
+            'ffprobe', '-v', 'error',
+            '-show_entries', 'format=duration',
+            '-of', 'default=noprint_wrappers=1:nokey=1',
+            audio_path
+        ]
+        try:
+            out = subprocess.run(cmd, capture_output=True, check=True).stdout
+            return float(out.strip())
+        except (subprocess.CalledProcessError, ValueError):
+            raise Exception("Not a readable audio or video file")
+
+    def plan_windows(self, samples: np.ndarray, window_seconds: float, overlap_seconds: float) -> List[Dict]:
+        """Split audio into overlapping windows whose cut points fall in silence.
+
+        Each window covers ``start``..``end`` (seconds, including overlap) and
+        owns ``keep_start``..``keep_end``; segments outside the owned span are
+        dropped when the windows are stitched back together.
+        """
+        duration = len(samples) / self.sample_rate
+        if duration <= window_seconds:
+            return [{'index': 0, 'start': 0.0, 'end': duration, 'keep_start': 0.0, 'keep_end': duration}]
+
+        energy = self._frame_energy(samples)
+        search = min(settings.CHUNK_SILENCE_SEARCH_SECONDS, window_seconds / 4)
+
+        cuts = [0.0]
+        while duration - cuts[-1] > window_seconds:
+            cuts.append(self._quietest_point(energy, cuts[-1] + window_seconds, search))
+        cuts.append(duration)
+
+        half_overlap = overlap_seconds / 2
+        windows = []
+        for index, (keep_start, keep_end) in enumerate(zip(cuts[:-1], cuts[1:])):
+            windows.append({
+                'index': index,
+                'start': max(0.0, keep_start - half_overlap),
+                'end': min(duration, keep_end + half_overlap),
+                'keep_start': keep_start,
+                'keep_end': keep_end,
+            })
+        return windows
+
+    def slice(self, samples: np.ndarray, start: float, end: float) -> np.ndarray:
+        """Return the samples between two timestamps (seconds)"""
+        return samples[int(start * self.sample_rate):int(end * self.sample_rate)]
+
+    def representative_sample(self, samples: np.ndarray, seconds: float = 30.0,
+                              score: Callable[[np.ndarray], float] = None) -> np.ndarray:
+        """Pick the best-scoring of a few windows spread over the audio.
+
+        Windows at 25/50/75% skip intros and outros; by default the loudest
+        window wins.
+        """
+        window = int(seconds * self.sample_rate)
+        if len(samples) <= window:
+            return samples
+
+        score = score or (lambda candidate: float(np.mean(candidate ** 2)))
+        best, best_score = None, -1.0
+        for position in (0.25, 0.5, 0.75):
+            start = int((len(samples) - window) * position)
+            candidate = samples[start:start + window]
+            candidate_score = score(candidate)
+            if candidate_score > best_score:
+                best, best_score = candidate, candidate_score
+        return best
+
+    def save_chunk(self, samples: np.ndarray, file_path: str) -> str:
+        """Persist a chunk of samples so another worker can pick it up"""
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        np.save(file_path, np.ascontiguousarray(samples, dtype=np.float32))
+        return file_path
+
+    def load_chunk(self, file_path: str) -> np.ndarray:
+        return np.load(file_path)
+
+    def _frame_energy(self, samples: np.ndarray) -> np.ndarray:
+        """RMS energy per frame"""
+        frame_len = int(self.frame_seconds * self.sample_rate)
+        n_frames = len(samples) // frame_len
+        frames = samples[:n_frames * frame_len].reshape(n_frames, frame_len)
+        return np.sqrt(np.mean(frames ** 2, axis=1))
+
+    def _quietest_point(self, energy: np.ndarray, target: float, search: float) -> float:
+        """Find the lowest-energy frame within ``search`` seconds before ``target``"""
+        hi = min(int(target / self.frame_seconds), len(energy))
+        lo = max(int((target - search) / self.frame_seconds), 0)
+        if hi <= lo:
+            return target
+        return (lo + int(np.argmin(energy[lo:hi]))) * self.frame_seconds
@@ -0,0 +1,132 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional
+import numpy as np
+from ..config import settings
+from .transcription_engines import get_engine
+
+
+class _WindowRequest:
+    def __init__(self, engine_name: str, model_name: str, language: Optional[str], samples: np.ndarray):
+        self.key = (engine_name, model_name, language)
+        self.samples = samples
+        self.future = Future()
+
+
+class BatchingTranscriptionService:
+    """Decode 30-second windows in shared batches.
+
+    Jobs submit their windows and get futures back. A single decoder thread
+    per worker process groups pending windows that use the same engine, model
+    and language, waits at most ``BATCH_MAX_WAIT_MS`` for a batch to fill and
+    runs the encoder and decoder over the whole batch at once. Batches only
+    span jobs running in the same process; the prefork CPU workers run one
+    job per process, so there a batch holds one job's windows. A batch only
+    waits for more windows while another job has windows in flight.
+    """
+
+    def __init__(self, max_batch_size: int = None, max_wait_ms: int = None):
+        self.max_batch_size = max_batch_size or settings.BATCH_MAX_SIZE
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else settings.BATCH_MAX_WAIT_MS) / 1000
+        self._queue = queue.Queue()
+        self._pending = []  # requests taken off the queue but not yet batched
+        self._thread = None
+        self._lock = threading.Lock()
+        self._submitters = 0  # submit() calls with windows not yet decoded
+
+    def submit(self, engine_name: str, model_name: str, windows: List[np.ndarray],
+               language: str = None) -> List[Future]:
+        """Queue windows for decoding; each future resolves to the window's result"""
+        self._ensure_running()
+        requests = [_WindowRequest(engine_name, model_name, language, samples) for samples in windows]
+        if not requests:
+            return []
+        self._track(requests)
+        for request in requests:
+            self._queue.put(request)
+        return [request.future for request in requests]
+
+    def _track(self, requests: List[_WindowRequest]):
+        """Count the submission as in flight until all its windows are decoded"""
+        remaining = [len(requests)]
+
+        def done(_):
+            with self._lock:
+                remaining[0] -= 1
+                if not remaining[0]:
+                    self._submitters -= 1
+
+        with self._lock:
+            self._submitters += 1
+        for request in requests:
+            request.future.add_done_callback(done)
+
+    def _ensure_running(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='whisper-batch-decoder', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                self._decode(batch)
+            except Exception as e:
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(e)
+
+    def _next_batch(self) -> List[_WindowRequest]:
+        """Collect requests for one key until the batch is full or the wait expires"""
+        first = self._pending.pop(0) if self._pending else self._queue.get()
+        batch = [first]
+        deferred = []
+
+        # Requests for the same key that were already waiting join immediately
+        for request in self._pending:
+            if request.key == first.key and len(batch) < self.max_batch_size:
+                batch.append(request)
+            else:
+                deferred.append(request)
+        self._pending = deferred
+
+        # A lone submitter has already queued all its windows, so only wait
+        # while another job could still add to the batch
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            with self._lock:
+                alone = self._submitters <= 1
+            remaining = 0 if alone else deadline - time.monotonic()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request.key == first.key:
+                batch.append(request)
+            else:
+                self._pending.append(request)
+        return batch
+
+    def _decode(self, batch: List[_WindowRequest]):
+        engine_name, model_name, language = batch[0].key
+        started = time.monotonic()
+        results = get_engine(engine_name, model_name).decode_batch(
+            [request.samples for request in batch],
+            language=language
+        )
+        print(f"Decoded batch of {len(batch)} windows in {time.monotonic() - started:.1f}s")
+        for request, result in zip(batch, results):
+            request.future.set_result(result)
+
+
+_batch_service: Optional[BatchingTranscriptionService] = None
+
+def get_batch_service() -> BatchingTranscriptionService:
+    """Get or create the per-process batching service singleton"""
+    global _batch_service
+    if _batch_service is None:
+        _batch_service = BatchingTranscriptionService()
+    return _batch_service
@@ -0,0 +1,30 @@
+import json
+import uuid
+from typing import Dict, List, Optional
+from ..config import settings
+from .redis_client import get_redis_client
+from .task_status import TaskStatusStore
+
+
+class BatchTracker:
+    """Remembers which scripts and tasks belong to a batch submission"""
+
+    def __init__(self):
+        self.redis = get_redis_client()
+
+    def _key(self, batch_id: str) -> str:
+        return f"batch:{batch_id}"
+
+    def create(self, items: List[Dict]) -> str:
+        """Store the batch's items (video_url, script_id, task_id, error) and return its ID"""
+        batch_id = uuid.uuid4().hex
+        self.redis.set(self._key(batch_id), json.dumps(items), ex=settings.SUBMIT_BATCH_TTL)
+        return batch_id
+
+    def get(self, batch_id: str) -> Optional[List[Dict]]:
+        data = self.redis.get(self._key(batch_id))
+        return json.loads(data) if data else None
+
+    def task_results(self, task_ids: List[Optional[str]]) -> List[Optional[Dict]]:
+        """Latest stored status of each task, read in one pipelined round trip"""
+        return TaskStatusStore().get_many(task_ids)
@@ -0,0 +1,71 @@
+import random
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+from ..config import settings
+from .youtube_downloader import YouTubeDownloader
+
+# Channel root URLs: /@handle, /channel/<id>, /c/<name> and /user/<name>
+CHANNEL_PATTERN = re.compile(
+    r'^(https?://(?:www\.|m\.)?youtube\.com/(?:@[^/?#]+|channel/[^/?#]+|c/[^/?#]+|user/[^/?#]+))'
+    r'(/(?:videos|streams|shorts))?/?(?:[?#].*)?$'
+)
+
+# Entries that aren't finished uploads yet; they are picked up once they are
+SKIPPED_LIVE_STATUSES = ('is_upcoming', 'is_live')
+
+
+def channel_uploads_url(url: str) -> Optional[str]:
+    """Normalize a channel URL to the tab whose uploads are synced (videos by default)"""
+    match = CHANNEL_PATTERN.match(url)
+    if not match:
+        return None
+    return f"{match.group(1)}{match.group(2) or '/videos'}"
+
+def next_check_time(interval: int, initial: bool = False) -> datetime:
+    """When a channel is next due.
+
+    New subscriptions land anywhere in their first interval and later syncs
+    drift by up to 10%, so channels don't all come due in the same tick.
+    """
+    delay = random.uniform(0, interval) if initial else interval * random.uniform(0.9, 1.1)
+    return datetime.utcnow() + timedelta(seconds=delay)
+
+
+class ChannelSync:
+    """Finds a channel's uploads that aren't in its cursor of seen video IDs"""
+
+    def __init__(self):
+        self.downloader = YouTubeDownloader()
+        self.page_size = settings.CHANNEL_SYNC_PAGE_SIZE
+
+    def latest(self, channel_url: str) -> Tuple[Optional[str], List[Dict]]:
+        """Channel title and its newest page of uploads, used as the starting cursor"""
+        page = self.downloader.extract_channel_uploads(channel_url, 1, self.page_size)
+        return page['title'], self._finished(page['entries'])
+
+    def new_uploads(self, channel_url: str, seen_ids: List[str]) -> Tuple[Optional[str], List[Dict]]:
+        """Channel title and uploads newer than anything seen, newest first.
+
+        Pages are listed only until a seen video turns up, so a sync costs one
+        request per page of new uploads. An empty cursor backfills the channel
+        up to SUBMIT_BATCH_MAX_VIDEOS.
+        """
+        seen = set(seen_ids)
+        title = None
+        new = []
+        start = 1
+        while len(new) < settings.SUBMIT_BATCH_MAX_VIDEOS:
+            page = self.downloader.extract_channel_uploads(channel_url, start, start + self.page_size - 1)
+            title = title or page['title']
+            for entry in self._finished(page['entries']):
+                if entry['video_id'] in seen:
+                    return title, new
+                new.append(entry)
+            if len(page['entries']) < self.page_size:
+                break
+            start += self.page_size
+        return title, new[:settings.SUBMIT_BATCH_MAX_VIDEOS]
+
+    def _finished(self, entries: List[Dict]) -> List[Dict]:
+        return [entry for entry in entries if entry.get('live_status') not in SKIPPED_LIVE_STATUSES]
@@ -0,0 +1,200 @@
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict
+from ..config import settings
+from .redis_client import get_redis_client
+
+PREFIX = "download_limiter"
+WAITING_KEY = f"{PREFIX}:waiting"  # token -> ticket number (FIFO order)
+ACTIVE_KEY = f"{PREFIX}:active"  # token -> lease expiry
+TICKET_KEY = f"{PREFIX}:ticket"
+BUCKET_KEY = f"{PREFIX}:bucket"
+WAITS_KEY = f"{PREFIX}:waits"  # recent wait times in seconds
+STATS_KEY = f"{PREFIX}:stats"
+THROUGHPUT_WINDOW = 10  # seconds averaged for the throughput metric
+RECENT_WAITS = 500
+REPORT_BYTES = 1024 * 1024  # bytes gathered before one accounting round trip
+REPORT_INTERVAL = 0.5  # or seconds, whichever comes first
+
+# Grant the slot if this token is among the first free-slot-count live waiters.
+# Waiters whose heartbeat expired (crashed workers) are dropped on the way.
+ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+local free = tonumber(ARGV[3]) - redis.call('ZCARD', KEYS[2])
+if free <= 0 then return 0 end
+local ahead = redis.call('ZRANGE', KEYS[1], 0, free - 1)
+for _, token in ipairs(ahead) do
+    if token == ARGV[1] then
+        redis.call('ZREM', KEYS[1], token)
+        redis.call('ZADD', KEYS[2], ARGV[4], token)
+        redis.call('DEL', KEYS[3] .. token)
+        return 1
+    end
+    if redis.call('EXISTS', KEYS[3] .. token) == 0 then
+        redis.call('ZREM', KEYS[1], token)
+    end
+end
+return 0
+"""
+
+# Token bucket shared by every download; returns how long the caller must
+# wait before sending ``ARGV[3]`` bytes (the bytes are reserved either way)
+TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local now = tonumber(ARGV[2])
+local amount = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or rate
+local ts = tonumber(state[2]) or now
+tokens = math.min(rate, tokens + (now - ts) * rate) - amount
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], 60)
+if tokens >= 0 then return '0' end
+return tostring(-tokens / rate)
+"""
+
+
+class DownloadSlot:
+    """A granted download slot; report bytes through ``consume`` as they arrive.
+
+    Bytes are accounted in batches of ``REPORT_BYTES`` (or every
+    ``REPORT_INTERVAL`` seconds), one Redis round trip per batch.
+    """
+
+    def __init__(self, limiter: 'DownloadLimiter', token: str):
+        self.limiter = limiter
+        self.token = token
+        self.bytes = 0
+        self._unreported = 0
+        self._reported = time.monotonic()
+
+    def consume(self, nbytes: int):
+        """Account for downloaded bytes, sleeping when over the cluster bandwidth"""
+        self.bytes += nbytes
+        self._unreported += nbytes
+        if self._unreported >= REPORT_BYTES or time.monotonic() - self._reported >= REPORT_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        nbytes, self._unreported = self._unreported, 0
+        self._reported = time.monotonic()
+        if not nbytes:
+            return
+        wait = self.limiter.account(nbytes)
+        if wait > 0:
+            time.sleep(wait)
+
+
+class DownloadLimiter:
+    """Cluster-wide cap on concurrent downloads and total download bandwidth.
+
+    Waiting jobs take a ticket and are granted slots strictly in ticket order.
+    Slots are leases that expire, so a crashed worker can't hold one forever;
+    a holder renews its lease from a heartbeat thread, so postprocessing or a
+    stalled stream doesn't lose the slot.
+    Bandwidth is a Redis token bucket shared by all running downloads.
+    """
+
+    def __init__(self):
+        self.redis = get_redis_client()
+        self.max_concurrent = settings.DOWNLOAD_MAX_CONCURRENT
+        self.bytes_per_sec = settings.DOWNLOAD_MAX_BYTES_PER_SEC
+        self.lease_seconds = settings.DOWNLOAD_SLOT_LEASE_SECONDS
+        self._acquire = self.redis.register_script(ACQUIRE_SCRIPT)
+        self._take = self.redis.register_script(TAKE_SCRIPT)
+
+    @contextmanager
+    def slot(self):
+        """Wait for a download slot and hold it for the duration of the block"""
+        token = uuid.uuid4().hex
+        heartbeat_key = f"{PREFIX}:heartbeat:{token}"
+        started = time.monotonic()
+        deadline = started + settings.DOWNLOAD_WAIT_TIMEOUT
+
+        self.redis.set(heartbeat_key, 1, ex=10)
+        self.redis.zadd(WAITING_KEY, {token: self.redis.incr(TICKET_KEY)})
+        try:
+            while not self._acquire(
+                keys=[WAITING_KEY, ACTIVE_KEY, f"{PREFIX}:heartbeat:"],
+                args=[token, time.time(), self.max_concurrent, time.time() + self.lease_seconds]
+            ):
+                if time.monotonic() > deadline:
+                    raise Exception("Timed out waiting for a download slot")
+                self.redis.set(heartbeat_key, 1, ex=10)
+                time.sleep(0.5)
+        except BaseException:
+            self.redis.zrem(WAITING_KEY, token)
+            self.redis.delete(heartbeat_key)
+            raise
+
+        self._record_wait(time.monotonic() - started)
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._keep_alive, args=(token, stop), name='download-slot-heartbeat', daemon=True
+        )
+        heartbeat.start()
+        slot = DownloadSlot(self, token)
+        try:
+            yield slot
+            slot.flush()
+        finally:
+            stop.set()
+            heartbeat.join()
+            self.redis.zrem(ACTIVE_KEY, token)
+
+    def _keep_alive(self, token: str, stop: threading.Event):
+        """Renew the slot's lease until the holder releases it"""
+        while not stop.wait(self.lease_seconds / 3):
+            try:
+                self.renew(token)
+            except Exception as e:
+                print(f"Failed to renew download slot: {str(e)}")
+
+    def renew(self, token: str):
+        self.redis.zadd(ACTIVE_KEY, {token: time.time() + self.lease_seconds}, xx=True)
+
+    def account(self, nbytes: int) -> float:
+        """Record downloaded bytes and reserve them from the shared bucket.
+
+        Returns the seconds to wait before downloading more.
+        """
+        key = f"{PREFIX}:bytes:{int(time.time())}"
+        pipe = self.redis.pipeline()
+        pipe.incrby(key, nbytes)
+        pipe.expire(key, THROUGHPUT_WINDOW * 2)
+        pipe.hincrby(STATS_KEY, 'bytes', nbytes)
+        if self.bytes_per_sec:
+            self._take(keys=[BUCKET_KEY], args=[self.bytes_per_sec, time.time(), nbytes], client=pipe)
+        results = pipe.execute()
+        return float(results[3]) if self.bytes_per_sec else 0.0
+
+    def _record_wait(self, seconds: float):
+        pipe = self.redis.pipeline()
+        pipe.lpush(WAITS_KEY, round(seconds, 3))
+        pipe.ltrim(WAITS_KEY, 0, RECENT_WAITS - 1)
+        pipe.hincrby(STATS_KEY, 'downloads', 1)
+        pipe.execute()
+
+    def stats(self) -> Dict:
+        now = int(time.time())
+        # Skip the current, still-filling second
+        seconds = range(now - THROUGHPUT_WINDOW, now)
+        recent = self.redis.mget([f"{PREFIX}:bytes:{second}" for second in seconds])
+        waits = sorted(float(wait) for wait in self.redis.lrange(WAITS_KEY, 0, -1))
+        totals = self.redis.hgetall(STATS_KEY)
+
+        self.redis.zremrangebyscore(ACTIVE_KEY, '-inf', time.time())
+        return {
+            'active': self.redis.zcard(ACTIVE_KEY),
+            'waiting': self.redis.zcard(WAITING_KEY),
+            'max_concurrent': self.max_concurrent,
+            'max_bytes_per_sec': self.bytes_per_sec,
+            'bytes_per_sec': sum(int(value or 0) for value in recent) / THROUGHPUT_WINDOW,
+            'wait_seconds_avg': sum(waits) / len(waits) if waits else 0.0,
+            'wait_seconds_p95': waits[int(len(waits) * 0.95)] if waits else 0.0,
+            'downloads': int(totals.get('downloads', 0)),
+            'bytes': int(totals.get('bytes', 0)),
+        }
@@ -0,0 +1,129 @@
+import time
+from typing import Dict, Optional
+from ..config import settings
+from .redis_client import get_redis_client
+from .queue_stats import QueueStats
+from .priority_tiers import stage_queues, pipeline_queue
+from .language_detector import multilingual_model
+
+PREFIX = "rtf"
+
+# Exponentially weighted moving average of the ratio, seeded by the first sample
+EWMA_SCRIPT = """
+local sample = tonumber(ARGV[1])
+local alpha = tonumber(ARGV[2])
+local current = tonumber(redis.call('HGET', KEYS[1], 'value'))
+if current then
+    sample = current + alpha * (sample - current)
+end
+redis.call('HSET', KEYS[1], 'value', sample)
+redis.call('HINCRBY', KEYS[1], 'samples', 1)
+return tostring(sample)
+"""
+
+
+class RealTimeFactors:
+    """Rolling processing speed of each pipeline stage, shared by all workers.
+
+    A real-time factor is wall-clock seconds per second of media: download
+    time per media-second (``download``) and decode time per audio-second
+    for each engine and model size (``decode``). English-only variants share
+    their size's factor: estimates made before the language is known use the
+    multilingual name. Each sample moves the average by ``ETA_EWMA_ALPHA``,
+    so the factors follow changes in hardware and load.
+    """
+
+    def __init__(self):
+        self.redis = get_redis_client()
+        self._update = self.redis.register_script(EWMA_SCRIPT)
+
+    def _key(self, stage: str, engine: str = None, model: str = None) -> str:
+        if stage == 'decode':
+            return f"{PREFIX}:{stage}:{engine}:{multilingual_model(model) if model else model}"
+        return f"{PREFIX}:{stage}"
+
+    def record(self, stage: str, elapsed: float, media_seconds: float, engine: str = None, model: str = None):
+        """Add a sample of ``elapsed`` wall-clock seconds spent on ``media_seconds`` of media"""
+        if not media_seconds or media_seconds <= 0 or elapsed <= 0:
+            return
+        self._update(
+            keys=[self._key(stage, engine, model)],
+            args=[elapsed / media_seconds, settings.ETA_EWMA_ALPHA]
+        )
+
+    def get(self, stage: str, engine: str = None, model: str = None) -> float:
+        value = self.redis.hget(self._key(stage, engine, model), 'value')
+        if value is not None:
+            return float(value)
+        return settings.ETA_DEFAULT_DECODE_RTF if stage == 'decode' else settings.ETA_DEFAULT_DOWNLOAD_RTF
+
+    def stats(self) -> Dict:
+        """Current factors and sample counts; download is also given per media-minute"""
+        stats = {}
+        for key in self.redis.scan_iter(f"{PREFIX}:*"):
+            values = self.redis.hgetall(key)
+            factor = float(values.get('value', 0))
+            entry = {'rtf': round(factor, 4), 'samples': int(values.get('samples', 0))}
+            if key == self._key('download'):
+                entry['seconds_per_media_minute'] = round(factor * 60, 2)
+            stats[key[len(PREFIX) + 1:]] = entry
+        return stats
+
+
+class EtaEstimator:
+    """Estimated time to completion of a job from the measured real-time factors.
+
+    Remaining work is summed over the stages a job still has to go through:
+    download, waiting for a CPU worker, decoding and formatting. The wait is
+    the queued audio ahead of the job divided by the cluster's decode
+    throughput (``ETA_CPU_SLOTS`` workers at the job model's factor).
+    """
+
+    # Stages in pipeline order
+    STAGES = ('queued', 'downloading', 'waiting', 'transcribing', 'finalizing')
+
+    def __init__(self, queue_stats: QueueStats = None):
+        self.queue_stats = queue_stats or QueueStats()
+        self.factors = RealTimeFactors()
+        self.slots = max(settings.ETA_CPU_SLOTS, 1)
+
+    def queue_position(self, is_pro: bool = False, deferred: bool = False) -> int:
+        """Transcription messages ahead of a job joining its tier's queue now.
+
+        Workers serve the queues in ``stage_queues`` order, so everything in
+        the job's queue and the ones before it counts.
+        """
+        queues = stage_queues('cpu')
+        own = queues.index(pipeline_queue('cpu', is_pro, deferred))
+        return self.queue_stats.queue_depth(queues[:own + 1])
+
+    def estimate(self, stage: str, duration: float, engine: str = None, model: str = None,
+                 is_pro: bool = False, deferred: bool = False, decoded_seconds: float = 0,
+                 queue_position: Optional[int] = None) -> Dict:
+        """ETA of a job at ``stage``; returns ``eta_seconds``, ``eta_at`` (epoch) and ``queue_position``"""
+        duration = float(duration or 0)
+        decode_rtf = self.factors.get('decode', engine, model)
+        remaining = settings.ETA_FINALIZE_SECONDS
+        position = None
+
+        if stage in ('queued', 'downloading', 'waiting', 'transcribing'):
+            # Chunked jobs decode on several workers at once
+            parallel = 1
+            if settings.CHUNKED_TRANSCRIPTION_ENABLED and duration > settings.CHUNKED_MIN_DURATION:
+                parallel = min(self.slots, max(int(duration // settings.CHUNK_WINDOW_SECONDS), 1))
+            remaining += max(duration - decoded_seconds, 0) * decode_rtf / parallel
+
+        if stage in ('queued', 'downloading', 'waiting'):
+            position = queue_position if queue_position is not None else self.queue_position(is_pro, deferred)
+            jobs = self.queue_stats.queued_jobs()
+            audio_ahead = self.queue_stats.queued_audio_seconds() * min(position / jobs, 1) if jobs else 0
+            remaining += audio_ahead * decode_rtf / self.slots
+
+        if stage in ('queued', 'downloading'):
+            remaining += duration * self.factors.get('download')
+
+        return {
+            'eta_seconds': int(round(remaining)),
+            'eta_at': time.time() + remaining,
+            'queue_position': position,
+        }
@@ -0,0 +1,59 @@
+from typing import Optional
+import numpy as np
+from ..config import settings
+from .audio_processor import AudioProcessor
+from .redis_client import get_redis_client
+from .transcription_engines import get_engine
+from .vad import VoiceActivityDetector
+
+# Sizes that ship an English-only variant (``tiny.en`` ...)
+ENGLISH_MODEL_SIZES = ('tiny', 'base', 'small', 'medium')
+
+
+class LanguageDetector:
+    """Detect a video's spoken language once and cache it per video ID"""
+
+    def __init__(self):
+        self.redis = get_redis_client()
+        self.processor = AudioProcessor()
+
+    def detect(self, video_id: str, samples: np.ndarray, engine_name: str = None,
+               model_name: str = None) -> Optional[str]:
+        """Return the video's language, running detection on a 30-second sample on a cache miss"""
+        cache_key = f"video_language:{video_id}"
+        cached = self.redis.get(cache_key) if video_id else None
+        if cached:
+            return cached
+
+        sample = self.processor.representative_sample(samples, score=self._speech_score)
+        if not len(sample):
+            return None
+
+        # English-only models can't detect languages, so use the multilingual variant
+        engine = get_engine(engine_name, multilingual_model(model_name or settings.WHISPER_MODEL))
+        language, probability = engine.detect_language(sample)
+        print(f"Detected language {language} (p={probability:.2f}) for video {video_id}")
+
+        if video_id:
+            self.redis.set(cache_key, language, ex=settings.VIDEO_LANGUAGE_CACHE_TTL)
+        return language
+
+    def _speech_score(self, candidate: np.ndarray) -> float:
+        """Prefer the window with the most speech so music beds don't win"""
+        if not settings.VAD_ENABLED:
+            return float(np.mean(candidate ** 2))
+        return VoiceActivityDetector().detect(candidate).speech_ratio
+
+
+def multilingual_model(model_name: str) -> str:
+    return model_name[:-3] if model_name.endswith('.en') else model_name
+
+def model_for_language(model_name: str, language: Optional[str]) -> str:
+    """Switch English audio to the English-only variant of the same size"""
+    if (
+        settings.ENGLISH_ONLY_MODELS
+        and language == 'en'
+        and model_name in ENGLISH_MODEL_SIZES
+    ):
+        return f"{model_name}.en"
+    return model_name
@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+from ..config import settings
+
+# Approximate resident memory (MB) of each Whisper model on CPU, used to
+# keep the pool under WHISPER_POOL_MEMORY_MB without measuring the process
+MODEL_MEMORY_MB = {
+    'tiny': 150,
+    'base': 300,
+    'small': 950,
+    'medium': 3000,
+    'large': 6000,
+}
+
+
+class WhisperModelPool:
+    """Process-wide pool of loaded Whisper models with LRU eviction.
+
+    Models are keyed by ``(engine, model name)`` so backends can share one
+    memory budget.
+    """
+
+    def __init__(self, memory_budget_mb: int = None, idle_timeout: int = None):
+        self.memory_budget_mb = memory_budget_mb or settings.WHISPER_POOL_MEMORY_MB
+        self.idle_timeout = idle_timeout or settings.WHISPER_MODEL_IDLE_TIMEOUT
+        self._models = OrderedDict()  # (engine, model name) -> model, least recently used first
+        self._last_used = {}
+        self._lock = threading.RLock()
+        self._reaper = None
+
+    def get(self, model_name: str, engine: str = None):
+        """Return a loaded model, loading it (and evicting others) if needed"""
+        key = (engine or settings.TRANSCRIPTION_ENGINE, model_name)
+        with self._lock:
+            model = self._models.get(key)
+            if model is None:
+                self._make_room(key)
+                model = self._load(key)
+                self._models[key] = model
+            self._models.move_to_end(key)
+            self._last_used[key] = time.monotonic()
+            return model
+
+    def preload(self, model_names: List[str], engine: str = None, warm_up: bool = True):
+        """Load models ahead of the first task and run one warm-up inference"""
+        for model_name in model_names:
+            self.get(model_name, engine=engine)
+            if warm_up:
+                self._warm_up(model_name, engine)
+
+    def unload(self, key: Tuple[str, str]):
+        """Drop a model from the pool so its memory can be reclaimed"""
+        with self._lock:
+            if self._models.pop(key, None) is not None:
+                self._last_used.pop(key, None)
+                print(f"Unloaded Whisper model: {key[1]} ({key[0]})")
+                self._release_memory()
+
+    def evict_idle(self):
+        """Unload models that have not been used within the idle timeout"""
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                key for key, last_used in self._last_used.items()
+                if now - last_used > self.idle_timeout
+            ]
+        for key in idle:
+            self.unload(key)
+
+    def start_idle_reaper(self, interval: int = 60):
+        """Periodically evict idle models from a daemon thread"""
+        if self._reaper is not None:
+            return
+
+        def _run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.evict_idle()
+                except Exception as e:
+                    print(f"Idle model eviction failed: {str(e)}")
+
+        self._reaper = threading.Thread(target=_run, name='whisper-pool-reaper', daemon=True)
+        self._reaper.start()
+
+    def loaded_models(self) -> Dict[str, float]:
+        """Return loaded models (``engine:model``) with seconds since last use"""
+        now = time.monotonic()
+        with self._lock:
+            return {f"{key[0]}:{key[1]}": now - self._last_used[key] for key in self._models}
+
+    def memory_used_mb(self) -> int:
+        with self._lock:
+            return sum(self._estimate_mb(key) for key in self._models)
+
+    def _make_room(self, key: Tuple[str, str]):
+        """Evict least recently used models until the new one fits the budget"""
+        needed = self._estimate_mb(key)
+        while self._models and self.memory_used_mb() + needed > self.memory_budget_mb:
+            lru_key = next(iter(self._models))
+            self.unload(lru_key)
+
+    def _load(self, key: Tuple[str, str]):
+        from .transcription_engines import get_engine_class
+
+        engine_name, model_name = key
+        print(f"Loading Whisper model: {model_name} ({engine_name})")
+        started = time.monotonic()
+        model = get_engine_class(engine_name).load(model_name)
+        print(f"Loaded Whisper model {model_name} in {time.monotonic() - started:.1f}s")
+        return model
+
+    def _warm_up(self, model_name: str, engine: str = None):
+        """Run a short inference so the first real job doesn't pay for lazy init"""
+        import numpy as np
+        from .transcription_engines import get_engine
+
+        try:
+            silence = np.zeros(16000, dtype=np.float32)
+            get_engine(engine, model_name).transcribe(silence)
+        except Exception as e:
+            print(f"Warm-up of Whisper model {model_name} failed: {str(e)}")
+
+    def _estimate_mb(self, key: Tuple[str, str]) -> int:
+        from .transcription_engines import get_engine_class
+
+        engine_name, model_name = key
+        base_name = model_name.split('.')[0]
+        if base_name.startswith('large'):
+            base_name = 'large'
+        size = MODEL_MEMORY_MB.get(base_name, MODEL_MEMORY_MB['large'])
+        return int(size * get_engine_class(engine_name).memory_factor)
+
+    def _release_memory(self):
+        import gc
+        gc.collect()
+
+
+_model_pool: Optional[WhisperModelPool] = None
+
+def get_model_pool() -> WhisperModelPool:
+    """Get or create the per-process model pool singleton"""
+    global _model_pool
+    if _model_pool is None:
+        _model_pool = WhisperModelPool()
+    return _model_pool
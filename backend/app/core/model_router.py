@@ -0,0 +1,49 @@
+from typing import Dict, Tuple
+from ..config import settings
+from .queue_stats import QueueStats
+
+
+class ModelRouter:
+    """Pick the Whisper model for a job from the current backlog.
+
+    Models are ordered on ``MODEL_ROUTING_LADDER`` from fastest to most
+    accurate. Under backlog pressure jobs drop to the fastest model, and once
+    the queue drains they go back to the most accurate one; video length and
+    user tier then shift the choice one step down or up.
+    """
+
+    def __init__(self, queue_stats: QueueStats = None):
+        self.queue_stats = queue_stats or QueueStats()
+        self.ladder = settings.MODEL_ROUTING_LADDER
+
+    def select_model(self, duration: float, is_pro: bool = False) -> Tuple[str, Dict]:
+        """Return the model name and the inputs that led to it"""
+        if not settings.AUTO_MODEL_SELECTION:
+            return settings.WHISPER_MODEL, {'reason': 'static'}
+
+        stats = self.queue_stats.snapshot()
+        pressure = max(
+            stats['queued_audio_seconds'] / settings.BACKLOG_HIGH_AUDIO_SECONDS,
+            stats['queue_depth'] / settings.BACKLOG_HIGH_QUEUE_DEPTH
+        )
+
+        if pressure >= 1:
+            level, reason = 0, 'backlog high'
+        elif pressure <= settings.BACKLOG_LOW_FRACTION:
+            level, reason = len(self.ladder) - 1, 'backlog drained'
+        else:
+            level, reason = self._default_level(), 'backlog normal'
+
+        if duration and duration > settings.ROUTING_LONG_VIDEO_SECONDS:
+            level -= 1
+        if is_pro:
+            level += 1
+
+        level = min(max(level, 0), len(self.ladder) - 1)
+        decision = dict(stats, pressure=round(pressure, 3), reason=reason, is_pro=is_pro, duration=duration)
+        return self.ladder[level], decision
+
+    def _default_level(self) -> int:
+        if settings.WHISPER_MODEL in self.ladder:
+            return self.ladder.index(settings.WHISPER_MODEL)
+        return len(self.ladder) // 2
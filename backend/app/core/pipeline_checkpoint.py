@@ -0,0 +1,88 @@
+import json
+from typing import Dict, Optional
+import redis
+from sqlalchemy import exc as sa_exc
+from ..config import settings
+from .redis_client import get_redis_client
+from .video_info_cache import is_permanent_error
+
+# Error messages (usually wrapped by yt-dlp or our own stages) worth retrying
+TRANSIENT_ERROR_MARKERS = (
+    'timed out',
+    'timeout',
+    'temporarily',
+    'temporary failure',
+    'connection reset',
+    'connection refused',
+    'connection aborted',
+    'remote end closed',
+    'network is unreachable',
+    'server closed the connection',
+    'too many requests',
+    'http error 429',
+    'http error 500',
+    'http error 502',
+    'http error 503',
+    'http error 504',
+    'incompleteread',
+)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether a stage failure is likely to go away on retry"""
+    if isinstance(error, (
+        ConnectionError,
+        TimeoutError,
+        redis.exceptions.ConnectionError,
+        redis.exceptions.TimeoutError,
+        sa_exc.OperationalError,
+        sa_exc.DisconnectionError,
+    )):
+        return True
+
+    message = str(error).lower()
+    if is_permanent_error(message):
+        return False
+    return any(marker in message for marker in TRANSIENT_ERROR_MARKERS)
+
+
+class PipelineCheckpoint:
+    """Outputs of the completed steps of one job, keyed by the job's task ID.
+
+    Each stage saves what it produced (metadata, audio path, transcript path,
+    hand-off to the next stage) as it goes. A retried or redelivered stage
+    reads them back and skips the work that's already done. The files
+    referenced live on shared storage under TEMP_AUDIO_PATH.
+    """
+
+    def __init__(self, task_id: str):
+        self.redis = get_redis_client()
+        self.key = f"pipeline_checkpoint:{task_id}"
+
+    def get(self, step: str) -> Optional[Dict]:
+        data = self.redis.hget(self.key, step)
+        return json.loads(data) if data else None
+
+    def save(self, step: str, data: Dict):
+        pipe = self.redis.pipeline()
+        pipe.hset(self.key, step, json.dumps(data))
+        pipe.expire(self.key, settings.PIPELINE_CHECKPOINT_TTL)
+        pipe.execute()
+
+    def claim(self, stage: str, token: str) -> bool:
+        """Whether the message carrying ``token`` owns ``stage`` of this job.
+
+        Every hand-off to a stage carries a fresh token. The first message to
+        start the stage claims it; redeliveries and retries of that message
+        share its token and pass, while a second hand-off of the same stage
+        (the previous stage re-ran after a crash) is turned away.
+        """
+        field = f"claim:{stage}"
+        pipe = self.redis.pipeline()
+        pipe.hsetnx(self.key, field, token)
+        pipe.hget(self.key, field)
+        pipe.expire(self.key, settings.PIPELINE_CHECKPOINT_TTL)
+        return pipe.execute()[1] == token
+
+    def clear(self):
+        self.redis.delete(self.key)
@@ -0,0 +1,87 @@
+import time
+from typing import Dict, List, Optional
+from ..config import settings
+from .redis_client import get_redis_client
+
+TIERS = ('pro', 'free', 'deferred')
+STAGES = ('io', 'cpu')
+PERCENTILES = (50, 90, 99)
+
+
+def tier_name(is_pro: bool, deferred: bool = False) -> str:
+    if deferred:
+        return 'deferred'
+    return 'pro' if is_pro else 'free'
+
+def pipeline_queue(stage: str, is_pro: bool, deferred: bool = False) -> str:
+    """Broker queue for a pipeline stage ('io' or 'cpu') in the job's tier.
+
+    Jobs deferred by admission control download like free jobs but wait for
+    transcription in their own queue, which workers serve last.
+    """
+    if stage == 'cpu':
+        if deferred:
+            return settings.PIPELINE_CPU_DEFERRED_QUEUE
+        return settings.PIPELINE_CPU_PRO_QUEUE if is_pro else settings.PIPELINE_CPU_QUEUE
+    return settings.PIPELINE_IO_PRO_QUEUE if is_pro and not deferred else settings.PIPELINE_IO_QUEUE
+
+def stage_queues(stage: str) -> List[str]:
+    """Every tier's queue for a stage, in the order workers serve them.
+
+    Shared workers listen on all of them in this order (Pro, free, then
+    deferred), so free work only starts when no Pro job is waiting. Pro
+    capacity is reserved by workers that listen on the Pro queue alone; a
+    Pro job never waits for a free job to finish on those.
+    """
+    return list(dict.fromkeys(pipeline_queue(stage, is_pro, deferred) for is_pro, deferred in (
+        (True, False), (False, False), (False, True)
+    )))
+
+
+class QueueWaitStats:
+    """How long jobs sat in the broker before a worker picked them up.
+
+    The most recent ``QUEUE_WAIT_SAMPLES`` waits are kept per stage and tier,
+    so percentiles follow the current load rather than all-time history.
+    """
+
+    def __init__(self):
+        self.redis = get_redis_client()
+        self.samples = settings.QUEUE_WAIT_SAMPLES
+
+    def _key(self, stage: str, tier: str) -> str:
+        return f"queue_wait:{stage}:{tier}"
+
+    def record(self, stage: str, is_pro: bool, enqueued_at: Optional[float], deferred: bool = False):
+        """Record the wait of a job starting now; jobs without an enqueue time are skipped"""
+        if not enqueued_at:
+            return
+        key = self._key(stage, tier_name(is_pro, deferred))
+        pipe = self.redis.pipeline()
+        pipe.lpush(key, max(time.time() - float(enqueued_at), 0.0))
+        pipe.ltrim(key, 0, self.samples - 1)
+        pipe.execute()
+
+    def snapshot(self) -> Dict:
+        """Wait percentiles in seconds, by stage and tier"""
+        pipe = self.redis.pipeline()
+        for stage in STAGES:
+            for tier in TIERS:
+                pipe.lrange(self._key(stage, tier), 0, -1)
+        samples = iter(pipe.execute())
+
+        return {
+            stage: {tier: self._percentiles(next(samples)) for tier in TIERS}
+            for stage in STAGES
+        }
+
+    def _percentiles(self, values: List) -> Dict:
+        waits = sorted(float(value) for value in values)
+        stats = {'samples': len(waits)}
+        for percentile in PERCENTILES:
+            if waits:
+                index = min(int(round(percentile / 100 * (len(waits) - 1))), len(waits) - 1)
+                stats[f"p{percentile}"] = round(waits[index], 3)
+            else:
+                stats[f"p{percentile}"] = None
+        return stats
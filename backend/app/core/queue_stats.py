@@ -0,0 +1,63 @@
+from typing import Dict, List
+from .redis_client import get_redis_client, get_broker_redis_client
+from .priority_tiers import stage_queues
+
+JOBS_KEY = "backlog:jobs"  # script ID -> audio-seconds still to transcribe
+AUDIO_SECONDS_KEY = "backlog:audio_seconds"
+
+
+class QueueStats:
+    """Cluster-wide view of the transcription backlog.
+
+    Jobs are registered with their audio duration when they are submitted and
+    removed once their transcription has finished (or failed), so the total
+    reflects audio-seconds queued or in flight.
+    """
+
+    def __init__(self):
+        self.redis = get_redis_client()
+        self.broker = get_broker_redis_client()
+
+    def add_job(self, script_id: int, audio_seconds: float):
+        """Register a submitted job; re-adding the same script is a no-op"""
+        audio_seconds = float(audio_seconds or 0)
+        if self.redis.hsetnx(JOBS_KEY, script_id, audio_seconds):
+            self.redis.incrbyfloat(AUDIO_SECONDS_KEY, audio_seconds)
+
+    def add_jobs(self, jobs: Dict[int, float]):
+        """Register many submitted jobs (script ID -> audio-seconds) in one round trip"""
+        pipe = self.redis.pipeline()
+        for script_id, audio_seconds in jobs.items():
+            pipe.hsetnx(JOBS_KEY, script_id, float(audio_seconds or 0))
+        added = pipe.execute()
+
+        total = sum(float(seconds or 0) for seconds, new in zip(jobs.values(), added) if new)
+        if total:
+            self.redis.incrbyfloat(AUDIO_SECONDS_KEY, total)
+
+    def finish_job(self, script_id: int):
+        """Remove a job from the backlog once its transcription is done"""
+        audio_seconds = self.redis.hget(JOBS_KEY, script_id)
+        if audio_seconds is not None and self.redis.hdel(JOBS_KEY, script_id):
+            self.redis.incrbyfloat(AUDIO_SECONDS_KEY, -float(audio_seconds))
+
+    def queued_audio_seconds(self) -> float:
+        return max(float(self.redis.get(AUDIO_SECONDS_KEY) or 0), 0.0)
+
+    def queued_jobs(self) -> int:
+        return self.redis.hlen(JOBS_KEY)
+
+    def queue_depth(self, queues: List[str] = None) -> int:
+        """Number of messages waiting in the broker queues (transcription, both tiers, by default)"""
+        queues = queues or stage_queues('cpu')
+        pipe = self.broker.pipeline()
+        for queue in queues:
+            pipe.llen(queue)
+        return sum(pipe.execute())
+
+    def snapshot(self) -> Dict:
+        return {
+            'queue_depth': self.queue_depth(),
+            'queued_jobs': self.queued_jobs(),
+            'queued_audio_seconds': self.queued_audio_seconds(),
+        }
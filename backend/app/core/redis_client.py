@@ -8,4 +8,13 @@ def get_redis_client():
     global _redis_client
     if _redis_client is None:
         _redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
-    return _redis_client
\ No newline at end of file
+    return _redis_client
+
+_broker_redis_client = None
+
+def get_broker_redis_client():
+    """Get or create a client for the Celery broker database (queue inspection)"""
+    global _broker_redis_client
+    if _broker_redis_client is None:
+        _broker_redis_client = redis.from_url(settings.CELERY_BROKER_URL, decode_responses=True)
+    return _broker_redis_client
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional, Set
+import redis.asyncio as aioredis
+from ..config import settings
+from .task_status import decode_status, task_channel, task_status_key
+
+TERMINAL_STATUSES = ('completed', 'failed')
+
+
+def status_payload(task_id: str, task_result: Dict) -> Dict:
+    """Client-facing status (the ProcessingStatus fields) of a stored task result"""
+    state = task_result.get('state')
+    running = state not in ('SUCCESS', 'FAILURE')
+    eta_at = task_result.get('eta_at')
+    return {
+        'task_id': task_id,
+        'status': 'completed' if state == 'SUCCESS' else 'failed' if state == 'FAILURE' else 'processing',
+        'progress': task_result.get('progress', 0),
+        'message': task_result.get('status', 'Processing...'),
+        'script_id': task_result.get('script_id'),
+        'speech_ratio': task_result.get('speech_ratio'),
+        'eta_seconds': max(int(eta_at - time.time()), 0) if running and eta_at else None,
+        'queue_position': task_result.get('queue_position') if running else None,
+    }
+
+
+class TaskEventHub:
+    """Fans task status updates from Redis pub/sub out to connected clients.
+
+    Each API process holds one pub/sub connection, whatever the number of
+    clients. A task's channel is subscribed while at least one client
+    listens to it. Clients get updates on their own ``asyncio.Queue``; a
+    client that falls behind loses its oldest updates, since only the
+    latest status of a task matters.
+    """
+
+    def __init__(self):
+        self.redis = aioredis.from_url(settings.REDIS_URL, decode_responses=True)
+        self.pubsub = self.redis.pubsub()
+        self.listeners: Dict[str, Set[asyncio.Queue]] = {}
+        self._lock = asyncio.Lock()
+        self._reader = None
+
+    async def subscribe(self, queue: asyncio.Queue, task_ids: List[str]):
+        """Start delivering updates of the tasks to the queue, beginning with their current status"""
+        async with self._lock:
+            new = [task_id for task_id in task_ids if task_id not in self.listeners]
+            for task_id in task_ids:
+                self.listeners.setdefault(task_id, set()).add(queue)
+            if new:
+                await self.pubsub.subscribe(*[task_channel(task_id) for task_id in new])
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read())
+
+        # Read after subscribing so an update can't fall between the two
+        pipe = self.redis.pipeline(transaction=False)
+        for task_id in task_ids:
+            pipe.hgetall(task_status_key(task_id))
+        for task_id, fields in zip(task_ids, await pipe.execute()):
+            if fields:
+                self._deliver(queue, status_payload(task_id, decode_status(fields)))
+
+    async def unsubscribe(self, queue: asyncio.Queue, task_ids: List[str]):
+        async with self._lock:
+            unused = []
+            for task_id in task_ids:
+                queues = self.listeners.get(task_id)
+                if queues is None:
+                    continue
+                queues.discard(queue)
+                if not queues:
+                    del self.listeners[task_id]
+                    unused.append(task_channel(task_id))
+            if unused:
+                await self.pubsub.unsubscribe(*unused)
+
+    async def _read(self):
+        while True:
+            try:
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # The connection re-subscribes to its channels when it reconnects
+                print(f"Task event subscription error: {str(e)}")
+                await asyncio.sleep(1)
+                continue
+
+            if not message or message['type'] != 'message':
+                continue
+            task_id = message['channel'][len(task_channel('')):]
+            payload = status_payload(task_id, json.loads(message['data']))
+            for queue in list(self.listeners.get(task_id, ())):
+                self._deliver(queue, payload)
+
+    def _deliver(self, queue: asyncio.Queue, payload: Dict):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(payload)
+
+
+_hub: Optional[TaskEventHub] = None
+
+def get_task_event_hub() -> TaskEventHub:
+    """Per-process hub; created on first use inside the running event loop"""
+    global _hub
+    if _hub is None:
+        _hub = TaskEventHub()
+    return _hub
@@ -0,0 +1,53 @@
+import json
+from typing import Dict, List, Optional
+from .redis_client import get_redis_client
+
+STATUS_TTL = 3600  # seconds a finished or abandoned task's status is kept
+
+
+def task_status_key(task_id: str) -> str:
+    return f"task_status:{task_id}"
+
+def task_channel(task_id: str) -> str:
+    return f"task_events:{task_id}"
+
+def encode_status(fields: Dict) -> Dict[str, str]:
+    return {name: json.dumps(value) for name, value in fields.items()}
+
+def decode_status(fields: Dict[str, str]) -> Optional[Dict]:
+    return {name: json.loads(value) for name, value in fields.items()} if fields else None
+
+
+class TaskStatusStore:
+    """Latest status of each pipeline task, one Redis hash per task.
+
+    An update merges its fields into the hash, refreshes the expiry and
+    publishes the update to the task's channel (see ``task_events``). All
+    of that goes out in a single pipelined round trip.
+    """
+
+    def __init__(self):
+        self.redis = get_redis_client()
+
+    def update(self, task_id: str, fields: Dict, clear: List[str] = None, ttl: int = STATUS_TTL):
+        """Merge ``fields`` into the task's status, dropping the ``clear`` fields"""
+        key = task_status_key(task_id)
+        pipe = self.redis.pipeline()
+        if clear:
+            pipe.hdel(key, *clear)
+        pipe.hset(key, mapping=encode_status(fields))
+        pipe.expire(key, ttl)
+        pipe.publish(task_channel(task_id), json.dumps(fields))
+        pipe.execute()
+
+    def get(self, task_id: str) -> Optional[Dict]:
+        return decode_status(self.redis.hgetall(task_status_key(task_id)))
+
+    def get_many(self, task_ids: List[Optional[str]]) -> List[Optional[Dict]]:
+        """Status of each task (None for unknown or missing IDs) with one pipelined HGETALL"""
+        pipe = self.redis.pipeline(transaction=False)
+        for task_id in task_ids:
+            if task_id:
+                pipe.hgetall(task_status_key(task_id))
+        values = iter(pipe.execute())
+        return [decode_status(next(values)) if task_id else None for task_id in task_ids]
@@ -1,50 +1,197 @@
-import whisper
-import os
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional, Union
+import numpy as np
 from ..config import settings
+from .audio_processor import AudioProcessor
+from .batch_decoder import get_batch_service
+from .transcription_engines import get_engine
+from .vad import SpeechTimeline, VoiceActivityDetector
 
 class WhisperTranscriber:
-    def __init__(self):
-        self.model = None
-        self.model_name = settings.WHISPER_MODEL
+    def __init__(self, engine_name: str = None, model_name: str = None):
+        self.engine = get_engine(engine_name, model_name)
+        self.engine_name = self.engine.name
+        self.model_name = self.engine.model_name
     
     def load_model(self):
-        """Load Whisper model if not already loaded"""
-        if self.model is None:
-            print(f"Loading Whisper model: {self.model_name}")
-            self.model = whisper.load_model(self.model_name)
+        """Get the model from the worker's resident model pool"""
+        self.engine.load_model()
     
-    def transcribe_audio(self, audio_path: str, language: str = None) -> Dict:
-        """Transcribe audio file and return segments with timestamps"""
+    def transcribe_audio(self, audio: Union[str, np.ndarray], language: str = None,
+                         on_window: Optional[Callable[[List[Dict], Dict], None]] = None,
+                         batched: bool = False, word_timestamps: bool = False) -> Dict:
+        """Transcribe an audio file (or 16 kHz samples) and return segments with timestamps.
+
+        When ``on_window`` is given the audio is decoded window by window and the
+        callback receives each window's segments (on the original timeline) as
+        soon as they are decoded. ``batched`` sends 30-second windows to the
+        process's batching service so they are decoded in one pass.
+        ``word_timestamps`` adds a ``words`` list to every segment; batched
+        decoding has no word alignment, so it is skipped then.
+        """
         try:
             self.load_model()
-            
-            # Transcribe with word timestamps
-            result = self.model.transcribe(
-                audio_path,
-                language=language,
-                word_timestamps=True,
-                verbose=False
-            )
-            
-            # Format segments with timestamps
-            segments = []
-            for segment in result['segments']:
-                segments.append({
-                    'start': segment['start'],
-                    'end': segment['end'],
-                    'text': segment['text'].strip()
-                })
-            
-            return {
-                'text': result['text'],
-                'segments': segments,
-                'language': result['language'],
-                'duration': result.get('duration', 0)
-            }
+
+            # Decode files once here; streamed .f32 downloads are read as-is
+            if isinstance(audio, str):
+                audio = AudioProcessor().load_pcm(audio)
+
+            # Feed only the speech regions to the model
+            timeline = None
+            if settings.VAD_ENABLED:
+                timeline = VoiceActivityDetector().detect(audio)
+                print(f"Speech ratio: {timeline.speech_ratio:.0%} of {timeline.duration:.0f}s")
+                if not timeline.regions:
+                    return self._empty_result(timeline)
+                audio = timeline.compact(audio)
+
+            if batched and not word_timestamps:
+                result = self._transcribe_batched(audio, language, self._mapped_callback(on_window, timeline))
+            elif on_window is not None:
+                result = self._transcribe_windowed(
+                    audio, language, self._mapped_callback(on_window, timeline), word_timestamps
+                )
+            else:
+                result = self.engine.transcribe(audio, language=language, word_timestamps=word_timestamps)
+
+            if timeline is not None:
+                result = dict(
+                    result,
+                    segments=timeline.map_segments(result['segments']),
+                    duration=timeline.duration,
+                    speech_ratio=timeline.speech_ratio
+                )
+            return result
             
         except Exception as e:
             raise Exception(f"Transcription failed: {str(e)}")
+
+    def _mapped_callback(self, on_window: Callable[[List[Dict], Dict], None],
+                         timeline: Optional[SpeechTimeline]) -> Callable[[List[Dict], Dict], None]:
+        """Report windows on the original timeline when decoding speech-only audio"""
+        if timeline is None or on_window is None:
+            return on_window
+
+        def report(segments, window):
+            on_window(timeline.map_segments(segments), dict(
+                window,
+                keep_start=timeline.to_original(window['keep_start']),
+                keep_end=timeline.to_original(window['keep_end'])
+            ))
+        return report
+
+    def _empty_result(self, timeline: SpeechTimeline) -> Dict:
+        return {
+            'text': '',
+            'segments': [],
+            'language': None,
+            'duration': timeline.duration,
+            'speech_ratio': 0.0
+        }
+
+    def _transcribe_windowed(self, audio: np.ndarray, language: Optional[str],
+                             on_window: Callable[[List[Dict], Dict], None],
+                             word_timestamps: bool = False) -> Dict:
+        """Decode silence-aligned windows in order, reporting each one as it completes"""
+        processor = AudioProcessor()
+        samples = audio
+        windows = processor.plan_windows(
+            samples,
+            window_seconds=settings.STREAM_WINDOW_SECONDS,
+            overlap_seconds=settings.CHUNK_OVERLAP_SECONDS
+        )
+
+        chunk_results = []
+        prompt = None
+        for window in windows:
+            result = self.engine.transcribe(
+                processor.slice(samples, window['start'], window['end']),
+                language,
+                initial_prompt=prompt,
+                word_timestamps=word_timestamps
+            )
+            chunk_result = {'chunk': window, 'segments': result['segments'], 'language': result['language']}
+            chunk_results.append(chunk_result)
+
+            # Once the first window has fixed the language, keep it and carry
+            # the tail of the text over as context for the next window
+            language = language or result['language']
+            window_segments = self.offset_chunk_segments(chunk_result)
+            prompt = ' '.join(s['text'] for s in window_segments)[-200:] or None
+
+            on_window(window_segments, window)
+
+        return self.merge_chunk_results(chunk_results)
+
+    def _transcribe_batched(self, audio: np.ndarray, language: Optional[str],
+                            on_window: Optional[Callable[[List[Dict], Dict], None]]) -> Dict:
+        """Decode silence-aligned 30-second windows through the batching service"""
+        processor = AudioProcessor()
+        samples = audio
+        windows = processor.plan_windows(samples, window_seconds=settings.BATCH_WINDOW_SECONDS, overlap_seconds=0)
+
+        futures = get_batch_service().submit(
+            self.engine_name,
+            self.model_name,
+            [processor.slice(samples, window['start'], window['end']) for window in windows],
+            language=language
+        )
+
+        chunk_results = []
+        for window, future in zip(windows, futures):
+            result = future.result()
+            chunk_result = {'chunk': window, 'segments': result['segments'], 'language': result['language']}
+            chunk_results.append(chunk_result)
+            if on_window is not None:
+                on_window(self.offset_chunk_segments(chunk_result), window)
+
+        return self.merge_chunk_results(chunk_results)
+
+    def offset_chunk_segments(self, chunk_result: Dict) -> List[Dict]:
+        """Shift a chunk's segments onto the full timeline and drop the overlap.
+
+        A segment is kept only by the chunk that owns its midpoint, which removes
+        the text duplicated between neighbouring chunks.
+        """
+        chunk = chunk_result['chunk']
+        offset = chunk['start']
+        segments = []
+        for segment in chunk_result['segments']:
+            start = segment['start'] + offset
+            end = segment['end'] + offset
+            midpoint = (start + end) / 2
+            if chunk['keep_start'] <= midpoint < chunk['keep_end']:
+                shifted = {'start': start, 'end': end, 'text': segment['text']}
+                if 'words' in segment:
+                    shifted['words'] = [
+                        dict(word, start=word['start'] + offset, end=word['end'] + offset)
+                        for word in segment['words']
+                    ]
+                segments.append(shifted)
+        return segments
+    
+    def merge_chunk_results(self, chunk_results: List[Dict]) -> Dict:
+        """Stitch per-chunk transcripts back into a single transcript"""
+        segments = []
+        languages = {}
+        duration = 0.0
+        speech_seconds = 0.0
+        for chunk_result in sorted(chunk_results, key=lambda r: r['chunk']['index']):
+            chunk = chunk_result['chunk']
+            segments.extend(self.offset_chunk_segments(chunk_result))
+            language = chunk_result.get('language')
+            if language:
+                languages[language] = languages.get(language, 0) + 1
+            duration = max(duration, chunk['keep_end'])
+            speech_seconds += chunk_result.get('speech_ratio', 1.0) * (chunk['keep_end'] - chunk['keep_start'])
+
+        segments.sort(key=lambda s: s['start'])
+        return {
+            'text': ' '.join(s['text'] for s in segments if s['text']),
+            'segments': segments,
+            'language': max(languages, key=languages.get) if languages else None,
+            'duration': duration,
+            'speech_ratio': speech_seconds / duration if duration else 0.0
+        }
     
     def format_transcript(self, segments: List[Dict], format_type: str = 'timestamps') -> str:
         """Format transcript segments into readable text"""
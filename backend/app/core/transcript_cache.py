@@ -0,0 +1,118 @@
+import hashlib
+import json
+import time
+from typing import Dict, Optional
+from ..config import settings
+from .redis_client import get_redis_client
+
+PREFIX = "transcript_cache"
+LRU_KEY = f"{PREFIX}:lru"  # cache key -> last access time
+SIZES_KEY = f"{PREFIX}:sizes"  # cache key -> stored bytes
+BYTES_KEY = f"{PREFIX}:bytes"
+STATS_KEY = f"{PREFIX}:stats"
+
+
+def decode_params(word_timestamps: bool = False) -> Dict:
+    """Decode settings that change the transcript and therefore the cache key"""
+    return {
+        'word_timestamps': word_timestamps,
+        'vad': settings.VAD_ENABLED,
+        'english_only_models': settings.ENGLISH_ONLY_MODELS,
+    }
+
+
+class TranscriptCache:
+    """Shared transcript cache keyed by video and decode settings.
+
+    Entries are addressed by a hash of ``(video_id, engine, model, decode
+    params)`` so the same video submitted by different users is transcribed
+    once. The total size is kept under ``TRANSCRIPT_CACHE_MAX_BYTES`` by
+    evicting the least recently used entries.
+    """
+
+    def __init__(self):
+        self.redis = get_redis_client()
+        self.max_bytes = settings.TRANSCRIPT_CACHE_MAX_BYTES
+
+    def key(self, video_id: str, engine: str, model: str, params: Dict) -> str:
+        identity = json.dumps({
+            'video_id': video_id,
+            'engine': engine,
+            'model': model,
+            'params': params,
+        }, sort_keys=True)
+        return f"{PREFIX}:{hashlib.sha256(identity.encode('utf-8')).hexdigest()}"
+
+    def get(self, video_id: str, engine: str, model: str, params: Dict) -> Optional[Dict]:
+        """Return the cached entry and count the hit or miss"""
+        if not settings.TRANSCRIPT_CACHE_ENABLED or not video_id:
+            return None
+
+        key = self.key(video_id, engine, model, params)
+        data = self.redis.get(key)
+
+        if data is None:
+            self.redis.hincrby(STATS_KEY, 'misses', 1)
+            # The entry may have expired without going through eviction
+            if self.redis.hexists(SIZES_KEY, key):
+                self._forget(key)
+            return None
+
+        pipe = self.redis.pipeline()
+        pipe.hincrby(STATS_KEY, 'hits', 1)
+        pipe.zadd(LRU_KEY, {key: time.time()})
+        pipe.execute()
+        return json.loads(data)
+
+    def put(self, video_id: str, engine: str, model: str, params: Dict, entry: Dict):
+        """Store a finished transcript and evict old entries over the size limit"""
+        if not settings.TRANSCRIPT_CACHE_ENABLED or not video_id:
+            return
+
+        key = self.key(video_id, engine, model, params)
+        data = json.dumps(entry, ensure_ascii=False)
+        size = len(data.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+
+        previous = int(self.redis.hget(SIZES_KEY, key) or 0)
+        pipe = self.redis.pipeline()
+        pipe.set(key, data, ex=settings.TRANSCRIPT_CACHE_TTL)
+        pipe.zadd(LRU_KEY, {key: time.time()})
+        pipe.hset(SIZES_KEY, key, size)
+        pipe.incrby(BYTES_KEY, size - previous)
+        pipe.execute()
+
+        self._evict()
+
+    def stats(self) -> Dict:
+        stats = self.redis.hgetall(STATS_KEY)
+        hits = int(stats.get('hits', 0))
+        misses = int(stats.get('misses', 0))
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'entries': self.redis.zcard(LRU_KEY),
+            'bytes': int(self.redis.get(BYTES_KEY) or 0),
+            'max_bytes': self.max_bytes,
+        }
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits its byte budget"""
+        while int(self.redis.get(BYTES_KEY) or 0) > self.max_bytes:
+            oldest = self.redis.zrange(LRU_KEY, 0, 0)
+            if not oldest:
+                break
+            self._forget(oldest[0])
+            self.redis.hincrby(STATS_KEY, 'evictions', 1)
+
+    def _forget(self, key: str):
+        """Remove an entry together with its size accounting"""
+        size = int(self.redis.hget(SIZES_KEY, key) or 0)
+        pipe = self.redis.pipeline()
+        pipe.delete(key)
+        pipe.zrem(LRU_KEY, key)
+        pipe.hdel(SIZES_KEY, key)
+        pipe.incrby(BYTES_KEY, -size)
+        pipe.execute()
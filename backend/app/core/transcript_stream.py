@@ -0,0 +1,49 @@
+import json
+from typing import Dict, List
+from .redis_client import get_redis_client
+
+STREAM_TTL = 3600  # Same lifetime as the task status
+
+
+class TranscriptStream:
+    """Redis stream of transcript segments decoded so far for one task"""
+
+    def __init__(self, task_id: str):
+        self.task_id = task_id
+        self.stream_key = f"transcript_stream:{task_id}"
+        self.progress_key = f"transcript_progress:{task_id}"
+        self.redis = get_redis_client()
+
+    def append(self, segments: List[Dict], decoded_seconds: float) -> float:
+        """Append one decoded window and return the total audio-seconds decoded"""
+        pipe = self.redis.pipeline()
+        pipe.xadd(self.stream_key, {'segments': json.dumps(segments)})
+        pipe.expire(self.stream_key, STREAM_TTL)
+        pipe.incrbyfloat(self.progress_key, decoded_seconds)
+        pipe.expire(self.progress_key, STREAM_TTL)
+        return float(pipe.execute()[2])
+
+    def read_segments(self) -> List[Dict]:
+        """Return all segments decoded so far in timeline order"""
+        segments = []
+        for _, fields in self.redis.xrange(self.stream_key):
+            segments.extend(json.loads(fields['segments']))
+        segments.sort(key=lambda s: s['start'])
+        return segments
+
+    def partial_text(self) -> str:
+        return ' '.join(s['text'] for s in self.read_segments() if s['text'])
+
+    def decoded_seconds(self) -> float:
+        return float(self.redis.get(self.progress_key) or 0)
+
+    def delete(self):
+        self.redis.delete(self.stream_key, self.progress_key)
+
+
+def decode_progress(decoded_seconds: float, duration: float, start: int = 50, end: int = 80) -> int:
+    """Map decoded audio-seconds onto the transcription share of the progress bar"""
+    if not duration:
+        return start
+    fraction = min(decoded_seconds / duration, 1.0)
+    return start + int((end - start) * fraction)
@@ -0,0 +1,292 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple, Type, Union
+import numpy as np
+from ..config import settings
+
+
+class TranscriptionEngine(ABC):
+    """Speech-to-text backend.
+
+    Every engine returns the same contract from ``transcribe``: a dict with
+    ``text``, ``segments`` (``start``/``end``/``text``), ``language`` and
+    ``duration``. With ``word_timestamps`` each segment also carries a
+    ``words`` list of ``word``/``start``/``end`` dicts. Loaded models are
+    shared through the worker's model pool.
+    """
+
+    name: str = None
+    memory_factor: float = 1.0  # resident size relative to the PyTorch fp32 model
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self.model = None
+
+    @classmethod
+    @abstractmethod
+    def load(cls, model_name: str):
+        """Load the backend's model object; called by the model pool"""
+
+    def load_model(self):
+        """Get the model from the worker's resident model pool"""
+        from .model_pool import get_model_pool
+
+        if self.model is None:
+            self.model = get_model_pool().get(self.model_name, engine=self.name)
+        return self.model
+
+    @abstractmethod
+    def transcribe(self, audio: Union[str, np.ndarray], language: str = None,
+                   initial_prompt: str = None, word_timestamps: bool = False) -> Dict:
+        """Transcribe a file path or 16 kHz mono samples"""
+
+    @abstractmethod
+    def detect_language(self, samples: np.ndarray) -> Tuple[str, float]:
+        """Return the most likely language of up to 30 seconds of audio and its probability"""
+
+    def decode_batch(self, windows: List[np.ndarray], language: str = None) -> List[Dict]:
+        """Decode several windows of at most 30 seconds each.
+
+        Backends without batched inference fall back to one call per window.
+        """
+        return [self.transcribe(samples, language=language) for samples in windows]
+
+
+class OpenAIWhisperEngine(TranscriptionEngine):
+    """Reference openai-whisper implementation running PyTorch on CPU"""
+
+    name = 'openai-whisper'
+
+    # Fallback settings of whisper's transcribe(), used by decode_batch
+    TEMPERATURES = (0.0, 0.2, 0.4, 0.6, 0.8, 1.0)
+    COMPRESSION_RATIO_THRESHOLD = 2.4
+    LOGPROB_THRESHOLD = -1.0
+    NO_SPEECH_THRESHOLD = 0.6
+
+    @classmethod
+    def load(cls, model_name: str):
+        import whisper
+
+        return whisper.load_model(model_name, device='cpu')
+
+    def transcribe(self, audio: Union[str, np.ndarray], language: str = None,
+                   initial_prompt: str = None, word_timestamps: bool = False) -> Dict:
+        model = self.load_model()
+
+        # Word alignment is an extra cross-attention pass, so only run it on request
+        result = model.transcribe(
+            audio,
+            language=language,
+            initial_prompt=initial_prompt,
+            word_timestamps=word_timestamps,
+            fp16=False,
+            verbose=False
+        )
+
+        # Format segments with timestamps
+        segments = []
+        for segment in result['segments']:
+            formatted = {
+                'start': segment['start'],
+                'end': segment['end'],
+                'text': segment['text'].strip()
+            }
+            if word_timestamps:
+                formatted['words'] = [
+                    {'word': word['word'], 'start': word['start'], 'end': word['end']}
+                    for word in segment.get('words', [])
+                ]
+            segments.append(formatted)
+
+        return {
+            'text': result['text'],
+            'segments': segments,
+            'language': result['language'],
+            'duration': result.get('duration', 0)
+        }
+
+    def detect_language(self, samples: np.ndarray) -> Tuple[str, float]:
+        import torch
+        import whisper
+
+        model = self.load_model()
+        mel = whisper.log_mel_spectrogram(
+            whisper.pad_or_trim(torch.from_numpy(samples)), model.dims.n_mels
+        ).to(model.device)
+        _, probs = model.detect_language(mel)
+        language = max(probs, key=probs.get)
+        return language, probs[language]
+
+    def decode_batch(self, windows: List[np.ndarray], language: str = None) -> List[Dict]:
+        """Run the encoder and decoder over a batch of 30-second mel windows.
+
+        Like ``transcribe``, windows whose output looks repetitive or unlikely
+        are decoded again at rising temperatures. Windows are decoded in
+        parallel, so unlike ``transcribe`` they aren't conditioned on the text
+        of the window before them.
+        """
+        import torch
+        import whisper
+        from whisper.tokenizer import get_tokenizer
+
+        model = self.load_model()
+        mel = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(samples)), model.dims.n_mels)
+            for samples in windows
+        ]).to(model.device)
+
+        decoded = [None] * len(windows)
+        pending = list(range(len(windows)))
+        for temperature in self.TEMPERATURES:
+            options = whisper.DecodingOptions(language=language, temperature=temperature, fp16=False)
+            retry = []
+            for index, result in zip(pending, whisper.decode(model, mel[pending], options)):
+                decoded[index] = result
+                if self._needs_fallback(result):
+                    retry.append(index)
+            pending = retry
+            if not pending:
+                break
+
+        results = []
+        for samples, result in zip(windows, decoded):
+            duration = len(samples) / 16000
+            if result.no_speech_prob > self.NO_SPEECH_THRESHOLD and result.avg_logprob < self.LOGPROB_THRESHOLD:
+                segments = []
+            else:
+                tokenizer = get_tokenizer(
+                    model.is_multilingual,
+                    num_languages=model.num_languages,
+                    language=result.language,
+                    task='transcribe'
+                )
+                segments = self._segments_from_tokens(result.tokens, tokenizer, duration)
+            results.append({
+                'text': ' '.join(s['text'] for s in segments if s['text']),
+                'segments': segments,
+                'language': result.language,
+                'duration': duration
+            })
+        return results
+
+    def _needs_fallback(self, result) -> bool:
+        """Whether a window's decode should be retried at a higher temperature"""
+        if result.no_speech_prob > self.NO_SPEECH_THRESHOLD:
+            return False
+        return (
+            result.compression_ratio > self.COMPRESSION_RATIO_THRESHOLD
+            or result.avg_logprob < self.LOGPROB_THRESHOLD
+        )
+
+    def _segments_from_tokens(self, tokens: List[int], tokenizer, duration: float) -> List[Dict]:
+        """Split decoded tokens into segments at timestamp tokens"""
+        segments = []
+        start = None
+        text_tokens = []
+        for token in tokens:
+            if token >= tokenizer.timestamp_begin:
+                time = (token - tokenizer.timestamp_begin) * 0.02
+                if start is not None and text_tokens:
+                    segments.append({
+                        'start': start,
+                        'end': min(time, duration),
+                        'text': tokenizer.decode(text_tokens).strip()
+                    })
+                    text_tokens = []
+                    start = None
+                else:
+                    start = time
+            else:
+                text_tokens.append(token)
+
+        # Trailing text without a closing timestamp runs to the end of the window
+        if text_tokens:
+            segments.append({
+                'start': start or 0.0,
+                'end': duration,
+                'text': tokenizer.decode(text_tokens).strip()
+            })
+        return segments
+
+
+class FasterWhisperEngine(TranscriptionEngine):
+    """CTranslate2 implementation (faster-whisper) with int8 CPU inference"""
+
+    name = 'faster-whisper'
+    memory_factor = 0.35
+
+    @classmethod
+    def load(cls, model_name: str):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError:
+            raise Exception("faster-whisper is not installed; install it or use the openai-whisper engine")
+
+        return WhisperModel(
+            model_name,
+            device='cpu',
+            compute_type=settings.FASTER_WHISPER_COMPUTE_TYPE,
+            cpu_threads=cls.cpu_threads()
+        )
+
+    @staticmethod
+    def cpu_threads() -> int:
+        """Thread count for CTranslate2, whose own default for 0 is 4 threads (or OMP_NUM_THREADS)"""
+        if settings.FASTER_WHISPER_CPU_THREADS:
+            return settings.FASTER_WHISPER_CPU_THREADS
+        return len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+
+    def transcribe(self, audio: Union[str, np.ndarray], language: str = None,
+                   initial_prompt: str = None, word_timestamps: bool = False) -> Dict:
+        model = self.load_model()
+
+        segment_iter, info = model.transcribe(
+            audio,
+            language=language,
+            initial_prompt=initial_prompt,
+            word_timestamps=word_timestamps,
+            beam_size=settings.FASTER_WHISPER_BEAM_SIZE
+        )
+
+        # Segments are generated lazily while decoding
+        segments = []
+        for segment in segment_iter:
+            formatted = {
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text.strip()
+            }
+            if word_timestamps:
+                formatted['words'] = [
+                    {'word': word.word, 'start': word.start, 'end': word.end}
+                    for word in segment.words or []
+                ]
+            segments.append(formatted)
+
+        return {
+            'text': ' '.join(s['text'] for s in segments if s['text']),
+            'segments': segments,
+            'language': info.language,
+            'duration': info.duration
+        }
+
+    def detect_language(self, samples: np.ndarray) -> Tuple[str, float]:
+        model = self.load_model()
+        language, probability, _ = model.detect_language(samples)
+        return language, probability
+
+
+ENGINES: Dict[str, Type[TranscriptionEngine]] = {
+    OpenAIWhisperEngine.name: OpenAIWhisperEngine,
+    FasterWhisperEngine.name: FasterWhisperEngine,
+}
+
+def get_engine_class(engine_name: str = None) -> Type[TranscriptionEngine]:
+    engine_name = engine_name or settings.TRANSCRIPTION_ENGINE
+    if engine_name not in ENGINES:
+        raise ValueError(f"Unknown transcription engine: {engine_name}")
+    return ENGINES[engine_name]
+
+def get_engine(engine_name: str = None, model_name: str = None) -> TranscriptionEngine:
+    """Create an engine for the given (or configured) backend and model"""
+    return get_engine_class(engine_name)(model_name or settings.WHISPER_MODEL)
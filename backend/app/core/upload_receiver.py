@@ -0,0 +1,143 @@
+import hashlib
+import os
+import uuid
+from typing import AsyncIterator, Dict, Optional
+from fastapi.concurrency import run_in_threadpool
+from multipart.multipart import MultipartParser, parse_options_header
+from ..config import settings
+
+MAX_FIELD_BYTES = 64 * 1024  # plain form fields next to the file
+
+
+class UploadTooLarge(Exception):
+    pass
+
+class UploadError(Exception):
+    pass
+
+
+class StreamingUpload:
+    """Receives a multipart upload chunk by chunk, straight to disk.
+
+    The file part is written and hashed as the request body arrives, so
+    memory use doesn't depend on the upload size, and ``max_bytes`` is
+    enforced before the rest of an oversized upload is read. Other form
+    fields are kept in memory up to ``MAX_FIELD_BYTES``.
+    """
+
+    def __init__(self, content_type: str, file_field: str = 'file', max_bytes: int = None):
+        ctype, options = parse_options_header(content_type or '')
+        if ctype != b'multipart/form-data' or b'boundary' not in options:
+            raise UploadError("Expected a multipart/form-data body")
+
+        self.boundary = options[b'boundary']
+        self.file_field = file_field
+        self.max_bytes = max_bytes or settings.MAX_FILE_SIZE
+        self.upload_dir = os.path.join(settings.TEMP_AUDIO_PATH, 'uploads')
+
+        self.fields: Dict[str, str] = {}
+        self.filename: Optional[str] = None
+        self.size = 0
+        self._sha256 = hashlib.sha256()
+        self._file = None
+        self._partial_path = None
+
+        # Parser callback state
+        self._header_field = b''
+        self._header_value = b''
+        self._part_name = None
+        self._part_is_file = False
+        self._field_value = b''
+        self._pending = []
+
+    async def receive(self, stream: AsyncIterator[bytes]) -> Dict:
+        """Consume the request body; returns the stored file's path, name, size and SHA-256"""
+        os.makedirs(self.upload_dir, exist_ok=True)
+        self._partial_path = os.path.join(self.upload_dir, f"{uuid.uuid4().hex}.part")
+        self._file = await run_in_threadpool(open, self._partial_path, 'wb')
+
+        parser = MultipartParser(self.boundary, {
+            'on_part_begin': self._on_part_begin,
+            'on_part_data': self._on_part_data,
+            'on_part_end': self._on_part_end,
+            'on_header_field': self._on_header_field,
+            'on_header_value': self._on_header_value,
+            'on_header_end': self._on_header_end,
+        })
+
+        try:
+            async for chunk in stream:
+                parser.write(chunk)
+                # Parser callbacks only collect data; the disk write happens off the loop
+                if self._pending:
+                    data, self._pending = b''.join(self._pending), []
+                    await run_in_threadpool(self._file.write, data)
+            parser.finalize()
+            await run_in_threadpool(self._file.close)
+
+            if self.filename is None:
+                raise UploadError(f"No '{self.file_field}' file in the upload")
+            if not self.size:
+                raise UploadError("The uploaded file is empty")
+
+            # Keep the extension so ffmpeg can tell the container apart
+            extension = os.path.splitext(self.filename)[1].lower()[:10]
+            path = f"{self._partial_path[:-len('.part')]}{extension}"
+            os.replace(self._partial_path, path)
+        except BaseException:
+            self.discard()
+            raise
+
+        return {
+            'path': path,
+            'filename': self.filename,
+            'size': self.size,
+            'sha256': self._sha256.hexdigest(),
+        }
+
+    def discard(self):
+        """Remove the partial file of an aborted upload"""
+        if self._file and not self._file.closed:
+            self._file.close()
+        if self._partial_path and os.path.exists(self._partial_path):
+            os.remove(self._partial_path)
+
+    def _on_part_begin(self):
+        self._part_name = None
+        self._part_is_file = False
+        self._field_value = b''
+
+    def _on_header_field(self, data: bytes, start: int, end: int):
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int):
+        self._header_value += data[start:end]
+
+    def _on_header_end(self):
+        if self._header_field.lower() == b'content-disposition':
+            _, options = parse_options_header(self._header_value)
+            self._part_name = options.get(b'name', b'').decode('utf-8', errors='replace')
+            if self._part_name == self.file_field and b'filename' in options:
+                if self.filename is not None:
+                    raise UploadError("Only one file can be uploaded at a time")
+                self._part_is_file = True
+                self.filename = os.path.basename(options[b'filename'].decode('utf-8', errors='replace'))
+        self._header_field = b''
+        self._header_value = b''
+
+    def _on_part_data(self, data: bytes, start: int, end: int):
+        chunk = data[start:end]
+        if self._part_is_file:
+            self.size += len(chunk)
+            if self.size > self.max_bytes:
+                raise UploadTooLarge(f"File exceeds the limit of {self.max_bytes // (1024 * 1024)}MB")
+            self._sha256.update(chunk)
+            self._pending.append(chunk)
+        else:
+            self._field_value += chunk
+            if len(self._field_value) > MAX_FIELD_BYTES:
+                raise UploadError("Form field too large")
+
+    def _on_part_end(self):
+        if self._part_name and not self._part_is_file:
+            self.fields[self._part_name] = self._field_value.decode('utf-8', errors='replace')
@@ -0,0 +1,110 @@
+import bisect
+from typing import Dict, List, Tuple
+import numpy as np
+from ..config import settings
+from .audio_processor import SAMPLE_RATE
+
+
+class SpeechTimeline:
+    """Maps between the original audio and the speech-only audio fed to the model.
+
+    Speech regions are concatenated with a short silence between them; times
+    reported by the model on the compacted audio are mapped back onto the
+    original timeline.
+    """
+
+    def __init__(self, regions: List[Tuple[float, float]], duration: float, gap_seconds: float = 0.2):
+        self.regions = regions
+        self.duration = duration
+        self.gap_seconds = gap_seconds
+        self._compact_starts = []
+        position = 0.0
+        for start, end in regions:
+            self._compact_starts.append(position)
+            position += (end - start) + gap_seconds
+
+    @property
+    def speech_seconds(self) -> float:
+        return sum(end - start for start, end in self.regions)
+
+    @property
+    def speech_ratio(self) -> float:
+        return self.speech_seconds / self.duration if self.duration else 0.0
+
+    def compact(self, samples: np.ndarray) -> np.ndarray:
+        """Return only the speech regions, separated by short silences"""
+        gap = np.zeros(int(self.gap_seconds * SAMPLE_RATE), dtype=np.float32)
+        parts = []
+        for start, end in self.regions:
+            parts.append(samples[int(start * SAMPLE_RATE):int(end * SAMPLE_RATE)])
+            parts.append(gap)
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+
+    def to_original(self, t: float) -> float:
+        """Map a time on the compacted audio back to the original timeline"""
+        if not self.regions:
+            return t
+        index = max(bisect.bisect_right(self._compact_starts, t) - 1, 0)
+        start, end = self.regions[index]
+        offset = min(max(t - self._compact_starts[index], 0.0), end - start)
+        return start + offset
+
+    def map_segments(self, segments: List[Dict]) -> List[Dict]:
+        mapped = []
+        for segment in segments:
+            segment = dict(segment, start=self.to_original(segment['start']), end=self.to_original(segment['end']))
+            if 'words' in segment:
+                segment['words'] = [
+                    dict(word, start=self.to_original(word['start']), end=self.to_original(word['end']))
+                    for word in segment['words']
+                ]
+            mapped.append(segment)
+        return mapped
+
+
+class VoiceActivityDetector:
+    """WebRTC VAD pre-pass that finds speech so silence and music can be skipped"""
+
+    def __init__(self, aggressiveness: int = None):
+        self.aggressiveness = settings.VAD_AGGRESSIVENESS if aggressiveness is None else aggressiveness
+        self.frame_ms = 30
+
+    def detect(self, samples: np.ndarray) -> SpeechTimeline:
+        """Return the speech regions of 16 kHz float32 audio"""
+        import webrtcvad
+
+        vad = webrtcvad.Vad(self.aggressiveness)
+        frame_len = SAMPLE_RATE * self.frame_ms // 1000
+        frame_seconds = self.frame_ms / 1000
+        pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+
+        regions = []
+        run_start = None
+        n_frames = len(pcm) // frame_len
+        for i in range(n_frames):
+            frame = pcm[i * frame_len:(i + 1) * frame_len].tobytes()
+            if vad.is_speech(frame, SAMPLE_RATE):
+                if run_start is None:
+                    run_start = i * frame_seconds
+            elif run_start is not None:
+                regions.append((run_start, i * frame_seconds))
+                run_start = None
+        if run_start is not None:
+            regions.append((run_start, n_frames * frame_seconds))
+
+        duration = len(samples) / SAMPLE_RATE
+        return SpeechTimeline(self._smooth(regions, duration), duration)
+
+    def _smooth(self, regions: List[Tuple[float, float]], duration: float) -> List[Tuple[float, float]]:
+        """Drop blips, pad speech edges and merge regions split by short pauses"""
+        pad = settings.VAD_SPEECH_PAD_SECONDS
+        merged = []
+        for start, end in regions:
+            if end - start < settings.VAD_MIN_SPEECH_SECONDS:
+                continue
+            start, end = max(0.0, start - pad), min(duration, end + pad)
+            if merged and start - merged[-1][1] < settings.VAD_MIN_SILENCE_SECONDS:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
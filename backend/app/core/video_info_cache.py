@@ -0,0 +1,65 @@
+import json
+import re
+from typing import Dict, Optional
+from ..config import settings
+from .redis_client import get_redis_client
+
+# 11-character video ID from watch, short, embed, shorts and live URLs
+VIDEO_ID_PATTERN = re.compile(
+    r'(?:youtube\.com/(?:watch\?(?:.*&)?v=|embed/|shorts/|live/|v/)|youtu\.be/)([A-Za-z0-9_-]{11})'
+)
+
+# yt-dlp errors that won't change on retry and are safe to cache
+PERMANENT_ERROR_MARKERS = (
+    'private video',
+    'video unavailable',
+    'this video is not available',
+    'has been removed',
+    'is not a valid url',
+    'unsupported url',
+    'members-only',
+    'sign in to confirm your age',
+)
+
+
+def extract_video_id(url: str) -> Optional[str]:
+    """Return the normalized YouTube video ID of a URL, if it has one"""
+    match = VIDEO_ID_PATTERN.search(url)
+    return match.group(1) if match else None
+
+def is_permanent_error(message: str) -> bool:
+    message = message.lower()
+    return any(marker in message for marker in PERMANENT_ERROR_MARKERS)
+
+
+class VideoInfoCache:
+    """Redis cache of video metadata shared by the API and the workers.
+
+    Entries are keyed by video ID. Videos that are invalid, private or gone
+    are cached as errors for a shorter time so repeated submissions fail fast.
+    """
+
+    def __init__(self):
+        self.redis = get_redis_client()
+
+    def _key(self, video_id: str) -> str:
+        return f"video_info:{video_id}"
+
+    def get(self, video_id: str) -> Optional[Dict]:
+        """Return ``{'info': ...}`` or ``{'error': ...}``, or None on a miss"""
+        data = self.redis.get(self._key(video_id))
+        return json.loads(data) if data else None
+
+    def put(self, video_id: str, info: Dict):
+        self.redis.set(
+            self._key(video_id),
+            json.dumps({'info': info}),
+            ex=settings.VIDEO_INFO_CACHE_TTL
+        )
+
+    def put_error(self, video_id: str, error: str):
+        self.redis.set(
+            self._key(video_id),
+            json.dumps({'error': error}),
+            ex=settings.VIDEO_INFO_NEGATIVE_TTL
+        )
@@ -0,0 +1,106 @@
+import struct
+from typing import Dict, List
+import numpy as np
+
+MAGIC = b'WTS1'
+HEADER = struct.Struct('<4sIII')  # magic, word count, segment count, text bytes
+
+
+class WordTimings:
+    """Array-backed word timings for one transcript.
+
+    Words are stored as a single UTF-8 blob with byte offsets, their times as
+    float32 arrays, and ``segment_offsets`` gives the first word of each
+    segment. Serialized with ``to_bytes`` this takes roughly 12 bytes per word
+    plus the text, instead of a dict per word.
+    """
+
+    def __init__(self, text: bytes, word_offsets: np.ndarray, starts: np.ndarray,
+                 ends: np.ndarray, segment_offsets: np.ndarray):
+        self.text = text
+        self.word_offsets = word_offsets
+        self.starts = starts
+        self.ends = ends
+        self.segment_offsets = segment_offsets
+
+    def __len__(self):
+        return len(self.starts)
+
+    @classmethod
+    def from_segments(cls, segments: List[Dict]) -> 'WordTimings':
+        """Build from segments carrying a ``words`` list of ``word/start/end`` dicts"""
+        encoded = []
+        starts = []
+        ends = []
+        segment_offsets = [0]
+        for segment in segments:
+            for word in segment.get('words') or []:
+                encoded.append(word['word'].encode('utf-8'))
+                starts.append(word['start'])
+                ends.append(word['end'])
+            segment_offsets.append(len(starts))
+
+        word_offsets = np.zeros(len(encoded) + 1, dtype=np.uint32)
+        if encoded:
+            word_offsets[1:] = np.cumsum([len(w) for w in encoded])
+
+        return cls(
+            text=b''.join(encoded),
+            word_offsets=word_offsets,
+            starts=np.asarray(starts, dtype=np.float32),
+            ends=np.asarray(ends, dtype=np.float32),
+            segment_offsets=np.asarray(segment_offsets, dtype=np.uint32)
+        )
+
+    def to_bytes(self) -> bytes:
+        return b''.join([
+            HEADER.pack(MAGIC, len(self.starts), len(self.segment_offsets) - 1, len(self.text)),
+            self.text,
+            self.word_offsets.astype('<u4').tobytes(),
+            self.starts.astype('<f4').tobytes(),
+            self.ends.astype('<f4').tobytes(),
+            self.segment_offsets.astype('<u4').tobytes(),
+        ])
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'WordTimings':
+        magic, n_words, n_segments, text_len = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a word timings blob")
+
+        offset = HEADER.size
+        text = data[offset:offset + text_len]
+        offset += text_len
+
+        def take(dtype, count):
+            nonlocal offset
+            array = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+            offset += array.nbytes
+            return array
+
+        word_offsets = take('<u4', n_words + 1)
+        starts = take('<f4', n_words)
+        ends = take('<f4', n_words)
+        segment_offsets = take('<u4', n_segments + 1)
+        return cls(text, word_offsets, starts, ends, segment_offsets)
+
+    def word(self, index: int) -> str:
+        return self.text[self.word_offsets[index]:self.word_offsets[index + 1]].decode('utf-8')
+
+    def to_list(self) -> List[Dict]:
+        """Expand into ``word/start/end/segment`` dicts for API responses"""
+        segment_of_word = np.searchsorted(self.segment_offsets, np.arange(len(self)), side='right') - 1
+        return [
+            {
+                'word': self.word(i).strip(),
+                'start': round(float(self.starts[i]), 3),
+                'end': round(float(self.ends[i]), 3),
+                'segment': int(segment_of_word[i])
+            }
+            for i in range(len(self))
+        ]
+
+
+def strip_words(segments: List[Dict]) -> List[Dict]:
+    """Drop per-word data from segments before they are stored or rendered"""
+    return [{k: v for k, v in segment.items() if k != 'words'} for segment in segments]
@@ -1,7 +1,18 @@
 import yt_dlp
 import os
-from typing import Dict, Optional
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from typing import Dict, List, Optional
 from ..config import settings
+from .video_info_cache import VideoInfoCache, extract_video_id, is_permanent_error
+from .download_limiter import DownloadLimiter, DownloadSlot
+from .audio_cache import AudioCache
+from .eta_estimator import RealTimeFactors
+
+PUMP_CHUNK_BYTES = 64 * 1024
 
 class YouTubeDownloader:
     def __init__(self):
@@ -19,43 +30,231 @@ class YouTubeDownloader:
         }
     
     def extract_video_info(self, url: str) -> Dict:
-        """Extract video metadata without downloading"""
+        """Extract video metadata without downloading, served from the shared cache when possible"""
+        cache = VideoInfoCache()
+        video_id = extract_video_id(url)
+        if video_id:
+            cached = cache.get(video_id)
+            if cached and 'error' in cached:
+                raise Exception(f"Failed to extract video info: {cached['error']}")
+            if cached:
+                return cached['info']
+
         with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
             try:
                 info = ydl.extract_info(url, download=False)
-                return {
-                    'title': info.get('title', 'Unknown'),
-                    'duration': info.get('duration', 0),
-                    'channel': info.get('channel', 'Unknown'),
-                    'video_id': info.get('id', ''),
-                    'thumbnail': info.get('thumbnail', ''),
-                }
             except Exception as e:
+                # Remember videos that will never work; network errors are retried
+                if video_id and is_permanent_error(str(e)):
+                    cache.put_error(video_id, str(e))
                 raise Exception(f"Failed to extract video info: {str(e)}")
+
+        video_info = {
+            'title': info.get('title', 'Unknown'),
+            'duration': info.get('duration', 0),
+            'channel': info.get('channel', 'Unknown'),
+            'video_id': info.get('id', ''),
+            'thumbnail': info.get('thumbnail', ''),
+        }
+        if video_info['video_id']:
+            cache.put(video_info['video_id'], video_info)
+        return video_info
     
-    def download_audio(self, url: str) -> tuple[str, Dict]:
+    def extract_playlist_urls(self, url: str) -> List[str]:
+        """List the video URLs of a playlist with flat extraction (no per-video requests)"""
+        with yt_dlp.YoutubeDL({'quiet': True, 'extract_flat': 'in_playlist'}) as ydl:
+            try:
+                info = ydl.extract_info(url, download=False)
+            except Exception as e:
+                raise Exception(f"Failed to extract playlist: {str(e)}")
+
+        entries = info.get('entries') or [info]
+        return [
+            entry.get('url') or f"https://www.youtube.com/watch?v={entry['id']}"
+            for entry in entries
+            if entry and (entry.get('url') or entry.get('id'))
+        ]
+    
+    def extract_channel_uploads(self, url: str, start: int, end: int) -> Dict:
+        """List uploads ``start``..``end`` (1-based, newest first) of a channel tab with flat extraction"""
+        opts = {'quiet': True, 'extract_flat': 'in_playlist', 'playliststart': start, 'playlistend': end}
+        with yt_dlp.YoutubeDL(opts) as ydl:
+            try:
+                info = ydl.extract_info(url, download=False)
+            except Exception as e:
+                raise Exception(f"Failed to extract channel uploads: {str(e)}")
+
+        return {
+            'title': info.get('channel') or info.get('title'),
+            'entries': [
+                {
+                    'video_id': entry['id'],
+                    'video_url': entry.get('url') or f"https://www.youtube.com/watch?v={entry['id']}",
+                    'title': entry.get('title'),
+                    'duration': entry.get('duration'),
+                    'live_status': entry.get('live_status'),
+                }
+                for entry in info.get('entries') or []
+                if entry and entry.get('id')
+            ],
+        }
+    
+    def fetch_audio(self, url: str, video_info: Optional[Dict] = None,
+                    holder: Optional[str] = None) -> tuple[str, Dict]:
+        """Return the video's cached audio, or download it in the configured mode
+        (16 kHz PCM stream or WAV file) into the audio cache.
+
+        ``holder`` (usually a task ID) pins the file in the cache until the
+        caller releases it through ``AudioCache.release``.
+        """
+        info = video_info or self.extract_video_info(url)
+        cache = AudioCache()
+        audio_path = cache.path(info['video_id'], 'f32' if settings.AUDIO_STREAMING_MODE else 'wav')
+        if holder:
+            cache.acquire(audio_path, holder)
+
+        try:
+            if cache.lookup(audio_path):
+                print(f"Audio cache hit: {audio_path}")
+                return audio_path, info
+
+            started = time.monotonic()
+            if settings.AUDIO_STREAMING_MODE:
+                result = self.download_pcm(url, video_info=info)
+            else:
+                result = self.download_audio(url, video_info=info)
+        except Exception:
+            if holder:
+                cache.release(audio_path, holder)
+            raise
+
+        RealTimeFactors().record('download', time.monotonic() - started, info.get('duration'))
+        cache.evict()
+        return result
+
+    def download_pcm(self, url: str, video_info: Optional[Dict] = None) -> tuple[str, Dict]:
+        """Stream the native audio track through one ffmpeg process into 16 kHz mono float32 PCM.
+
+        yt-dlp writes the opus/m4a stream to stdout and ffmpeg decodes and
+        resamples it on the fly, so there is no full-rate intermediate WAV and
+        the audio is decoded only once. Returns the path of a raw ``.f32``
+        file that AudioProcessor.load_pcm reads directly.
+        """
+        try:
+            info = video_info or self.extract_video_info(url)
+
+            # Check duration limit
+            if info['duration'] > settings.MAX_VIDEO_DURATION:
+                raise Exception(f"Video duration exceeds limit of {settings.MAX_VIDEO_DURATION/3600} hours")
+
+            pcm_path = os.path.join(settings.TEMP_AUDIO_PATH, f"{info['video_id']}.f32")
+            # Unique per download so concurrent jobs for one video don't share a file
+            partial_path = f"{pcm_path}.{uuid.uuid4().hex[:8]}.part"
+
+            ytdlp = ffmpeg = None
+            try:
+                with DownloadLimiter().slot() as slot, \
+                        tempfile.TemporaryFile() as ytdlp_log, tempfile.TemporaryFile() as ffmpeg_log:
+                    ytdlp = subprocess.Popen(
+                        [sys.executable, '-m', 'yt_dlp', '-f', 'bestaudio/best', '-q', '--no-warnings',
+                         '-o', '-', url],
+                        stdout=subprocess.PIPE,
+                        stderr=ytdlp_log
+                    )
+                    ffmpeg = subprocess.Popen(
+                        ['ffmpeg', '-loglevel', 'error', '-y', '-i', 'pipe:0',
+                         '-ac', '1', '-ar', '16000', '-f', 'f32le', partial_path],
+                        stdin=subprocess.PIPE,
+                        stderr=ffmpeg_log
+                    )
+                    self._pump(ytdlp.stdout, ffmpeg.stdin, slot)
+                    ffmpeg.wait()
+                    ytdlp.wait()
+
+                    if ytdlp.returncode != 0 or ffmpeg.returncode != 0:
+                        ytdlp_log.seek(0)
+                        ffmpeg_log.seek(0)
+                        errors = (ytdlp_log.read() + ffmpeg_log.read()).decode(errors='ignore').strip()
+                        raise Exception(errors or "Audio stream failed")
+
+                os.replace(partial_path, pcm_path)
+            finally:
+                # On any failure (including a failed pump or a killed task) leave
+                # no processes or partial file behind
+                for process in (ytdlp, ffmpeg):
+                    if process is not None and process.poll() is None:
+                        process.kill()
+                        process.wait()
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+
+            return pcm_path, info
+
+        except Exception as e:
+            raise Exception(f"Failed to download audio: {str(e)}")
+
+    def download_audio(self, url: str, video_info: Optional[Dict] = None) -> tuple[str, Dict]:
         """Download audio from YouTube video and return file path with metadata"""
         try:
-            # First get video info
-            info = self.extract_video_info(url)
+            # First get video info, unless the caller already has it
+            info = video_info or self.extract_video_info(url)
             
             # Check duration limit
             if info['duration'] > settings.MAX_VIDEO_DURATION:
                 raise Exception(f"Video duration exceeds limit of {settings.MAX_VIDEO_DURATION/3600} hours")
             
-            # Download audio
-            with yt_dlp.YoutubeDL(self.ydl_opts) as ydl:
-                ydl.download([url])
-                audio_path = os.path.join(settings.TEMP_AUDIO_PATH, f"{info['video_id']}.wav")
-                
-                if not os.path.exists(audio_path):
-                    raise Exception("Audio download failed")
-                
-                return audio_path, info
+            # Download audio, reporting progress to the shared limiter
+            with DownloadLimiter().slot() as slot:
+                with yt_dlp.YoutubeDL(dict(self.ydl_opts, progress_hooks=[self._progress_hook(slot)])) as ydl:
+                    ydl.download([url])
+                    audio_path = os.path.join(settings.TEMP_AUDIO_PATH, f"{info['video_id']}.wav")
+                    
+                    if not os.path.exists(audio_path):
+                        raise Exception("Audio download failed")
+                    
+                    return audio_path, info
                 
         except Exception as e:
             raise Exception(f"Failed to download audio: {str(e)}")
     
+    def _pump(self, source, sink, slot: DownloadSlot):
+        """Copy yt-dlp's output into ffmpeg at the rate the download limiter allows.
+
+        Reading slowly makes yt-dlp block on the pipe, which in turn slows the
+        download itself through TCP backpressure.
+        """
+        try:
+            while True:
+                chunk = source.read1(PUMP_CHUNK_BYTES)
+                if not chunk:
+                    break
+                slot.consume(len(chunk))
+                sink.write(chunk)
+        except BrokenPipeError:
+            # ffmpeg exited early; its exit code and log explain why
+            pass
+        finally:
+            source.close()
+            try:
+                sink.close()
+            except BrokenPipeError:
+                pass
+
+    def _progress_hook(self, slot: DownloadSlot):
+        """yt-dlp progress hook that feeds downloaded bytes to the limiter"""
+        seen = {'bytes': 0}
+
+        def hook(progress):
+            downloaded = progress.get('downloaded_bytes') or 0
+            if downloaded < seen['bytes']:
+                # yt-dlp moved on to the next file
+                seen['bytes'] = 0
+            if downloaded > seen['bytes']:
+                slot.consume(downloaded - seen['bytes'])
+                seen['bytes'] = downloaded
+
+        return hook
+
     def cleanup_audio(self, file_path: str):
         """Remove temporary audio file"""
         try:
@@ -5,7 +5,7 @@ import os
 
 from .config import settings
 from .database import engine, Base
-from .api.endpoints import transcription, scripts, users
+from .api.endpoints import transcription, scripts, users, channels
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -49,6 +49,12 @@ app.include_router(
     tags=["scripts"]
 )
 
+app.include_router(
+    channels.router,
+    prefix=f"{settings.API_V1_STR}/channels",
+    tags=["channels"]
+)
+
 @app.get("/")
 def root():
     return {
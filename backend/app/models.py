@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Float
+from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey, Boolean, Float, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
@@ -17,6 +17,7 @@ class User(Base):
     
     scripts = relationship("Script", back_populates="user")
     usage = relationship("UserUsage", back_populates="user", uselist=False)
+    channel_subscriptions = relationship("ChannelSubscription", back_populates="user")
 
 class Script(Base):
     __tablename__ = "scripts"
@@ -28,8 +29,13 @@ class Script(Base):
     video_duration = Column(Integer)  # in seconds
     transcript_text = Column(Text)
     formatted_script = Column(Text)
+    word_timings = Column(LargeBinary, nullable=True)  # packed WordTimings, see core/word_timings.py
     file_path = Column(String)
+    engine = Column(String, nullable=True)  # transcription engine used
+    whisper_model = Column(String, nullable=True)  # model picked by the router
+    language = Column(String, nullable=True)  # detected spoken language
     status = Column(String, default="pending")  # pending, processing, completed, failed
+    task_id = Column(String, index=True, nullable=True)  # Celery task of the latest run
     error_message = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True), nullable=True)
@@ -46,4 +52,22 @@ class UserUsage(Base):
     total_processing_time = Column(Float, default=0.0)  # in hours
     last_reset_date = Column(DateTime(timezone=True), server_default=func.now())
     
-    user = relationship("User", back_populates="usage")
\ No newline at end of file
+    user = relationship("User", back_populates="usage")
+
+class ChannelSubscription(Base):
+    __tablename__ = "channel_subscriptions"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    channel_url = Column(String, nullable=False)  # the channel's uploads tab
+    channel_title = Column(String, nullable=True)
+    engine = Column(String, nullable=True)  # transcription engine for new uploads
+    check_interval = Column(Integer, nullable=False)  # seconds between syncs
+    seen_video_ids = Column(Text, nullable=True)  # JSON list of the newest seen IDs, newest first
+    is_active = Column(Boolean, default=True)
+    next_check_at = Column(DateTime(timezone=True), index=True, nullable=False)
+    last_checked_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    user = relationship("User", back_populates="channel_subscriptions")
@@ -10,6 +10,10 @@ class ExportFormat(str, Enum):
     excel = "excel"
     csv = "csv"
 
+class TranscriptionEngine(str, Enum):
+    openai_whisper = "openai-whisper"
+    faster_whisper = "faster-whisper"
+
 class ScriptStatus(str, Enum):
     pending = "pending"
     processing = "processing"
@@ -57,7 +61,8 @@ class ScriptBase(BaseModel):
     video_url: HttpUrl
 
 class ScriptCreate(ScriptBase):
-    pass
+    engine: Optional[TranscriptionEngine] = None  # defaults to settings.TRANSCRIPTION_ENGINE
+    word_timestamps: bool = False  # run the word alignment pass
 
 class ScriptUpdate(BaseModel):
     status: Optional[str] = None
@@ -66,10 +71,14 @@ class ScriptUpdate(BaseModel):
     error_message: Optional[str] = None
 
 class Script(ScriptBase):
+    video_url: str  # YouTube URL, or upload://<sha256>/<filename> for uploaded files
     id: int
     user_id: Optional[int]
     video_title: Optional[str]
     video_duration: Optional[int]
+    engine: Optional[str] = None
+    whisper_model: Optional[str] = None
+    language: Optional[str] = None
     status: str
     created_at: datetime
     completed_at: Optional[datetime]
@@ -81,6 +90,17 @@ class ScriptWithContent(Script):
     transcript_text: Optional[str]
     formatted_script: Optional[str]
     error_message: Optional[str]
+    partial_transcript: Optional[str] = None  # text decoded so far while processing
+
+class WordTiming(BaseModel):
+    word: str
+    start: float
+    end: float
+    segment: int
+
+class ScriptWordTimings(BaseModel):
+    script_id: int
+    words: List[WordTiming]
 
 # Filter and Query Schemas
 class ScriptFilter(BaseModel):
@@ -134,6 +154,59 @@ class ProcessingStatus(BaseModel):
     progress: int
     message: str
     script_id: Optional[int] = None
+    partial_transcript: Optional[str] = None
+    speech_ratio: Optional[float] = None  # share of the audio that contained speech
+    deferred: bool = False  # accepted while the backlog is large; runs after regular work
+    eta_seconds: Optional[int] = None  # estimated time to completion
+    queue_position: Optional[int] = None  # transcription jobs ahead while waiting for a worker
+
+class BulkStatusRequest(BaseModel):
+    task_ids: List[str]
+
+class BatchCreate(BaseModel):
+    video_urls: List[HttpUrl] = []
+    playlist_url: Optional[HttpUrl] = None  # expanded to its videos
+    engine: Optional[TranscriptionEngine] = None
+    word_timestamps: bool = False
+
+class BatchItem(BaseModel):
+    video_url: str
+    script_id: Optional[int] = None
+    task_id: Optional[str] = None
+    status: str
+    progress: int = 0
+    error: Optional[str] = None  # why the URL was rejected or the job failed
+
+class BatchStatus(BaseModel):
+    batch_id: str
+    total: int
+    completed: int
+    failed: int
+    processing: int
+    progress: int  # share of the batch that has finished, failed items included
+    items: List[BatchItem]
+
+# Channel Subscription Schemas
+class ChannelSubscriptionCreate(BaseModel):
+    channel_url: HttpUrl
+    check_interval: Optional[int] = None  # seconds, defaults to settings.CHANNEL_CHECK_INTERVAL
+    engine: Optional[TranscriptionEngine] = None
+    backfill: bool = False  # also transcribe the uploads that already exist
+
+class ChannelSubscription(BaseModel):
+    id: int
+    channel_url: str
+    channel_title: Optional[str] = None
+    engine: Optional[str] = None
+    check_interval: int
+    is_active: bool
+    next_check_at: datetime
+    last_checked_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: datetime
+    
+    class Config:
+        from_attributes = True
 
 class DashboardData(BaseModel):
     scripts_generated: int
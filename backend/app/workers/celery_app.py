@@ -1,6 +1,8 @@
 from celery import Celery
+from celery.signals import worker_process_init, worker_ready
 import os
 import sys
+import threading
 
 # Add the backend directory to Python path
 backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,4 +24,73 @@ celery_app.conf.update(
     timezone='UTC',
     enable_utc=True,
     imports=['app.workers.tasks'],  # Important!
-)
\ No newline at end of file
+    # Acknowledge after the task finishes so a killed worker's task is
+    # redelivered; stages resume from their checkpoints
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    broker_transport_options={
+        'visibility_timeout': settings.TASK_VISIBILITY_TIMEOUT,
+        # Workers drain their queues in the order given to -Q, so a worker
+        # listening on "cpu.pro,cpu" only takes free work when no Pro job waits
+        'queue_order_strategy': 'priority',
+    },
+    # Network-bound stages go to the I/O queue, decoding to the CPU queue, so
+    # each can run on workers sized for it (see docker-compose.yml). These are
+    # the free tier's queues; Pro jobs are sent to the ".pro" copies per call
+    task_default_queue=settings.PIPELINE_IO_QUEUE,
+    task_routes={
+        'process_youtube_video': {'queue': settings.PIPELINE_IO_QUEUE},
+        'enqueue_batch': {'queue': settings.PIPELINE_IO_QUEUE},
+        'process_uploaded_file': {'queue': settings.PIPELINE_IO_QUEUE},
+        'finalize_stage': {'queue': settings.PIPELINE_IO_QUEUE},
+        'finalize_chunked_transcription': {'queue': settings.PIPELINE_IO_QUEUE},
+        'chunked_transcription_failed': {'queue': settings.PIPELINE_IO_QUEUE},
+        'transcribe_stage': {'queue': settings.PIPELINE_CPU_QUEUE},
+        'transcribe_audio_chunk': {'queue': settings.PIPELINE_CPU_QUEUE},
+        'align_script_words': {'queue': settings.PIPELINE_CPU_QUEUE},
+        'sync_channel_subscriptions': {'queue': settings.PIPELINE_IO_QUEUE},
+        'sync_channel': {'queue': settings.PIPELINE_IO_QUEUE},
+    },
+    beat_schedule={
+        'sync-channel-subscriptions': {
+            'task': 'sync_channel_subscriptions',
+            'schedule': settings.CHANNEL_SYNC_TICK_SECONDS,
+        },
+    },
+)
+
+
+@worker_process_init.connect
+def preload_whisper_models(**kwargs):
+    """Load and warm up Whisper models once per worker process.
+
+    This signal runs before the child reports itself up, and the parent kills
+    children that take longer than worker_proc_alive_timeout (4 s) to do so.
+    Models therefore load on a background thread; a task that needs one
+    before it's ready waits on the pool's lock.
+    """
+    from app.core.model_pool import get_model_pool
+
+    pool = get_model_pool()
+    pool.start_idle_reaper()
+
+    def _preload():
+        try:
+            pool.preload(settings.WHISPER_PRELOAD_MODELS, engine=settings.TRANSCRIPTION_ENGINE)
+        except Exception as e:
+            print(f"Failed to preload Whisper models: {str(e)}")
+
+    threading.Thread(target=_preload, name='whisper-preload', daemon=True).start()
+
+
+@worker_ready.connect
+def clean_audio_cache(**kwargs):
+    """Drop partial downloads left by crashed workers and trim the audio cache"""
+    from app.core.audio_cache import AudioCache
+
+    cache = AudioCache()
+    try:
+        cache.cleanup_orphans()
+        cache.evict()
+    except Exception as e:
+        print(f"Failed to clean the audio cache: {str(e)}")
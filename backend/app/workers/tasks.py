@@ -1,187 +1,1189 @@
-from celery import Task
+from celery import Task, chord
 from .celery_app import celery_app
 import os
+import shutil
 import time
 import traceback
 import json
+import random
+import uuid
 from datetime import datetime
 
+def _store_task_status(task_id, script_id, progress, status, extra_data=None):
+    """Store task progress in the task's status hash and push it to subscribed clients"""
+    from ..core.task_status import TaskStatusStore
+
+    task_data = {
+        'task_id': task_id,
+        'script_id': script_id,
+        'progress': progress,
+        'status': status,
+        'state': 'PROGRESS' if progress < 100 else 'SUCCESS',
+        'timestamp': datetime.utcnow().isoformat()
+    }
+    if extra_data:
+        task_data.update(extra_data)
+
+    TaskStatusStore().update(task_id, task_data, clear=['error'])
+
+def _store_task_error(task_id, script_id, error):
+    """Store a failed task state in the task's status hash and push it to subscribed clients"""
+    from ..core.task_status import TaskStatusStore
+
+    error_data = {
+        'task_id': task_id,
+        'script_id': script_id,
+        'progress': 0,
+        'status': f'Failed: {str(error)}',
+        'state': 'FAILURE',
+        'error': str(error),
+        'timestamp': datetime.utcnow().isoformat()
+    }
+    TaskStatusStore().update(task_id, error_data)
+
+def _estimate_eta(stage, duration, engine=None, model_name=None, is_pro=False, deferred=False, decoded_seconds=0):
+    """ETA fields for a status update; a failed estimate never fails the job"""
+    from ..core.eta_estimator import EtaEstimator
+
+    try:
+        return EtaEstimator().estimate(
+            stage, duration, engine, model_name,
+            is_pro=is_pro, deferred=deferred, decoded_seconds=decoded_seconds
+        )
+    except Exception as e:
+        print(f"Failed to estimate ETA: {str(e)}")
+        return {}
+
+def _mark_script_failed(db, script, error):
+    """Record a processing error on the script row"""
+    try:
+        if script:
+            script.status = 'failed'
+            script.error_message = str(error)
+            db.commit()
+    except Exception as db_error:
+        print(f"Failed to update database: {str(db_error)}")
+        db.rollback()
+
+def _complete_script(db, script, video_info, transcript_data):
+    """Format the transcript, save the script file and mark the row completed"""
+    from ..core.transcriber import WhisperTranscriber
+    from ..core.formatter import ScriptFormatter
+    from ..core.word_timings import WordTimings, strip_words
+
+    transcriber = WhisperTranscriber()
+    formatter = ScriptFormatter()
+
+    # Word timings are kept in their compact form, not in the rendered segments
+    if any('words' in segment for segment in transcript_data['segments']):
+        script.word_timings = WordTimings.from_segments(transcript_data['segments']).to_bytes()
+        transcript_data = dict(transcript_data, segments=strip_words(transcript_data['segments']))
+
+    formatted_script = transcriber.format_transcript(
+        transcript_data['segments'],
+        format_type='timestamps'
+    )
+
+    file_path = formatter.save_script(
+        video_info=video_info,
+        transcript_data=transcript_data,
+        format_type='txt',
+        script_id=script.id
+    )
+    print(f"Script saved to: {file_path}")
+
+    # Update script record
+    script.transcript_text = transcript_data['text']
+    script.formatted_script = formatted_script
+    script.file_path = file_path
+    script.status = 'completed'
+    script.completed_at = datetime.utcnow()
+    db.commit()
+
+    return file_path
+
+def _cache_transcript(cache_identity, video_info, transcript_data, model_name, language):
+    """Store a finished transcript in the shared cache; failures only get logged"""
+    from ..core.transcript_cache import TranscriptCache
+
+    try:
+        TranscriptCache().put(**cache_identity, entry={
+            'video_info': video_info,
+            'transcript': transcript_data,
+            'model': model_name,
+            'language': language
+        })
+    except Exception as e:
+        print(f"Failed to cache transcript: {str(e)}")
+
+def _should_chunk(video_info):
+    from ..config import settings
+
+    return (
+        settings.CHUNKED_TRANSCRIPTION_ENABLED
+        and (video_info.get('duration') or 0) > settings.CHUNKED_MIN_DURATION
+    )
+
+def _should_batch(video_info):
+    from ..config import settings
+
+    return (
+        settings.BATCH_DECODING_ENABLED
+        and (video_info.get('duration') or 0) <= settings.BATCH_MAX_VIDEO_DURATION
+    )
+
+def _dispatch_chunked_transcription(task_id, script_id, audio_path, samples, video_info, decode_options,
+                                    cache_identity=None, is_pro=False, deferred=False, before_dispatch=None):
+    """Split audio at silence and fan the chunks out to workers as a chord.
+
+    ``decode_options`` (engine, model_name, language, word_timestamps) are
+    passed to every chunk so all chunks decode the same way. Chunks and the
+    callback go to the queues of the job's tier. ``before_dispatch`` runs
+    once the chunks are written, right before the chord is sent.
+    """
+    from ..config import settings
+    from ..core.audio_processor import AudioProcessor
+    from ..core.priority_tiers import pipeline_queue
+
+    processor = AudioProcessor()
+    windows = processor.plan_windows(
+        samples,
+        window_seconds=settings.CHUNK_WINDOW_SECONDS,
+        overlap_seconds=settings.CHUNK_OVERLAP_SECONDS
+    )
+
+    chunk_dir = os.path.join(settings.TEMP_AUDIO_PATH, 'chunks', task_id)
+    header = []
+    for window in windows:
+        chunk_path = processor.save_chunk(
+            processor.slice(samples, window['start'], window['end']),
+            os.path.join(chunk_dir, f"{window['index']:04d}.npy")
+        )
+        header.append(transcribe_audio_chunk.s(
+            chunk_path,
+            window,
+            task_id=task_id,
+            script_id=script_id,
+            duration=video_info['duration'],
+            decode_options=decode_options
+        ).set(queue=pipeline_queue('cpu', is_pro, deferred)))
+
+    body = finalize_chunked_transcription.s(
+        task_id=task_id,
+        script_id=script_id,
+        video_info=video_info,
+        audio_path=audio_path,
+        chunk_dir=chunk_dir,
+        decode_options=decode_options,
+        cache_identity=cache_identity
+    ).set(queue=pipeline_queue('io', is_pro)).on_error(chunked_transcription_failed.s(
+        task_id=task_id,
+        script_id=script_id,
+        audio_path=audio_path,
+        chunk_dir=chunk_dir
+    ).set(queue=pipeline_queue('io', is_pro)))
+    if before_dispatch:
+        before_dispatch()
+    chord(header)(body)
+
+    return len(windows)
+
+def _cleanup_chunked_files(task_id, audio_path, chunk_dir):
+    _release_audio(task_id, audio_path)
+    shutil.rmtree(chunk_dir, ignore_errors=True)
+
+def _stage_transcript_path(task_id):
+    from ..config import settings
+
+    return os.path.join(settings.TEMP_AUDIO_PATH, 'stages', f"{task_id}.json")
+
+def _save_stage_transcript(task_id, transcript_data):
+    """Write a transcript for the finalize stage, renamed into place once complete"""
+    path = _stage_transcript_path(task_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(f"{path}.part", 'w', encoding='utf-8') as f:
+        json.dump(transcript_data, f, ensure_ascii=False)
+    os.replace(f"{path}.part", path)
+    return path
+
+def _finish_transcription(db, script, task_id, video_info, transcript_data, cache_identity=None,
+                          model_name=None, language=None):
+    """Cache a finished transcript, save the script and report completion"""
+    if cache_identity:
+        _cache_transcript(cache_identity, video_info, transcript_data, model_name, language)
+
+    file_path = _complete_script(db, script, video_info, transcript_data)
+
+    _store_task_status(task_id, script.id, 100, 'Script generated successfully!', {
+        'file_path': file_path,
+        'completed': True,
+        'speech_ratio': transcript_data.get('speech_ratio')
+    })
+    return file_path
+
+def _fail_pipeline(db, script, task_id, script_id, error, audio_path=None):
+    """Record a failed pipeline stage and release what the job was holding"""
+    from ..core.queue_stats import QueueStats
+
+    print(f"ERROR: Error processing video: {str(error)}")
+    print(f"Traceback: {traceback.format_exc()}")
+
+    _mark_script_failed(db, script, error)
+    QueueStats().finish_job(script_id)
+    _store_task_error(task_id, script_id, error)
+
+    # Downloaded audio stays cached so a retry doesn't download it again
+    _release_audio(task_id, audio_path)
+
+def _should_retry(task, error):
+    from ..config import settings
+    from ..core.pipeline_checkpoint import is_transient_error
+
+    return is_transient_error(error) and task.request.retries < settings.PIPELINE_MAX_RETRIES
+
+def _retry_stage(task, task_id, script_id, progress, error):
+    """Schedule a retry with exponential backoff; the stage resumes from its checkpoints"""
+    from ..config import settings
+
+    countdown = min(
+        settings.PIPELINE_RETRY_BACKOFF * 2 ** task.request.retries,
+        settings.PIPELINE_RETRY_BACKOFF_MAX
+    ) * random.uniform(0.8, 1.2)
+    print(f"Retrying {task.name} in {countdown:.0f}s after: {str(error)}")
+    _store_task_status(task_id, script_id, progress, f'Temporary error, retrying in {int(countdown)}s...')
+    return task.retry(exc=error, countdown=countdown, max_retries=settings.PIPELINE_MAX_RETRIES, throw=False)
+
+def _release_audio(task_id, audio_path):
+    """Let go of a job's audio: uploads are deleted, downloads stay in the audio cache"""
+    from ..config import settings
+    from ..core.audio_cache import AudioCache
+
+    if not audio_path:
+        return
+    upload_dir = os.path.abspath(os.path.join(settings.TEMP_AUDIO_PATH, 'uploads'))
+    if os.path.dirname(os.path.abspath(audio_path)) == upload_dir:
+        if os.path.exists(audio_path):
+            os.remove(audio_path)
+    else:
+        AudioCache().release(audio_path, task_id)
+
+def _plan_job(video_info, engine, word_timestamps, queue_stats, is_pro=False):
+    """Route the job to a model and look it up in the transcript cache.
+
+    Returns ``(engine, model_name, cache_identity, cached_entry)``.
+    """
+    from ..core.model_router import ModelRouter
+    from ..core.transcript_cache import TranscriptCache, decode_params
+    from ..core.transcription_engines import get_engine_class
+
+    # Pick the model for this job from the current backlog
+    model_name, decision = ModelRouter(queue_stats).select_model(
+        video_info['duration'],
+        is_pro=is_pro
+    )
+    print(f"Selected model {model_name}: {decision}")
+
+    # Reuse a transcript of the same video made with the same settings
+    engine = get_engine_class(engine).name
+    cache_identity = {
+        'video_id': video_info['video_id'],
+        'engine': engine,
+        'model': model_name,
+        'params': decode_params(word_timestamps)
+    }
+    return engine, model_name, cache_identity, TranscriptCache().get(**cache_identity)
+
+def _complete_from_cache(db, script, task_id, video_info, engine, cached):
+    """Finish a script straight from a transcript cache entry"""
+    from ..core.queue_stats import QueueStats
+
+    print(f"Transcript cache hit for video {video_info['video_id']}")
+    script.video_title = video_info['title']
+    script.video_duration = video_info['duration']
+    script.engine = engine
+    script.whisper_model = cached['model']
+    script.language = cached['language']
+
+    file_path = _complete_script(db, script, video_info, cached['transcript'])
+    QueueStats().finish_job(script.id)
+
+    _store_task_status(task_id, script.id, 100, 'Script generated successfully!', {
+        'file_path': file_path,
+        'completed': True,
+        'cached': True,
+        'speech_ratio': cached['transcript'].get('speech_ratio')
+    })
+    return file_path
+
 @celery_app.task(bind=True, name='process_youtube_video')
-def process_youtube_video(self, script_id: int, video_url: str, user_id: int = None):
-    """Main task to process YouTube video"""
-    
+def process_youtube_video(self, script_id: int, video_url: str, user_id: int = None, engine: str = None,
+                          word_timestamps: bool = False, is_pro: bool = False, enqueued_at: float = None,
+                          deferred: bool = False):
+    """Download stage: video info, model routing, cache lookup and audio download.
+
+    Runs on the I/O queue and hands the downloaded audio to ``transcribe_stage``
+    on the CPU queue, both in the job's tier. Every stage reports status under
+    this task's ID. The routing decision is checkpointed and the audio stays
+    pinned in the audio cache, so a retry only repeats what didn't finish.
+    """
+
     # Import here to avoid circular imports
     from ..database import SessionLocal
     from ..models import Script
     from ..core.youtube_downloader import YouTubeDownloader
-    from ..core.transcriber import WhisperTranscriber
-    from ..core.formatter import ScriptFormatter
-    from ..core.redis_client import get_redis_client
-    
+    from ..core.queue_stats import QueueStats
+    from ..core.pipeline_checkpoint import PipelineCheckpoint
+    from ..core.priority_tiers import QueueWaitStats, pipeline_queue
+
     db = SessionLocal()
     downloader = YouTubeDownloader()
-    transcriber = WhisperTranscriber()
-    formatter = ScriptFormatter()
+    queue_stats = QueueStats()
+    checkpoint = PipelineCheckpoint(self.request.id)
+    script = None
     audio_path = None
-    redis_client = get_redis_client()
-    
-    # Store task progress in Redis
+
+    # Progress goes to the task's status hash only; Celery's result backend
+    # just records how the task ended
     def update_task_status(progress, status, extra_data=None):
-        task_data = {
-            'task_id': self.request.id,
-            'script_id': script_id,
-            'progress': progress,
-            'status': status,
-            'state': 'PROGRESS' if progress < 100 else 'SUCCESS',
-            'timestamp': datetime.utcnow().isoformat()
-        }
-        if extra_data:
-            task_data.update(extra_data)
-        
-        # Store in Redis with task ID as key
-        redis_client.set(
-            f"task_result:{self.request.id}", 
-            json.dumps(task_data), 
-            ex=3600  # Expire in 1 hour
-        )
-        
-        # Also update Celery state
-        self.update_state(
-            state='PROGRESS' if progress < 100 else 'SUCCESS',
-            meta={'current': progress, 'total': 100, 'status': status}
-        )
-    
+        _store_task_status(self.request.id, script_id, progress, status, extra_data)
+
     try:
-        print(f"Starting to process video: {video_url}")
-        
-        # Update task state - Extracting info
-        update_task_status(10, 'Extracting video information...')
-        
+        # A redelivered task whose hand-off already happened has nothing left to do
+        handed_off = checkpoint.get('downloaded')
+        if handed_off:
+            return {
+                'script_id': script_id,
+                'status': 'downloaded',
+                'audio_path': handed_off['audio_path']
+            }
+
         # Get script record
         script = db.query(Script).filter(Script.id == script_id).first()
         if not script:
             raise Exception("Script record not found")
-        
+
+        # finalize_stage clears the checkpoint, so a redelivery after the job
+        # finished is recognised by the completed script
+        if script.status == 'completed' and script.task_id == self.request.id:
+            return {
+                'script_id': script_id,
+                'status': 'completed',
+                'file_path': script.file_path
+            }
+
+        if not self.request.retries:
+            QueueWaitStats().record('io', is_pro, enqueued_at, deferred)
+
+        print(f"Starting to process video: {video_url}")
+
+        # Update task state - Extracting info
+        update_task_status(10, 'Extracting video information...')
+
         # Update status to processing
         script.status = 'processing'
         db.commit()
-        
-        # Step 1: Extract video info and download audio
-        update_task_status(20, 'Downloading audio...')
-        
+
+        # Step 1: Extract video info and route the job, unless an earlier attempt did
+        metadata = checkpoint.get('metadata')
+        if metadata:
+            video_info = metadata['video_info']
+            engine = metadata['engine']
+            model_name = metadata['model_name']
+            cache_identity = metadata['cache_identity']
+        else:
+            video_info = downloader.extract_video_info(video_url)
+
+            engine, model_name, cache_identity, cached = _plan_job(
+                video_info, engine, word_timestamps, queue_stats, is_pro=is_pro
+            )
+            if cached:
+                file_path = _complete_from_cache(db, script, self.request.id, video_info, engine, cached)
+                return {
+                    'script_id': script_id,
+                    'status': 'completed',
+                    'file_path': file_path
+                }
+            checkpoint.save('metadata', {
+                'video_info': video_info,
+                'engine': engine,
+                'model_name': model_name,
+                'cache_identity': cache_identity
+            })
+
+        # Step 2: Download audio (served from the audio cache on a retry)
+        update_task_status(20, 'Downloading audio...', _estimate_eta(
+            'downloading', video_info['duration'], engine, model_name, is_pro, deferred
+        ))
+
         print(f"Downloading audio from: {video_url}")
-        audio_path, video_info = downloader.download_audio(video_url)
+        audio_path, video_info = downloader.fetch_audio(video_url, video_info=video_info, holder=self.request.id)
         print(f"Audio downloaded to: {audio_path}")
-        
-        # Update script with video info
+
         script.video_title = video_info['title']
         script.video_duration = video_info['duration']
         db.commit()
-        
-        # Step 2: Transcribe audio
-        update_task_status(50, 'Transcribing audio... This may take a few minutes...')
-        
-        print(f"Starting transcription of audio file: {audio_path}")
-        transcript_data = transcriber.transcribe_audio(audio_path)
-        print(f"Transcription completed. Found {len(transcript_data['segments'])} segments")
-        
-        # Step 3: Format and save script
-        update_task_status(80, 'Formatting script...')
-        
-        formatted_script = transcriber.format_transcript(
-            transcript_data['segments'], 
-            format_type='timestamps'
-        )
-        
-        file_path = formatter.save_script(
-            video_info=video_info,
-            transcript_data=transcript_data,
-            format_type='txt',
-            script_id=script_id
+
+        # Hand the audio to a CPU worker; this slot is free for the next download.
+        # If this task is redelivered before the checkpoint below is saved, the
+        # second hand-off carries another dispatch_id and transcribe_stage drops it
+        update_task_status(30, 'Waiting for a transcription worker...', _estimate_eta(
+            'waiting', video_info['duration'], engine, model_name, is_pro, deferred
+        ))
+        transcribe_stage.apply_async(args=[{
+            'task_id': self.request.id,
+            'script_id': script_id,
+            'video_url': video_url,
+            'video_info': video_info,
+            'audio_path': audio_path,
+            'engine': engine,
+            'model_name': model_name,
+            'word_timestamps': word_timestamps,
+            'cache_identity': cache_identity,
+            'is_pro': is_pro,
+            'deferred': deferred,
+            'enqueued_at': time.time(),
+            'dispatch_id': uuid.uuid4().hex
+        }], queue=pipeline_queue('cpu', is_pro, deferred))
+        checkpoint.save('downloaded', {'audio_path': audio_path})
+
+        return {
+            'script_id': script_id,
+            'status': 'downloaded',
+            'audio_path': audio_path
+        }
+
+    except Exception as e:
+        if _should_retry(self, e):
+            raise _retry_stage(self, self.request.id, script_id, 20, e)
+
+        _fail_pipeline(db, script, self.request.id, script_id, e, audio_path)
+        raise
+
+    finally:
+        db.close()
+
+@celery_app.task(bind=True, name='process_uploaded_file')
+def process_uploaded_file(self, script_id: int, file_path: str, filename: str, sha256: str,
+                          user_id: int = None, engine: str = None, word_timestamps: bool = False,
+                          is_pro: bool = False, enqueued_at: float = None, deferred: bool = False):
+    """Entry stage for uploaded files: probe the media and hand it straight to ``transcribe_stage``.
+
+    Takes the place of the download stage. The content hash stands in for
+    the video ID, so identical uploads share language detection and the
+    transcript cache.
+    """
+    from ..config import settings
+    from ..database import SessionLocal
+    from ..models import Script
+    from ..core.audio_processor import AudioProcessor
+    from ..core.queue_stats import QueueStats
+    from ..core.pipeline_checkpoint import PipelineCheckpoint
+    from ..core.priority_tiers import QueueWaitStats, pipeline_queue
+
+    db = SessionLocal()
+    queue_stats = QueueStats()
+    checkpoint = PipelineCheckpoint(self.request.id)
+    script = None
+    upload_path = file_path
+
+    try:
+        if checkpoint.get('downloaded'):
+            upload_path = None
+            return {
+                'script_id': script_id,
+                'status': 'uploaded'
+            }
+
+        script = db.query(Script).filter(Script.id == script_id).first()
+        if not script:
+            raise Exception("Script record not found")
+
+        # Redelivered after the job finished (and its upload was removed)
+        if script.status == 'completed' and script.task_id == self.request.id:
+            upload_path = None
+            return {
+                'script_id': script_id,
+                'status': 'completed',
+                'file_path': script.file_path
+            }
+
+        if not self.request.retries:
+            QueueWaitStats().record('io', is_pro, enqueued_at, deferred)
+
+        _store_task_status(self.request.id, script_id, 10, 'Reading uploaded file...')
+
+        script.status = 'processing'
+        db.commit()
+
+        duration = AudioProcessor().probe_duration(file_path)
+        if duration > settings.MAX_VIDEO_DURATION:
+            raise Exception(f"File duration exceeds limit of {settings.MAX_VIDEO_DURATION/3600} hours")
+
+        video_info = {
+            'title': os.path.splitext(filename)[0] or filename,
+            'duration': int(duration),
+            'channel': 'Uploaded file',
+            'video_id': f"upload-{sha256[:32]}",
+            'thumbnail': '',
+        }
+        queue_stats.add_job(script_id, duration)
+
+        engine, model_name, cache_identity, cached = _plan_job(
+            video_info, engine, word_timestamps, queue_stats, is_pro=is_pro
         )
-        print(f"Script saved to: {file_path}")
-        
-        # Update script record
-        script.transcript_text = transcript_data['text']
-        script.formatted_script = formatted_script
-        script.file_path = file_path
-        script.status = 'completed'
-        script.completed_at = datetime.utcnow()
+        if cached:
+            script_path = _complete_from_cache(db, script, self.request.id, video_info, engine, cached)
+            return {
+                'script_id': script_id,
+                'status': 'completed',
+                'file_path': script_path
+            }
+
+        script.video_title = video_info['title']
+        script.video_duration = video_info['duration']
         db.commit()
-        
-        # Cleanup
-        if audio_path and os.path.exists(audio_path):
-            downloader.cleanup_audio(audio_path)
-            print(f"Cleaned up audio file: {audio_path}")
-        
-        # Final update with success
-        update_task_status(100, 'Script generated successfully!', {
-            'file_path': file_path,
-            'completed': True
-        })
-        
-        print(f"Successfully processed video: {video_url}")
-        
-        # Return result (even though we're storing in Redis)
+
+        _store_task_status(self.request.id, script_id, 30, 'Waiting for a transcription worker...', _estimate_eta(
+            'waiting', video_info['duration'], engine, model_name, is_pro, deferred
+        ))
+        transcribe_stage.apply_async(args=[{
+            'task_id': self.request.id,
+            'script_id': script_id,
+            'video_url': script.video_url,
+            'video_info': video_info,
+            'audio_path': file_path,
+            'engine': engine,
+            'model_name': model_name,
+            'word_timestamps': word_timestamps,
+            'cache_identity': cache_identity,
+            'is_pro': is_pro,
+            'deferred': deferred,
+            'enqueued_at': time.time(),
+            'dispatch_id': uuid.uuid4().hex
+        }], queue=pipeline_queue('cpu', is_pro, deferred))
+        checkpoint.save('downloaded', {'audio_path': file_path})
+        upload_path = None  # owned by the transcribe stage from here on
+
+        return {
+            'script_id': script_id,
+            'status': 'uploaded'
+        }
+
+    except Exception as e:
+        if _should_retry(self, e):
+            upload_path = None  # the retry still needs the file
+            raise _retry_stage(self, self.request.id, script_id, 10, e)
+
+        _fail_pipeline(db, script, self.request.id, script_id, e)
+        raise
+
+    finally:
+        _release_audio(self.request.id, upload_path)
+        db.close()
+
+@celery_app.task(name='enqueue_batch')
+def enqueue_batch(jobs: list):
+    """Fan a batch submission out into pipeline tasks.
+
+    The API sends the whole batch as one message; each job carries the task
+    ID already stored on its script row and goes to its tier's queue.
+    """
+    from ..core.priority_tiers import pipeline_queue
+
+    for job in jobs:
+        process_youtube_video.apply_async(
+            kwargs=dict(job['kwargs'], enqueued_at=time.time()),
+            task_id=job['task_id'],
+            queue=pipeline_queue('io', job['kwargs'].get('is_pro', False), job['kwargs'].get('deferred', False))
+        )
+    return {'enqueued': len(jobs)}
+
+@celery_app.task(bind=True, name='transcribe_stage')
+def transcribe_stage(self, job: dict):
+    """Transcribe stage: language detection and decoding of downloaded audio.
+
+    Runs on the CPU queue. Long videos fan out into chunks whose chord
+    callback finishes the script; everything else hands its transcript to
+    ``finalize_stage`` through TEMP_AUDIO_PATH. The raw transcript is
+    checkpointed before the hand-off, so a retry never decodes twice.
+    """
+    from ..database import SessionLocal
+    from ..models import Script
+    from ..core.transcriber import WhisperTranscriber
+    from ..core.transcript_stream import TranscriptStream, decode_progress
+    from ..core.word_timings import strip_words
+    from ..core.queue_stats import QueueStats
+    from ..core.audio_processor import AudioProcessor
+    from ..core.language_detector import LanguageDetector, model_for_language
+    from ..core.pipeline_checkpoint import PipelineCheckpoint
+    from ..core.priority_tiers import QueueWaitStats, pipeline_queue
+    from ..core.eta_estimator import RealTimeFactors
+
+    task_id = job['task_id']
+    script_id = job['script_id']
+    video_info = job['video_info']
+    audio_path = job['audio_path']
+    is_pro = job.get('is_pro', False)
+    deferred = job.get('deferred', False)
+
+    db = SessionLocal()
+    checkpoint = PipelineCheckpoint(task_id)
+    script = None
+    chunked = False
+
+    def update_task_status(progress, status, extra_data=None):
+        _store_task_status(task_id, script_id, progress, status, extra_data)
+
+    try:
+        handed_off = checkpoint.get('transcribed')
+        if handed_off:
+            return {
+                'script_id': script_id,
+                'status': 'chunked' if handed_off['chunked'] else 'transcribed'
+            }
+
+        # A second hand-off of this job (the download stage re-ran after a
+        # crash) leaves the work to whichever message started first
+        if job.get('dispatch_id') and not checkpoint.claim('transcribe', job['dispatch_id']):
+            print(f"Skipping duplicate transcribe stage of task {task_id}")
+            return {'script_id': script_id, 'status': 'duplicate'}
+
+        if not self.request.retries:
+            QueueWaitStats().record('cpu', is_pro, job.get('enqueued_at'), deferred)
+
+        saved = checkpoint.get('transcript')
+        if saved and os.path.exists(saved['transcript_path']):
+            print(f"Resuming from the saved transcript of task {task_id}")
+            finalize_job = saved
+        else:
+            script = db.query(Script).filter(Script.id == script_id).first()
+            if not script:
+                raise Exception("Script record not found")
+
+            # A retry decodes from the start; drop what an earlier attempt streamed
+            stream = TranscriptStream(task_id)
+            stream.delete()
+
+            # Detect the language once per video and use the English-only model for English
+            samples = AudioProcessor().load_pcm(audio_path)
+            language = LanguageDetector().detect(video_info['video_id'], samples, job['engine'], job['model_name'])
+            model_name = model_for_language(job['model_name'], language)
+            transcriber = WhisperTranscriber(engine_name=job['engine'], model_name=model_name)
+
+            script.engine = transcriber.engine_name
+            script.whisper_model = transcriber.model_name
+            script.language = language
+            db.commit()
+
+            # Long videos are transcribed in chunks across the cluster; the chord
+            # callback finishes the script and the cleanup
+            if _should_chunk(video_info):
+                update_task_status(50, 'Transcribing audio in parallel chunks...', _estimate_eta(
+                    'transcribing', video_info['duration'], transcriber.engine_name, transcriber.model_name
+                ))
+
+                chunk_count = _dispatch_chunked_transcription(
+                    task_id, script_id, audio_path, samples, video_info,
+                    decode_options={
+                        'engine': transcriber.engine_name,
+                        'model_name': transcriber.model_name,
+                        'language': language,
+                        'word_timestamps': job['word_timestamps']
+                    },
+                    cache_identity=job['cache_identity'],
+                    is_pro=is_pro,
+                    deferred=deferred,
+                    # Checkpoint before sending, so a redelivery can't fan out a second chord
+                    before_dispatch=lambda: checkpoint.save('transcribed', {'chunked': True})
+                )
+                chunked = True
+                print(f"Dispatched {chunk_count} chunks for transcription")
+
+                return {
+                    'script_id': script_id,
+                    'status': 'chunked',
+                    'chunks': chunk_count
+                }
+
+            # Transcribe audio, publishing each decoded window
+            duration = video_info['duration']
+
+            def eta(decoded=0):
+                return _estimate_eta(
+                    'transcribing', duration, transcriber.engine_name, transcriber.model_name,
+                    decoded_seconds=decoded
+                )
+
+            update_task_status(50, 'Transcribing audio... This may take a few minutes...', eta())
+
+            def report_window(segments, window):
+                decoded = stream.append(strip_words(segments), window['keep_end'] - window['keep_start'])
+                update_task_status(
+                    decode_progress(decoded, duration),
+                    f'Transcribing audio... {int(decoded)}s of {int(duration)}s decoded',
+                    eta(decoded)
+                )
+
+            print(f"Starting transcription of audio file: {audio_path}")
+            started = time.monotonic()
+            transcript_data = transcriber.transcribe_audio(
+                samples,
+                language=language,
+                on_window=report_window,
+                batched=_should_batch(video_info),
+                word_timestamps=job['word_timestamps']
+            )
+            RealTimeFactors().record(
+                'decode', time.monotonic() - started, duration,
+                engine=transcriber.engine_name, model=transcriber.model_name
+            )
+            print(f"Transcription completed. Found {len(transcript_data['segments'])} segments")
+
+            finalize_job = dict(
+                job,
+                model_name=transcriber.model_name,
+                language=language,
+                transcript_path=_save_stage_transcript(task_id, transcript_data)
+            )
+            checkpoint.save('transcript', finalize_job)
+            QueueStats().finish_job(script_id)
+
+            # Formatting happens on an I/O worker; downloaded audio stays cached for re-runs
+            _release_audio(task_id, audio_path)
+
+        update_task_status(80, 'Formatting script...', _estimate_eta('finalizing', video_info['duration']))
+        finalize_stage.apply_async(
+            args=[dict(finalize_job, dispatch_id=uuid.uuid4().hex)],
+            queue=pipeline_queue('io', is_pro, deferred)
+        )
+        checkpoint.save('transcribed', {'chunked': False})
+
+        return {
+            'script_id': script_id,
+            'status': 'transcribed'
+        }
+
+    except Exception as e:
+        if not chunked and _should_retry(self, e):
+            raise _retry_stage(self, task_id, script_id, 50, e)
+
+        _fail_pipeline(db, script, task_id, script_id, e, None if chunked else audio_path)
+        raise
+
+    finally:
+        db.close()
+
+@celery_app.task(bind=True, name='finalize_stage')
+def finalize_stage(self, job: dict):
+    """Finalize stage: cache the transcript, format it and complete the script.
+
+    The transcript file is only removed once the script is committed, so a
+    failed commit is retried from the saved transcript.
+    """
+    from ..database import SessionLocal
+    from ..models import Script
+    from ..core.pipeline_checkpoint import PipelineCheckpoint
+
+    task_id = job['task_id']
+    script_id = job['script_id']
+    transcript_path = job['transcript_path']
+
+    db = SessionLocal()
+    checkpoint = PipelineCheckpoint(task_id)
+    script = None
+    try:
+        if job.get('dispatch_id') and not checkpoint.claim('finalize', job['dispatch_id']):
+            print(f"Skipping duplicate finalize stage of task {task_id}")
+            return {'script_id': script_id, 'status': 'duplicate'}
+
+        script = db.query(Script).filter(Script.id == script_id).first()
+        if not script:
+            raise Exception("Script record not found")
+
+        # A redelivery after the script was committed (the worker died before
+        # the ack) only finishes the cleanup
+        if script.status == 'completed' and script.task_id == task_id:
+            checkpoint.clear()
+            if os.path.exists(transcript_path):
+                os.remove(transcript_path)
+            return {
+                'script_id': script_id,
+                'status': 'completed',
+                'file_path': script.file_path
+            }
+
+        with open(transcript_path, 'r', encoding='utf-8') as f:
+            transcript_data = json.load(f)
+
+        file_path = _finish_transcription(
+            db, script, task_id, job['video_info'], transcript_data,
+            cache_identity=job['cache_identity'],
+            model_name=job['model_name'],
+            language=job['language']
+        )
+        print(f"Successfully processed video: {job['video_url']}")
+
+        checkpoint.clear()
+        os.remove(transcript_path)
+
         return {
             'script_id': script_id,
             'status': 'completed',
             'file_path': file_path
         }
-        
+
     except Exception as e:
-        # Log error
-        error_msg = f"Error processing video: {str(e)}"
-        error_trace = traceback.format_exc()
-        print(f"ERROR: {error_msg}")
-        print(f"Traceback: {error_trace}")
-        
-        # Update script record with error
-        try:
-            if 'script' in locals() and script:
-                script.status = 'failed'
-                script.error_message = str(e)
-                db.commit()
-        except Exception as db_error:
-            print(f"Failed to update database: {str(db_error)}")
-            db.rollback()
-        
-        # Store error in Redis
-        error_data = {
-            'task_id': self.request.id,
+        if _should_retry(self, e):
+            raise _retry_stage(self, task_id, script_id, 80, e)
+
+        _fail_pipeline(db, script, task_id, script_id, e)
+        if os.path.exists(transcript_path):
+            os.remove(transcript_path)
+        raise
+
+    finally:
+        db.close()
+
+@celery_app.task(bind=True, name='transcribe_audio_chunk')
+def transcribe_audio_chunk(self, chunk_path: str, chunk: dict, task_id: str = None,
+                           script_id: int = None, duration: float = None, decode_options: dict = None):
+    """Transcribe one chunk of a long video; offsets are applied when stitching"""
+    from ..core.audio_processor import AudioProcessor
+    from ..core.transcriber import WhisperTranscriber
+    from ..core.transcript_stream import TranscriptStream, decode_progress
+    from ..core.word_timings import strip_words
+    from ..core.eta_estimator import RealTimeFactors
+
+    started = time.monotonic()
+    decode_options = decode_options or {}
+    try:
+        samples = AudioProcessor().load_chunk(chunk_path)
+        transcriber = WhisperTranscriber(
+            engine_name=decode_options.get('engine'),
+            model_name=decode_options.get('model_name')
+        )
+        result = transcriber.transcribe_audio(
+            samples,
+            language=decode_options.get('language'),
+            word_timestamps=decode_options.get('word_timestamps', False)
+        )
+    except Exception as e:
+        # Only this chunk is retried; the chord waits for it
+        if _should_retry(self, e):
+            raise _retry_stage(self, task_id, script_id, 50, e)
+        raise
+    elapsed = time.monotonic() - started
+    print(f"Transcribed chunk {chunk['index']} in {elapsed:.1f}s")
+    RealTimeFactors().record(
+        'decode', elapsed, chunk['end'] - chunk['start'],
+        engine=transcriber.engine_name, model=transcriber.model_name
+    )
+
+    chunk_result = {
+        'chunk': chunk,
+        'segments': result['segments'],
+        'language': result['language'],
+        'speech_ratio': result.get('speech_ratio', 1.0)
+    }
+
+    # Publish the chunk's segments so the partial transcript grows as chunks finish
+    if task_id:
+        decoded = TranscriptStream(task_id).append(
+            strip_words(transcriber.offset_chunk_segments(chunk_result)),
+            chunk['keep_end'] - chunk['keep_start']
+        )
+        _store_task_status(
+            task_id,
+            script_id,
+            decode_progress(decoded, duration),
+            f'Transcribing audio in parallel chunks... {int(decoded)}s of {int(duration or 0)}s decoded',
+            _estimate_eta(
+                'transcribing', duration, transcriber.engine_name, transcriber.model_name,
+                decoded_seconds=decoded
+            )
+        )
+
+    return chunk_result
+
+@celery_app.task(bind=True, name='finalize_chunked_transcription')
+def finalize_chunked_transcription(self, chunk_results, task_id: str, script_id: int,
+                                   video_info: dict, audio_path: str, chunk_dir: str,
+                                   decode_options: dict = None, cache_identity: dict = None):
+    """Chord callback: stitch chunk transcripts and finish the script.
+
+    The chunk results travel in the message itself, so a retry re-runs only
+    the stitching and formatting.
+    """
+    from ..database import SessionLocal
+    from ..models import Script
+    from ..core.transcriber import WhisperTranscriber
+    from ..core.queue_stats import QueueStats
+    from ..core.pipeline_checkpoint import PipelineCheckpoint
+
+    db = SessionLocal()
+    script = None
+    try:
+        _store_task_status(task_id, script_id, 80, 'Formatting script...', _estimate_eta('finalizing', video_info['duration']))
+
+        script = db.query(Script).filter(Script.id == script_id).first()
+        if not script:
+            raise Exception("Script record not found")
+
+        transcript_data = WhisperTranscriber().merge_chunk_results(chunk_results)
+        print(f"Stitched {len(chunk_results)} chunks into {len(transcript_data['segments'])} segments")
+
+        decode_options = decode_options or {}
+        file_path = _finish_transcription(
+            db, script, task_id, video_info, transcript_data,
+            cache_identity=cache_identity,
+            model_name=decode_options.get('model_name'),
+            language=decode_options.get('language')
+        )
+
+        QueueStats().finish_job(script_id)
+        PipelineCheckpoint(task_id).clear()
+        _cleanup_chunked_files(task_id, audio_path, chunk_dir)
+
+        return {
             'script_id': script_id,
-            'progress': 0,
-            'status': f'Failed: {str(e)}',
-            'state': 'FAILURE',
-            'error': str(e),
-            'timestamp': datetime.utcnow().isoformat()
+            'status': 'completed',
+            'file_path': file_path
         }
-        redis_client.set(
-            f"task_result:{self.request.id}", 
-            json.dumps(error_data), 
-            ex=3600
-        )
-        
-        # Cleanup
-        if audio_path and os.path.exists(audio_path):
-            try:
-                downloader.cleanup_audio(audio_path)
-            except:
-                pass
-        
-        # Update task state
-        self.update_state(
-            state='FAILURE',
-            meta={
-                'current': 0, 
-                'total': 100, 
-                'status': f'Failed: {str(e)}',
-                'exc_type': type(e).__name__,
-                'exc_message': str(e)
-            }
+
+    except Exception as e:
+        if _should_retry(self, e):
+            raise _retry_stage(self, task_id, script_id, 80, e)
+
+        print(f"ERROR: Failed to finalize chunked transcription: {str(e)}")
+        _mark_script_failed(db, script, e)
+        _store_task_error(task_id, script_id, e)
+        QueueStats().finish_job(script_id)
+        _cleanup_chunked_files(task_id, audio_path, chunk_dir)
+        raise
+
+    finally:
+        db.close()
+
+@celery_app.task(name='chunked_transcription_failed')
+def chunked_transcription_failed(request, exc, traceback, task_id: str, script_id: int,
+                                 audio_path: str, chunk_dir: str):
+    """Chord error callback: a chunk failed, so the whole script fails"""
+    from ..database import SessionLocal
+    from ..models import Script
+    from ..core.queue_stats import QueueStats
+
+    print(f"ERROR: Chunked transcription failed for script {script_id}: {str(exc)}")
+
+    db = SessionLocal()
+    try:
+        script = db.query(Script).filter(Script.id == script_id).first()
+        _mark_script_failed(db, script, exc)
+        _store_task_error(task_id, script_id, exc)
+    finally:
+        QueueStats().finish_job(script_id)
+        _cleanup_chunked_files(task_id, audio_path, chunk_dir)
+        db.close()
+
+@celery_app.task(bind=True, name='align_script_words')
+def align_script_words(self, script_id: int):
+    """Compute word timings on demand for a script that was transcribed without them.
+
+    The audio is decoded again with word timestamps. That decode can split
+    and word the audio differently from the stored script, so its segments
+    replace the script's text together with the words.
+    """
+    from ..database import SessionLocal
+    from ..models import Script
+    from ..core.youtube_downloader import YouTubeDownloader
+    from ..core.audio_cache import AudioCache
+    from ..core.transcriber import WhisperTranscriber
+
+    db = SessionLocal()
+    downloader = YouTubeDownloader()
+    audio_path = None
+    try:
+        _store_task_status(self.request.id, script_id, 10, 'Downloading audio...')
+
+        script = db.query(Script).filter(Script.id == script_id).first()
+        if not script:
+            raise Exception("Script record not found")
+        if script.video_url.startswith('upload://'):
+            raise Exception("Uploaded files aren't kept, so their words can't be aligned")
+
+        audio_path, video_info = downloader.fetch_audio(script.video_url, holder=self.request.id)
+
+        # Same engine, model and language as the stored script
+        _store_task_status(self.request.id, script_id, 50, 'Aligning words...')
+        transcriber = WhisperTranscriber(engine_name=script.engine, model_name=script.whisper_model)
+        transcript_data = transcriber.transcribe_audio(
+            audio_path,
+            language=script.language,
+            word_timestamps=True
         )
-        
+
+        # Word timing segment indices refer to the new segments, so store both
+        previous_file = script.file_path
+        _complete_script(db, script, video_info, transcript_data)
+        if previous_file and previous_file != script.file_path and os.path.exists(previous_file):
+            os.remove(previous_file)
+
+        _store_task_status(self.request.id, script_id, 100, 'Word timestamps ready', {'completed': True})
+        return {'script_id': script_id, 'status': 'completed'}
+
+    except Exception as e:
+        print(f"ERROR: Word alignment failed for script {script_id}: {str(e)}")
+        _store_task_error(self.request.id, script_id, e)
         raise
-        
+
+    finally:
+        AudioCache().release(audio_path, self.request.id)
+        db.close()
+
+@celery_app.task(name='sync_channel_subscriptions')
+def sync_channel_subscriptions():
+    """Beat task: claim the channels that are due and sync each one"""
+    from ..config import settings
+    from ..database import SessionLocal
+    from ..models import ChannelSubscription
+    from ..core.channel_sync import next_check_time
+
+    db = SessionLocal()
+    try:
+        # Rescheduling before dispatch keeps the next tick from claiming them again
+        due = db.query(ChannelSubscription).filter(
+            ChannelSubscription.is_active == True,
+            ChannelSubscription.next_check_at <= datetime.utcnow()
+        ).order_by(
+            ChannelSubscription.next_check_at
+        ).limit(settings.CHANNEL_SYNC_MAX_DUE).with_for_update(skip_locked=True).all()
+
+        for subscription in due:
+            subscription.next_check_at = next_check_time(subscription.check_interval)
+        subscription_ids = [subscription.id for subscription in due]
+        db.commit()
+
+        for subscription_id in subscription_ids:
+            sync_channel.delay(subscription_id)
+        return {'dispatched': len(subscription_ids)}
+
+    finally:
+        db.close()
+
+@celery_app.task(name='sync_channel')
+def sync_channel(subscription_id: int):
+    """Enqueue a channel's uploads that aren't in its seen-ID cursor yet.
+
+    The first sync only records the newest uploads as seen, unless the
+    subscription asked for a backfill (an empty cursor). The subscription
+    row stays locked for the whole sync, so overlapping runs can't enqueue
+    the same uploads twice. Free users' uploads past their daily limit stay
+    unseen and are picked up by a later sync.
+    """
+    from datetime import date
+    from ..config import settings
+    from ..database import SessionLocal
+    from ..models import ChannelSubscription, Script, UserUsage
+    from ..core.channel_sync import ChannelSync
+    from ..core.queue_stats import QueueStats
+    from ..core.admission import AdmissionController, DEFER
+
+    db = SessionLocal()
+    try:
+        subscription = db.query(ChannelSubscription).filter(
+            ChannelSubscription.id == subscription_id
+        ).with_for_update().first()
+        if not subscription or not subscription.is_active:
+            return {'subscription_id': subscription_id, 'new_videos': 0}
+
+        sync = ChannelSync()
+        seen_ids = json.loads(subscription.seen_video_ids) if subscription.seen_video_ids is not None else None
+        try:
+            if seen_ids is None:
+                title, latest = sync.latest(subscription.channel_url)
+                new_videos, seen_ids = [], [entry['video_id'] for entry in latest]
+            else:
+                title, new_videos = sync.new_uploads(subscription.channel_url, seen_ids)
+                seen_ids = [entry['video_id'] for entry in new_videos] + seen_ids
+        except Exception as e:
+            print(f"ERROR: Channel sync failed for subscription {subscription_id}: {str(e)}")
+            subscription.last_error = str(e)
+            subscription.last_checked_at = datetime.utcnow()
+            db.commit()
+            return {'subscription_id': subscription_id, 'error': str(e)}
+
+        # Oldest first, skipping uploads the pipeline would reject anyway
+        videos = [
+            video for video in reversed(new_videos)
+            if (video.get('duration') or 0) <= settings.MAX_VIDEO_DURATION
+        ]
+
+        # Same daily limit as the submit endpoint
+        is_pro = bool(subscription.user.is_pro)
+        usage = db.query(UserUsage).filter(UserUsage.user_id == subscription.user_id).with_for_update().first()
+        if usage:
+            if usage.last_reset_date.date() < date.today():
+                usage.videos_processed_today = 0
+                usage.last_reset_date = datetime.utcnow()
+            if not is_pro:
+                allowed = max(settings.FREE_DAILY_VIDEO_LIMIT - usage.videos_processed_today, 0)
+                over_limit = {video['video_id'] for video in videos[allowed:]}
+                videos = videos[:allowed]
+                seen_ids = [video_id for video_id in seen_ids if video_id not in over_limit]
+
+        subscription.channel_title = title or subscription.channel_title
+        subscription.seen_video_ids = json.dumps(seen_ids[:settings.CHANNEL_SEEN_IDS_KEPT])
+        subscription.last_checked_at = datetime.utcnow()
+        subscription.last_error = None
+
+        # New uploads can't be offered again later, so a busy cluster defers them
+        deferred = bool(videos) and AdmissionController().decide(
+            sum(video.get('duration') or 0 for video in videos),
+            is_pro=is_pro,
+            can_reject=False
+        )['action'] == DEFER
+
+        db_scripts = [
+            Script(
+                user_id=subscription.user_id,
+                video_url=video['video_url'],
+                video_title=video.get('title'),
+                engine=subscription.engine or settings.TRANSCRIPTION_ENGINE,
+                status='pending',
+                task_id=str(uuid.uuid4())
+            )
+            for video in videos
+        ]
+        db.add_all(db_scripts)
+        db.flush()
+
+        jobs = [
+            {
+                'task_id': db_script.task_id,
+                'kwargs': {
+                    'script_id': db_script.id,
+                    'video_url': db_script.video_url,
+                    'user_id': subscription.user_id,
+                    'engine': db_script.engine,
+                    'is_pro': is_pro,
+                    'deferred': deferred
+                }
+            }
+            for db_script in db_scripts
+        ]
+        if jobs and usage:
+            usage.videos_processed_today += len(jobs)
+            usage.total_videos_processed += len(jobs)
+        db.commit()
+
+        if jobs:
+            QueueStats().add_jobs({
+                job['kwargs']['script_id']: video.get('duration')
+                for job, video in zip(jobs, videos)
+            })
+            enqueue_batch.delay(jobs)
+            print(f"Enqueued {len(jobs)} new uploads of {subscription.channel_url}")
+
+        return {'subscription_id': subscription_id, 'new_videos': len(jobs)}
+
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
@@ -0,0 +1,5 @@
+import os
+import tempfile
+
+# The app creates its tables on import; point it at a throwaway SQLite file
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.main import app
+from app.database import get_db
+from app.dependencies import get_optional_current_user
+from app.api.endpoints import transcription
+from app.core.youtube_downloader import YouTubeDownloader
+
+VALIDATION_SECONDS = 1.0
+
+VIDEO_INFO = {'video_id': 'dQw4w9WgXcQ', 'title': 'Test video', 'duration': 212}
+
+
+class FakeEtaEstimator:
+    def estimate(self, *args, **kwargs):
+        return {'eta_seconds': 60, 'eta_at': time.time() + 60, 'queue_position': 0}
+
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+
+@pytest.fixture
+def slow_submit(monkeypatch):
+    """Submit endpoint whose yt-dlp validation blocks its thread; DB, Redis and broker calls are skipped"""
+    def extract_video_info(self, url):
+        time.sleep(VALIDATION_SECONDS)
+        return dict(VIDEO_INFO)
+
+    monkeypatch.setattr(YouTubeDownloader, 'extract_video_info', extract_video_info)
+    monkeypatch.setattr(transcription, '_admit', lambda user, audio_seconds=0: False)
+    monkeypatch.setattr(transcription, '_submit_script', lambda *args, **kwargs: 'test-task')
+    monkeypatch.setattr(transcription, 'EtaEstimator', FakeEtaEstimator)
+
+    app.dependency_overrides[get_db] = lambda: None
+    app.dependency_overrides[get_optional_current_user] = lambda: None
+    yield
+    app.dependency_overrides.clear()
+
+
+@pytest.mark.anyio
+async def test_slow_validation_does_not_block_other_requests(slow_submit):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url='http://test') as client:
+        started = time.monotonic()
+
+        async def submit():
+            response = await client.post('/api/v1/transcribe/', json={
+                'video_url': 'https://www.youtube.com/watch?v=dQw4w9WgXcQ'
+            })
+            return response, time.monotonic() - started
+
+        async def health():
+            # Let the submit request reach its validation first
+            await asyncio.sleep(0.1)
+            response = await client.get('/health')
+            return response, time.monotonic() - started
+
+        (submitted, submit_elapsed), (healthy, health_elapsed) = await asyncio.gather(submit(), health())
+
+    assert submitted.status_code == 200
+    assert submitted.json()['task_id'] == 'test-task'
+    assert healthy.status_code == 200
+    assert submit_elapsed >= VALIDATION_SECONDS
+    assert health_elapsed < VALIDATION_SECONDS / 2
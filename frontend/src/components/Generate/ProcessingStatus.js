@@ -1,6 +1,13 @@
 import React from "react";
 
-const ProcessingStatus = ({ progress, message }) => {
+const formatEta = (seconds) => {
+  if (seconds < 60) return "less than a minute";
+  const minutes = Math.round(seconds / 60);
+  if (minutes < 60) return `about ${minutes} min`;
+  return `about ${Math.floor(minutes / 60)} h ${minutes % 60} min`;
+};
+
+const ProcessingStatus = ({ progress, message, etaSeconds, queuePosition }) => {
   const steps = [
     { threshold: 0, label: "Initializing", icon: "🚀" },
     { threshold: 20, label: "Downloading Audio", icon: "⬇️" },
@@ -48,6 +55,12 @@ const ProcessingStatus = ({ progress, message }) => {
           <p className="text-sm font-medium text-gray-700">
             {progress}% Complete
           </p>
+          {etaSeconds != null && (
+            <p className="text-sm text-gray-500 mt-1">
+              {formatEta(etaSeconds)} remaining
+              {queuePosition > 0 && ` · ${queuePosition} ahead in queue`}
+            </p>
+          )}
         </div>
 
         {/* Steps Indicator */}
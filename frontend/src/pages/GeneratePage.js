@@ -15,14 +15,43 @@ const GeneratePage = () => {
   const [scriptData, setScriptData] = useState(null);
   const [progress, setProgress] = useState(0);
   const [statusMessage, setStatusMessage] = useState('');
+  const [eta, setEta] = useState({ seconds: null, queuePosition: null });
 
   useEffect(() => {
-    if (taskId && status === 'processing') {
-      const interval = setInterval(() => {
-        checkStatus();
-      }, 2000);
+    if (!taskId || status !== 'processing') {
+      return;
+    }
+
+    // Status updates are pushed over SSE; fall back to polling if the
+    // browser or a proxy on the way doesn't support it
+    let interval = null;
+    const startPolling = () => {
+      if (!interval) {
+        interval = setInterval(() => {
+          checkStatus();
+        }, 2000);
+      }
+    };
+
+    if (typeof EventSource === 'undefined') {
+      startPolling();
       return () => clearInterval(interval);
     }
+
+    const source = transcriptionAPI.subscribeStatus([taskId]);
+    source.addEventListener('status', (event) => {
+      handleStatus(JSON.parse(event.data));
+    });
+    source.addEventListener('end', () => source.close());
+    source.onerror = () => {
+      source.close();
+      startPolling();
+    };
+
+    return () => {
+      source.close();
+      clearInterval(interval);
+    };
   }, [taskId, status]);
 
   const handleSubmit = async (videoUrl) => {
@@ -34,6 +63,7 @@ const GeneratePage = () => {
       
       const response = await transcriptionAPI.create({ video_url: videoUrl });
       setTaskId(response.data.task_id);
+      setEta({ seconds: response.data.eta_seconds, queuePosition: response.data.queue_position });
       
       if (response.data.script_id) {
         setScriptId(response.data.script_id);
@@ -48,10 +78,17 @@ const GeneratePage = () => {
   const checkStatus = async () => {
     try {
       const response = await transcriptionAPI.getStatus(taskId);
-      const data = response.data;
-      
+      await handleStatus(response.data);
+    } catch (error) {
+      console.error('Failed to check status:', error);
+    }
+  };
+
+  const handleStatus = async (data) => {
+    try {
       setProgress(data.progress);
       setStatusMessage(data.message);
+      setEta({ seconds: data.eta_seconds, queuePosition: data.queue_position });
       
       if (data.script_id && !scriptId) {
         setScriptId(data.script_id);
@@ -75,7 +112,7 @@ const GeneratePage = () => {
         toast.error(data.message || 'Transcription failed');
       }
     } catch (error) {
-      console.error('Failed to check status:', error);
+      console.error('Failed to handle status update:', error);
     }
   };
 
@@ -106,6 +143,7 @@ const GeneratePage = () => {
     setScriptData(null);
     setProgress(0);
     setStatusMessage('');
+    setEta({ seconds: null, queuePosition: null });
     setUrl('');
   };
 
@@ -143,6 +181,8 @@ const GeneratePage = () => {
             <ProcessingStatus 
               progress={progress}
               message={statusMessage}
+              etaSeconds={eta.seconds}
+              queuePosition={eta.queuePosition}
             />
           </div>
         )}
@@ -60,6 +60,14 @@ export const authAPI = {
 export const transcriptionAPI = {
   create: (data) => api.post("/transcribe/", data),
   getStatus: (taskId) => api.get(`/transcribe/status/${taskId}`),
+  getBulkStatus: (taskIds) =>
+    api.post("/transcribe/status/bulk", { task_ids: taskIds }),
+  // Server-Sent Events stream of status updates for one or more tasks
+  subscribeStatus: (taskIds) =>
+    new EventSource(
+      `${API_BASE_URL}/transcribe/events?` +
+        taskIds.map((id) => `task_ids=${encodeURIComponent(id)}`).join("&")
+    ),
 };
 
 // Scripts API